@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Benchmark of the start-up time of the command line tools: runs every entry point with --help under
+'python -X importtime', and reports the total import time, the wall-clock time of the process and the heavy
+dependencies it loaded. The bytecode caches are written by a warm-up run, so that compilation is not measured."""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import click
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ['rxncon2bngl.py', 'rxncon2boolnet.py', 'rxncon2reactiongraph.py', 'rxncon2regulatorygraph.py',
+                'rxncon2srgraph.py']
+
+# Third party packages (and expensive parts of the standard library) that should only be imported by the entry
+# points that actually use them.
+HEAVY_MODULES = ['pyeda', 'networkx', 'xlrd', 'multiprocessing']
+
+
+def import_times(entry_point: str) -> Tuple[float, Dict[str, int], List[str]]:
+    """Runs the entry point with --help, returns the wall-clock time in seconds, the cumulative import time
+    in microseconds of every package imported by the entry point itself and the heavy modules loaded at all."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(ROOT, entry_point), '--help'],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True,
+                            check=True)
+    wall_time = time.perf_counter() - start
+
+    package_to_time = {}  # type: Dict[str, int]
+    heavy = []  # type: List[str]
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        module = name.strip().split('.')[0]
+        if module in HEAVY_MODULES and module not in heavy:
+            heavy.append(module)
+        # Top-level imports of a package are not indented.
+        if not name.startswith('  '):
+            package_to_time[module] = package_to_time.get(module, 0) + int(cumulative)
+
+    return wall_time, package_to_time, heavy
+
+
+@click.command()
+@click.option('--repeat', default=5, help='Number of timed runs per entry point, the fastest is reported. Default: 5')
+@click.option('--top', default=0, help='Number of slowest top-level packages to list per entry point. Default: 0')
+@click.argument('entry_points', nargs=-1)
+def run(repeat: int, top: int, entry_points: List[str]) -> None:
+    for entry_point in entry_points or ENTRY_POINTS:
+        import_times(entry_point)
+        runs = [import_times(entry_point) for _ in range(repeat)]
+        wall_time = min(wall_time for wall_time, _, _ in runs)
+        package_to_time = min((package_to_time for _, package_to_time, _ in runs), key=lambda x: sum(x.values()))
+        heavy = runs[0][2]
+        print('{0:<26} {1:7.1f} ms imports {2:7.1f} ms wall   heavy: {3}'
+              .format(entry_point, sum(package_to_time.values()) / 1000, wall_time * 1000, ', '.join(heavy) or '-'))
+
+        for package, microseconds in sorted(package_to_time.items(), key=lambda x: -x[1])[:top]:
+            print('    {0:<22} {1:7.1f} ms'.format(package, microseconds / 1000))
+
+
+if __name__ == '__main__':
+    run()
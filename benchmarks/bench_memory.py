@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Memory benchmark: builds a synthetic rxncon system of a ring of components, each one binding its neighbours
+and being phosphorylated and dephosphorylated under contingencies, and reports the peak and retained traced memory
+and the wall time of constructing the RxnConSystem, the Boolean model and the rule-based model. It also reports the
+memory per instance of the core value classes."""
+
+import gc
+import time
+import tracemalloc
+from typing import Callable, Any, Tuple, List, Dict, Optional
+
+import click
+
+from rxncon.core.effector import QualSpec
+from rxncon.core.reaction import ReactionTerm
+from rxncon.core.spec import spec_from_str
+from rxncon.core.state import state_from_str, InteractionState
+from rxncon.input.quick.quick import Quick
+from rxncon.simulation.boolean.boolean_model import boolean_model_from_rxncon, StateTarget
+from rxncon.simulation.rule_based.rule_based_model import rule_based_model_from_rxncon, Mol, Complex
+from rxncon.venntastic.sets import ValueSet, Complement
+
+
+def ring_model(components: int) -> str:
+    lines = []
+    for i in range(components):
+        j = (i + 1) % components
+        lines += [
+            'C{0}_[C{1}]_ppi_C{1}_[C{0}]'.format(i, j),
+            'K{0}_p+_C{0}_[(r)]; ! C{0}_[C{1}]--C{1}_[C{0}]'.format(i, j),
+            'P{0}_p-_C{0}_[(r)]; ! <bound{0}>'.format(i),
+            '<bound{0}>; AND C{0}_[C{1}]--C{1}_[C{0}]'.format(i, j),
+            '<bound{0}>; AND C{1}_[(r)]-{{p}}'.format(i, j),
+            'C{0}_[C{1}]_ppi+_C{1}_[C{0}]; x C{0}_[(r)]-{{p}}'.format(i, j),
+        ]
+    return '\n'.join(lines)
+
+
+def measure(stage: Callable[[], Any]) -> Tuple[Any, float, float, float]:
+    """Returns the result of the stage, its peak and retained traced memory in MB and its wall time in s."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = stage()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 2 ** 20, retained / 2 ** 20, seconds
+
+
+def report_stage(name: str, peak: float, retained: float, seconds: float) -> None:
+    print('{0:<18} {1:8.2f} MB peak {2:8.2f} MB retained {3:8.2f} s'.format(name, peak, retained, seconds))
+
+
+def instance_factories() -> List[Tuple[str, Callable[[], Any]]]:
+    spec, other_spec = spec_from_str('A_[b]'), spec_from_str('B_[a]')
+    state = state_from_str('A_[b]--B_[a]')
+    mol_args = ('A', {'rR': 'p'}, {'bD': 1}, False)  # type: Tuple[str, Dict[str, str], Dict[str, Optional[int]], bool]
+    return [
+        ('InteractionState', lambda: InteractionState(spec, other_spec)),
+        ('QualSpec', lambda: QualSpec(['x'], spec)),
+        ('ReactionTerm', lambda: ReactionTerm([spec.to_component_spec()], [state])),
+        ('StateTarget', lambda: StateTarget(state)),
+        ('ValueSet', lambda: ValueSet(state)),
+        ('Complement', lambda: Complement(ValueSet(state))),
+        ('Mol', lambda: Mol(*mol_args)),
+        ('Complex', lambda: Complex([Mol('A', {}, {}, False)])),
+    ]
+
+
+@click.command()
+@click.option('--components', default=40, help='Number of components in the ring. Default: 40')
+@click.option('--instances', default=100000, help='Number of instances per value class. Default: 100000')
+def run(components: int, instances: int) -> None:
+    rxncon_system, peak, retained, seconds = measure(lambda: Quick(ring_model(components)).rxncon_system)
+    report_stage('rxncon system', peak, retained, seconds)
+
+    for name, stage in [('boolean model', lambda: boolean_model_from_rxncon(rxncon_system)),
+                        ('rule-based model', lambda: rule_based_model_from_rxncon(rxncon_system))]:
+        _, peak, retained, seconds = measure(stage)
+        report_stage(name, peak, retained, seconds)
+
+    for name, factory in instance_factories():
+        _, _, retained, _ = measure(lambda: [factory() for _ in range(instances)])
+        print('{0:<18} {1:8.0f} bytes per instance'.format(name, retained * 2 ** 20 / instances))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Benchmark of the State string parser: parses a set of distinct State strings, once through the regular
+expressions, once cold through the scanner and once warm from its memoization table, and reports the time per
+million States."""
+
+import random
+import timeit
+from typing import List, Callable
+
+import click
+
+import rxncon.core.spec
+import rxncon.core.state
+from rxncon.core.spec import _spec_from_str_by_regex, _locus_from_str_by_regex  # pylint: disable=protected-access
+from rxncon.core.state import state_from_str, _state_from_str_by_regex  # pylint: disable=protected-access
+
+
+def state_strs(count: int, seed: int) -> List[str]:
+    """Returns count distinct State strings, mixing interaction, empty binding, self interaction and
+    modification States."""
+    rng = random.Random(seed)
+    templates = ['A{0}_[d{1}]--B{0}_[a{2}]', 'A{0}@0_[d{1}]--B{0}@1_[a]', 'A{0}_[d{1}]--0', 'A{0}_[d{1}]--[e{2}]',
+                 'A{0}_[(r{1})]-{{p}}', 'A{0}_[d/s(r{1})]-{{ub}}', 'A{0}mRNA_[(r{2})]-{{0}}']
+    return [rng.choice(templates).format(i, rng.randrange(10), rng.randrange(10)) for i in range(count)]
+
+
+def regex_parser(strs: List[str]) -> Callable[[], None]:
+    """The parser before the scanner was introduced: only regular expressions, without memoization."""
+    def parse() -> None:
+        patched = [(rxncon.core.state, 'spec_from_str', _spec_from_str_by_regex),
+                   (rxncon.core.state, 'locus_from_str', _locus_from_str_by_regex),
+                   (rxncon.core.spec, 'locus_from_str', _locus_from_str_by_regex)]
+        originals = [getattr(module, name) for module, name, _ in patched]
+        for module, name, regex_function in patched:
+            setattr(module, name, regex_function)
+        try:
+            for state_str in strs:
+                _state_from_str_by_regex(state_str)
+        finally:
+            for (module, name, _), original in zip(patched, originals):
+                setattr(module, name, original)
+
+    return parse
+
+
+def scanner(strs: List[str], cold: bool) -> Callable[[], None]:
+    """The scanner, with the memoization tables emptied before every run if cold."""
+    def parse() -> None:
+        if cold:
+            rxncon.core.spec._SPEC_STR_CACHE.clear()
+            rxncon.core.spec._LOCUS_STR_CACHE.clear()
+            rxncon.core.state._STATE_STR_CACHE.clear()
+        for state_str in strs:
+            state_from_str(state_str)
+
+    return parse
+
+
+@click.command()
+@click.option('--count', default=100000, help='Number of distinct State strings. Default: 100000')
+@click.option('--repeat', default=3, help='Number of timed runs, the fastest is reported. Default: 3')
+@click.option('--seed', default=0, help='Seed of the random State strings. Default: 0')
+def run(count: int, repeat: int, seed: int) -> None:
+    strs = state_strs(count, seed)
+    for name, parse in [('regex', regex_parser(strs)), ('scanner, cold', scanner(strs, True)),
+                        ('scanner, warm', scanner(strs, False))]:
+        seconds = min(timeit.repeat(parse, number=1, repeat=repeat))
+        print('{0:<15} {1:8.2f} s per million States, {2:10.0f} States/s'
+              .format(name, seconds * 1e6 / count, count / seconds))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""Benchmark suite measuring how rxncon scales: generates synthetic rxncon systems of increasing size (see
+rxncon.input.synthetic) and times every stage of the pipeline on them: parsing the Quick string, constructing and
+validating the RxnConSystem, generating the Boolean model and exporting it to BoolNet, generating the rule-based
+model and exporting it to BNGL, and building and exporting the reaction and regulatory graphs.
+
+The results are written as JSON, containing the parameters, the versions and per size the fastest and all timings
+of every stage in seconds, so that the results of different versions can be compared."""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+from rxncon.input.quick.quick import Quick
+from rxncon.input.synthetic.synthetic import synthetic_quick_str
+from rxncon.simulation.boolean.boolean_model import boolean_model_from_rxncon
+from rxncon.simulation.boolean.boolnet_from_boolean_model import boolnet_from_boolean_model
+from rxncon.simulation.rule_based.bngl_from_rule_based_model import bngl_from_rule_based_model
+from rxncon.simulation.rule_based.rule_based_model import rule_based_model_from_rxncon
+from rxncon.util.profiling import PROFILER
+from rxncon.visualization.graphML import XGMML
+from rxncon.visualization.reaction_graph import rxngraph_from_rxncon_system
+from rxncon.visualization.regulatory_graph import RegulatoryGraph
+
+# The spans of Quick and RxnConSystem splitting up the construction of the system into stages.
+CONSTRUCTION_SPANS = OrderedDict([('parsing', 'quick parsing'),
+                                  ('system construction', 'rxncon system construction'),
+                                  ('validation', 'validation')])
+
+STAGES = list(CONSTRUCTION_SPANS.keys()) + ['boolean model', 'boolnet export', 'rule-based model', 'bngl export',
+                                            'reaction graph', 'regulatory graph']
+
+
+def timed(stage: Callable[[], Any], timings: Dict[str, float], name: str) -> Any:
+    start = time.perf_counter()
+    result = stage()
+    timings[name] = time.perf_counter() - start
+    return result
+
+
+def run_pipeline(quick_str: str, stages: List[str]) -> Dict[str, float]:
+    """Runs the pipeline on the Quick string, returns the wall time in seconds of the given stages."""
+    timings = OrderedDict()  # type: Dict[str, float]
+
+    PROFILER.enable(trace_memory=False)
+    try:
+        rxncon_system = Quick(quick_str).rxncon_system
+    finally:
+        PROFILER.disable()
+    for name, span_name in CONSTRUCTION_SPANS.items():
+        timings[name] = PROFILER.spans[span_name].wall_time
+
+    if 'boolean model' in stages or 'boolnet export' in stages:
+        boolean_model = timed(lambda: boolean_model_from_rxncon(rxncon_system), timings, 'boolean model')
+        if 'boolnet export' in stages:
+            timed(lambda: boolnet_from_boolean_model(boolean_model), timings, 'boolnet export')
+    if 'rule-based model' in stages or 'bngl export' in stages:
+        rule_based_model = timed(lambda: rule_based_model_from_rxncon(rxncon_system), timings, 'rule-based model')
+        if 'bngl export' in stages:
+            timed(lambda: bngl_from_rule_based_model(rule_based_model), timings, 'bngl export')
+    if 'reaction graph' in stages:
+        timed(lambda: XGMML(rxngraph_from_rxncon_system(rxncon_system).reaction_graph, 'reaction graph')
+              .to_string(), timings, 'reaction graph')
+    if 'regulatory graph' in stages:
+        timed(lambda: XGMML(RegulatoryGraph(rxncon_system).to_graph(), 'regulatory graph').to_string(),
+              timings, 'regulatory graph')
+
+    return OrderedDict((name, seconds) for name, seconds in timings.items() if name in stages)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@click.command()
+@click.option('--sizes', default='10,20,40', help='Comma separated numbers of components. Default: 10,20,40')
+@click.option('--domains', default=3, help='Number of domains (and residues) per component. Default: 3')
+@click.option('--density', default=1.0, help='Mean number of contingencies per reaction. Default: 1.0')
+@click.option('--depth', default=0, help='Nesting depth of the boolean contingencies. Default: 0')
+@click.option('--seed', default=0, help='Seed of the synthetic systems. Default: 0')
+@click.option('--repeat', default=3, help='Number of timed runs per size, the fastest is reported. Default: 3')
+@click.option('--stages', default=','.join(STAGES), help='Comma separated stages to run. Default: all of {}'
+              .format(', '.join(STAGES)))
+@click.option('--output', type=click.Path(dir_okay=False), help='JSON file to write the results to.')
+def run(sizes: str, domains: int, density: float, depth: int, seed: int, repeat: int, stages: str,
+        output: Optional[str]) -> None:
+    stage_list = [x.strip() for x in stages.split(',')]
+    unknown_stages = set(stage_list) - set(STAGES)
+    if unknown_stages:
+        raise click.BadParameter('Unknown stages {}'.format(', '.join(sorted(unknown_stages))))
+
+    results = []  # type: List[Dict[str, Any]]
+    for components in [int(x) for x in sizes.split(',')]:
+        quick_str = synthetic_quick_str(components, domains, contingency_density=density, nesting_depth=depth,
+                                        seed=seed)
+        runs = [run_pipeline(quick_str, stage_list) for _ in range(repeat)]
+        fastest = OrderedDict((stage, min(x[stage] for x in runs)) for stage in runs[0].keys())
+
+        reactions = len([x for x in quick_str.split('\n') if not x.startswith('<')])
+        print('{0} components, {1} reactions'.format(components, reactions))
+        for stage, seconds in fastest.items():
+            print('    {0:<22} {1:9.3f} s'.format(stage, seconds))
+
+        results.append(OrderedDict([('components', components), ('reactions', reactions), ('fastest', fastest),
+                                    ('runs', [OrderedDict(x) for x in runs])]))
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(OrderedDict([
+                ('git_commit', git_commit()),
+                ('python', sys.version.split()[0]),
+                ('platform', platform.platform()),
+                ('parameters', OrderedDict([('domains', domains), ('density', density), ('depth', depth),
+                                            ('seed', seed), ('repeat', repeat)])),
+                ('results', results)
+            ]), f, indent=2)
+
+
+if __name__ == '__main__':
+    run()
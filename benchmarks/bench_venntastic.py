@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""Benchmark of the mapping of the values of venntastic Sets onto pyeda variables, which precedes every
+calc_solutions, to_simplified_set, to_dnf_list, is_equivalent_to and eval_boolean_func call. For a flat
+Intersection and a nested expression (mixing Intersections, Unions and Complements, many values occurring more
+than once) of the given number of leaves, reports the time to collect the values, to map them onto variables, once
+with the hashed traversal and once with the pairwise deduplication used before, and to compile the expression into
+pyeda."""
+
+import functools
+import operator
+import random
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+import click
+
+from rxncon.venntastic.sets import Set, ValueSet, Complement, Intersection, Union, NarySet
+
+
+def flat_set(leaves: int) -> Set[int]:
+    """An Intersection of leaves distinct values."""
+    return Intersection(*(ValueSet(i) for i in range(leaves)))
+
+
+def nested_set(leaves: int, distinct: int, seed: int) -> Set[int]:
+    """A balanced tree of alternating Intersections and Unions of four children, every fourth leaf complemented,
+    the leaves drawn from distinct values."""
+    rng = random.Random(seed)
+    level = [ValueSet(rng.randrange(distinct)) for _ in range(leaves)]  # type: List[Set[int]]
+    level = [Complement(x) if i % 4 == 0 else x for i, x in enumerate(level)]
+    depth = 0
+    while len(level) > 1:
+        nary = Intersection if depth % 2 == 0 else Union
+        level = [nary(*level[i:i + 4]) for i in range(0, len(level), 4)]
+        depth += 1
+    return level[0]
+
+
+def pairwise_values(expr: Set[Any]) -> List[Any]:
+    """The values as collected before: concatenating the lists of the children."""
+    if isinstance(expr, ValueSet):
+        return [expr.value]
+    elif isinstance(expr, Complement):
+        return pairwise_values(expr.expr)
+    elif isinstance(expr, NarySet):
+        return functools.reduce(operator.add, [pairwise_values(x) for x in expr.exprs], [])
+    return []
+
+
+def pairwise_val_to_sym(expr: Set[Any]) -> Dict[Any, int]:
+    """The mapping as built before: deduplicating the values by comparing every value with the ones kept so far."""
+    vals = []  # type: List[Any]
+    for v in pairwise_values(expr):
+        if not any(v == existing for existing in vals):
+            vals.append(v)
+    return {val: i for i, val in enumerate(vals)}
+
+
+def stages(expr: Set[Any], pairwise: bool) -> List[Tuple[str, Callable[[], Any]]]:
+    val_to_sym = expr._make_val_to_sym_dict()  # pylint: disable=protected-access
+    res = [('values', lambda: expr.values),
+           ('val_to_sym', lambda: expr._make_val_to_sym_dict()),  # pylint: disable=protected-access
+           ('to pyeda', lambda: expr._to_pyeda_expr(val_to_sym))]  # type: List[Tuple[str, Callable[[], Any]]]
+    if pairwise:
+        res += [('values, pairwise', lambda: pairwise_values(expr)),
+                ('val_to_sym, pairwise', lambda: pairwise_val_to_sym(expr))]
+    return res
+
+
+@click.command()
+@click.option('--leaves', default=10000, help='Number of leaves of the expressions. Default: 10000')
+@click.option('--distinct', default=1000, help='Number of distinct values in the nested expression. Default: 1000')
+@click.option('--repeat', default=3, help='Number of timed runs, the fastest is reported. Default: 3')
+@click.option('--seed', default=0, help='Seed of the nested expression. Default: 0')
+@click.option('--pairwise/--no-pairwise', default=True, help='Also time the pairwise deduplication. Default: on')
+def run(leaves: int, distinct: int, repeat: int, seed: int, pairwise: bool) -> None:
+    for name, expr in [('flat', flat_set(leaves)), ('nested', nested_set(leaves, distinct, seed))]:
+        print('{0}, {1} leaves, {2} distinct values'.format(name, leaves, len(set(expr.values))))
+        for stage, func in stages(expr, pairwise):
+            seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+            print('    {0:<22} {1:9.4f} s'.format(stage, seconds))
+
+
+if __name__ == '__main__':
+    run()
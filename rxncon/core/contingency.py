@@ -61,9 +61,10 @@ class Contingency:
         """Returns a Contingency object where the structure information is merged among all Effector objects using
         `equivs`, an object that holds equivalent molecules: different names referring to the same molecule. For
         more details, see the `to_global_struct_effector` and `collect_global_equivs` methods in Effector."""
-        structured = self.clone()
-        equivs, counter = structured.effector.collect_global_equivs(equivs, counter, namespace)
-        structured.effector = structured.effector.to_global_struct_effector(equivs, counter, namespace)
+        equivs, counter = self.effector.collect_global_equivs(equivs, counter, namespace)
+        structured = Contingency(self.reaction, self.contingency_type,
+                                 self.effector.to_global_struct_effector(equivs, counter, namespace),
+                                 validate_equivs_specs=False)
         structured.validate_struct_indices()
         structured.validate_equivs_specs()
         return structured
@@ -111,6 +112,10 @@ class Contingency:
         is False, the structure information is discarded. Optionally all States can be wrapped in some other
         class by providing a `state_wrapper`."""
         def parse_effector(eff: Effector) -> VennSet:
+            # The Sets of Effectors shared between contingencies are shared as well.
+            return eff.memoized(('venn_set', structured, state_wrapper), lambda: parse_effector_node(eff))
+
+        def parse_effector_node(eff: Effector) -> VennSet:
             if isinstance(eff, StateEffector):
                 if structured:
                     return ValueSet(state_wrapper(eff.expr))
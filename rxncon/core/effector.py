@@ -4,8 +4,9 @@ BooleanOperator, BooleanContingencyName, QualSpec, StructEquivalences, TrivialSt
 
 import re
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Tuple, Any
-from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Tuple, Deque
+from collections import deque
+from copy import copy
 from enum import Enum, unique
 import logging
 
@@ -52,6 +53,8 @@ class BooleanContingencyName:
 class QualSpec:
     """QualSpec holds a Spec that lives in a namespace. The namespace is a list of
     (stringified) boolean contingency names."""
+    __slots__ = ('namespace', 'spec', '_name')
+
     def __init__(self, namespace: List[str], spec: Spec) -> None:
         self.namespace = namespace
         self.spec = spec
@@ -68,6 +71,9 @@ class QualSpec:
             return NotImplemented
         return self.namespace == other.namespace and self.spec == other.spec
 
+    def __hash__(self) -> int:
+        return hash(self._name)
+
     def to_component_qual_spec(self) -> 'QualSpec':
         return QualSpec(self.namespace, self.spec.to_component_spec())
 
@@ -76,7 +82,7 @@ class QualSpec:
         return not self.namespace
 
     def with_prepended_namespace(self, extra_namespace: List[str]) -> 'QualSpec':
-        new_namespace = deepcopy(extra_namespace) + deepcopy(self.namespace)
+        new_namespace = list(extra_namespace) + self.namespace
         return QualSpec(new_namespace, self.spec)
 
 
@@ -90,9 +96,19 @@ def qual_spec_from_str(qualified_spec_str: str) -> QualSpec:
 class StructEquivalences:
     """StructEquivalences holds equivalence classes of QualSpecs. Every element in an equivalence class corresponds
     to the same physical molecule. Elements within the same equivalence class might be labelled with a different
-    structure index when living in different namespaces."""
+    structure index when living in different namespaces.
+
+    The classes are stored as a disjoint-set forest: every QualSpec points to its parent, the root of a tree
+    represents the class. Finding the root compresses the path to it, merging two classes attaches the root of the
+    smaller one to the root of the larger one. Every root stores the members of its class, the first of them that
+    lives in the root namespace, and the position of the class in eq_classes. Merging a class into another one
+    appends its members and keeps the position of the other one, see _union."""
     def __init__(self) -> None:
-        self.eq_classes = []  # type: List[List[QualSpec]]
+        self._parent = {}  # type: Dict[QualSpec, QualSpec]
+        self._members = {}  # type: Dict[QualSpec, Deque[QualSpec]]
+        self._root_spec = {}  # type: Dict[QualSpec, Optional[Spec]]
+        self._position = {}  # type: Dict[QualSpec, int]
+        self._next_position = 0
 
     def __str__(self) -> str:
         s = ''
@@ -101,55 +117,67 @@ class StructEquivalences:
 
         return s
 
+    def __deepcopy__(self, memodict: Dict) -> 'StructEquivalences':
+        """The QualSpecs are never mutated, it suffices to copy the containers holding them."""
+        res = StructEquivalences()
+        res._parent = dict(self._parent)
+        res._members = {root: deque(members) for root, members in self._members.items()}
+        res._root_spec = dict(self._root_spec)
+        res._position = dict(self._position)
+        res._next_position = self._next_position
+
+        return res
+
+    @property
+    def eq_classes(self) -> List[List[QualSpec]]:
+        return [list(self._members[root]) for root in sorted(self._members.keys(), key=lambda x: self._position[x])]
+
     @property
     def specs(self):
-        return list(set(qual_spec.spec.to_component_spec().to_non_struct_spec()
-                        for eq_class in self.eq_classes for qual_spec in eq_class))
+        return list(set(qual_spec.spec.to_component_spec().to_non_struct_spec() for qual_spec in self._parent.keys()))
 
     def add_equivalence(self, first_qual_spec: QualSpec, second_qual_spec: QualSpec) -> None:
         first_qual_spec, second_qual_spec = first_qual_spec.to_component_qual_spec(), \
                                             second_qual_spec.to_component_qual_spec()
-
-        found_first = None
-        found_second = None
-        for eq_class in self.eq_classes:
-            if first_qual_spec in eq_class:
-                if second_qual_spec not in eq_class:
-                    eq_class.append(second_qual_spec)
-                found_first = eq_class
-            elif second_qual_spec in eq_class:
-                if first_qual_spec not in eq_class:
-                    eq_class.append(first_qual_spec)
-                found_second = eq_class
-
-        if found_first and found_second:
-            found_first += found_second
-            self.eq_classes.remove(found_second)
-
-        if not (found_first or found_second):
-            self.eq_classes.append([first_qual_spec, second_qual_spec])
+        # A new first QualSpec joins the existing class of the second one, otherwise the second one's class is
+        # merged into the first one's.
+        first_is_new, second_is_new = first_qual_spec not in self._parent, second_qual_spec not in self._parent
+        first_root, second_root = self._find_or_add(first_qual_spec), self._find_or_add(second_qual_spec)
+        if first_root == second_root:
+            return
+        elif first_is_new and not second_is_new:
+            self._union(second_root, first_root)
+        else:
+            self._union(first_root, second_root)
 
     def add_equivalence_class(self, eq_class: List[QualSpec]) -> None:
-        for existing_class in self.eq_classes:
-            if next((x for x in existing_class if x.to_component_qual_spec() in eq_class), False):
-                for elem in eq_class:
-                    self.add_equivalence(elem.to_component_qual_spec(), existing_class[0])
-                return
-
-        self.eq_classes.append([x.to_component_qual_spec() for x in eq_class])
+        qual_specs = [x.to_component_qual_spec() for x in eq_class]
+        existing_roots = [self._find(x) for x in qual_specs if x in self._parent]
+
+        if existing_roots:
+            # The new elements are merged into the first existing class (in the order of eq_classes) that they
+            # overlap with, which in turn is merged with the other classes they overlap with.
+            anchor = min(existing_roots, key=lambda x: self._position[x])
+            for qual_spec in qual_specs:
+                self.add_equivalence(qual_spec, anchor)
+        else:
+            for qual_spec in qual_specs[1:]:
+                self.add_equivalence(qual_specs[0], qual_spec)
+            if len(qual_specs) == 1:
+                self._find_or_add(qual_specs[0])
 
     def merge_with(self, other: 'StructEquivalences', other_base_namespace: List[str]) -> None:
         for other_eq_class in other.eq_classes:
             self.add_equivalence_class([x.with_prepended_namespace(other_base_namespace) for x in other_eq_class])
 
     def find_unqualified_spec(self, qual_spec: QualSpec) -> Optional[Spec]:
-        for eq_class in self.eq_classes:
-            if qual_spec.to_component_qual_spec() in eq_class:
-                existing_spec = deepcopy(
-                    next((x.spec for x in eq_class if x.is_in_root_namespace), None))  # type: ignore
-                if existing_spec:
-                    existing_spec.locus = deepcopy(qual_spec.spec.locus)
-                    return existing_spec
+        component_qual_spec = qual_spec.to_component_qual_spec()
+        if component_qual_spec not in self._parent:
+            return None
+
+        existing_spec = self._root_spec[self._find(component_qual_spec)]
+        if existing_spec:
+            return existing_spec.with_locus(qual_spec.spec.locus)
 
         return None
 
@@ -157,6 +185,45 @@ class StructEquivalences:
         return [qspec.spec.struct_index for eq_class in self.eq_classes for qspec in eq_class
                 if qspec.is_in_root_namespace and qspec.spec.struct_index is not None]
 
+    def _find(self, qual_spec: QualSpec) -> QualSpec:
+        root = qual_spec
+        while self._parent[root] != root:
+            root = self._parent[root]
+
+        while qual_spec != root:
+            self._parent[qual_spec], qual_spec = root, self._parent[qual_spec]
+
+        return root
+
+    def _find_or_add(self, qual_spec: QualSpec) -> QualSpec:
+        if qual_spec in self._parent:
+            return self._find(qual_spec)
+
+        self._parent[qual_spec] = qual_spec
+        self._members[qual_spec] = deque([qual_spec])
+        self._root_spec[qual_spec] = qual_spec.spec if qual_spec.is_in_root_namespace else None
+        self._position[qual_spec] = self._next_position
+        self._next_position += 1
+
+        return qual_spec
+
+    def _union(self, first_root: QualSpec, second_root: QualSpec) -> None:
+        # The merged class takes the place of the first one in eq_classes, its members are those of the first one
+        # followed by those of the second one, irrespective of which root survives. The members of the smaller
+        # class are added at the matching end of the deque of the larger one.
+        root_spec, position = self._root_spec[first_root] or self._root_spec[second_root], self._position[first_root]
+        if len(self._members[first_root]) < len(self._members[second_root]):
+            self._members[second_root].extendleft(reversed(self._members.pop(first_root)))
+            first_root, second_root = second_root, first_root
+        else:
+            self._members[first_root].extend(self._members.pop(second_root))
+
+        self._parent[second_root] = first_root
+        self._root_spec[first_root] = root_spec
+        del self._root_spec[second_root]
+        self._position[first_root] = position
+        del self._position[second_root]
+
 
 class TrivialStructEquivalences(StructEquivalences):
     """TrivialStructEquivalences describes a situation in which all molecules are inequivalent:
@@ -172,6 +239,12 @@ class TrivialStructEquivalences(StructEquivalences):
     def __str__(self) -> str:
         return 'TrivialStructEquivalences'
 
+    def __deepcopy__(self, memodict: Dict) -> 'TrivialStructEquivalences':
+        res = TrivialStructEquivalences(dict(self.struct_specs))
+        res.cur_index = self.cur_index
+
+        return res
+
     @property
     def specs(self):
         return list(set(spec.to_component_spec().to_non_struct_spec() for spec in self.struct_specs.keys()))
@@ -187,12 +260,10 @@ class TrivialStructEquivalences(StructEquivalences):
 
     def find_unqualified_spec(self, qual_spec: QualSpec) -> Optional[Spec]:
         try:
-            struct_spec = deepcopy(self.struct_specs[qual_spec.spec.to_component_spec()])
-            struct_spec.locus = deepcopy(qual_spec.spec.locus)
-            return struct_spec
+            return self.struct_specs[qual_spec.spec.to_component_spec()].with_locus(qual_spec.spec.locus)
         except KeyError:
             self.struct_specs[qual_spec.spec.to_component_spec()] = \
-                deepcopy(qual_spec.spec.to_component_spec().with_struct_index(self.cur_index))
+                qual_spec.spec.to_component_spec().with_struct_index(self.cur_index)
             self.cur_index += 1
             return self.find_unqualified_spec(qual_spec)
 
@@ -213,12 +284,35 @@ class StructCounter:
 
 
 class Effector(ABC):
-    """Effector is the abstract parent class of the different types of Effector."""
+    """Effector is the abstract parent class of the different types of Effector. Apart from the dereferencing of
+    boolean contingencies while parsing, Effectors are never mutated: structuring an Effector returns a new one,
+    which shares the unchanged subtrees with the original. Copies therefore share the Effector as well."""
     def __init__(self):
         """All children have the `name` attribute, this code will never be called but exists purely to
         satisy the type checker."""
         self.name = None  # type: Optional[str]
 
+    def __deepcopy__(self, memodict: Dict) -> 'Effector':
+        return self
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop('_memo', None)
+        return state
+
+    def memoized(self, key: Any, derive: Callable[[], Any]) -> Any:
+        """Returns the data derived from the Effector under the given key, deriving it on first use. Since
+        Effectors are shared between contingencies, so is the derived data."""
+        try:
+            memo = self.__dict__['_memo']
+        except KeyError:
+            memo = self.__dict__['_memo'] = {}
+        try:
+            return memo[key]
+        except KeyError:
+            derived = memo[key] = derive()
+            return derived
+
     @property
     @abstractmethod
     def states(self) -> List[State]:
@@ -280,7 +374,7 @@ class StateEffector(Effector):
 
     @property
     def states(self) -> List[State]:
-        return [deepcopy(self.expr)]
+        return [self.expr]
 
     @property
     def is_structured(self) -> bool:
@@ -296,7 +390,7 @@ class StateEffector(Effector):
                                   counter: StructCounter = None,
                                   cur_namespace: List[str] = None) -> Effector:
         glob_equivs, counter, cur_namespace = self._init_to_struct_effector_args(glob_equivs, counter, cur_namespace)
-        state = deepcopy(self.expr)
+        state = self.expr
         updates = {}
 
         assert not (state.is_homodimer and not state.is_structured), \
@@ -311,21 +405,23 @@ class StateEffector(Effector):
             if existing_spec:
                 updates[spec] = existing_spec
             else:
-                new_spec = deepcopy(spec)
-                new_spec.struct_index = self._generate_index(glob_equivs, counter)
+                new_spec = spec.with_struct_index(self._generate_index(glob_equivs, counter))
 
                 updates[spec] = new_spec
                 glob_equivs.add_equivalence(QualSpec([], new_spec), QualSpec(cur_namespace, spec))
 
-        state.update_specs(updates)
+        state = state.with_updated_specs(updates)
         LOGGER.debug('to_global_struct_effector : Result {}'.format(str(state)))
 
+        if state == self.expr:
+            return self
         return StateEffector(state, name=self.name)
 
     @staticmethod
     def _generate_index(glob_equivs: StructEquivalences, cur_index: StructCounter) -> int:
         index = cur_index.value
-        while index in glob_equivs.indices_in_root_namespace():
+        indices = set(glob_equivs.indices_in_root_namespace())
+        while index in indices:
             cur_index.increment()
             index = cur_index.value
 
@@ -378,8 +474,10 @@ class NotEffector(Effector):
             raise AssertionError('Cannot to_global_struct_effector nameless NotEffectors.')
 
         glob_equivs, counter, cur_namespace = self._init_to_struct_effector_args(glob_equivs, counter, cur_namespace)
-        return NotEffector(self.expr.to_global_struct_effector(glob_equivs, counter, cur_namespace + [self.name]),
-                           name=self.name)
+        expr = self.expr.to_global_struct_effector(glob_equivs, counter, cur_namespace + [self.name])
+        if expr is self.expr:
+            return self
+        return NotEffector(expr, name=self.name)
 
 
 class NaryEffector(Effector, ABC):
@@ -390,7 +488,7 @@ class NaryEffector(Effector, ABC):
         assert len(exprs) != 0
 
         if len(exprs) == 1:
-            res = deepcopy(exprs[0])
+            res = copy(exprs[0])
             try:
                 res.name = kwargs['name']
             except KeyError:
@@ -413,6 +511,10 @@ class NaryEffector(Effector, ABC):
         except KeyError:
             self.equivs = StructEquivalences()
 
+    def __getnewargs__(self) -> Tuple[Effector, ...]:
+        """Unpickling goes through __new__, which needs the member Effectors to decide what to construct."""
+        return self.exprs
+
     @property
     def states(self) -> List[State]:
         return [state for x in self.exprs for state in x.states]
@@ -447,23 +549,18 @@ class NaryEffector(Effector, ABC):
             raise AssertionError('Cannot to_global_struct_effector nameless NaryEffectors.')
 
         glob_equivs, counter, cur_namespace = self._init_to_struct_effector_args(glob_equivs, counter, cur_namespace)
-        return type(self)(*(x.to_global_struct_effector(
-            glob_equivs, counter, cur_namespace + [self.name]) for x in self.exprs), name=self.name)
+        exprs = tuple(x.to_global_struct_effector(glob_equivs, counter, cur_namespace + [self.name])
+                      for x in self.exprs)
+        # The structured Effector carries no equivalences, it can only be shared if this one carries none either.
+        if all(x is y for x, y in zip(exprs, self.exprs)) and not self.equivs.eq_classes:
+            return self
+        return type(self)(*exprs, name=self.name)
 
 
 class AndEffector(NaryEffector):
     """AndEffector describes a logical AND between two or more Effectors. If the AndEffector
     contains only a single effector, we replace the AndEffector's construction with that
     single effector."""
-    def __deepcopy__(self, memodict: Dict) -> 'AndEffector':
-        """It is required to override __deepcopy__ since we are overriding __new__ with the
-        functionality to return an object of a different class."""
-        res = AndEffector(*(deepcopy(x) for x in self.exprs))
-        res.name = self.name
-        res.equivs = deepcopy(self.equivs)
-
-        return res
-
     def __str__(self) -> str:
         if self.name:
             return 'AndEffector{0}({1})'.format(self.name, ','.join(str(x) for x in self.exprs))
@@ -483,15 +580,6 @@ class OrEffector(NaryEffector):
     """OrEffector describes a logical OR between two or more Effectors. If the OrEffector
     contains only a single effector, we replace the OrEffector's construction with that
     single effector."""
-    def __deepcopy__(self, memodict: Dict) -> 'OrEffector':
-        """It is required to override __deepcopy__ since we are overriding __new__ with the
-        functionality to return an object of a different class."""
-        res = OrEffector(*(deepcopy(x) for x in self.exprs))
-        res.name = self.name
-        res.equivs = deepcopy(self.equivs)
-
-        return res
-
     def __str__(self) -> str:
         if self.name:
             return 'OrEffector{0}({1})'.format(self.name, ','.join(str(x) for x in self.exprs))
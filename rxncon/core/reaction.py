@@ -3,12 +3,15 @@ definitions and the list of bidirectional reactions (that get split into two uni
 which the contingency is only applied to the forward reaction)."""
 
 
-from typing import Dict, Any, List, Optional, Callable, TypeVar
+from typing import Dict, Any, List, Optional, Callable, TypeVar, Tuple, FrozenSet, Pattern, MutableMapping
+from collections import OrderedDict
 import re
-from copy import deepcopy
+from copy import copy, deepcopy
 
 from rxncon.core.spec import Spec, MRNASpec, ProteinSpec, LocusResolution, GeneSpec, spec_from_str
 from rxncon.core.state import State, state_from_str, FullyNeutralState
+import rxncon.core.state
+from rxncon.util.utils import LRUCache
 
 
 T = TypeVar('T')
@@ -17,6 +20,9 @@ T = TypeVar('T')
 SPEC_REGEX_MATCHING = r'([A-Za-z][A-Za-z0-9]*(?:@[\d]+)*(?:_\[[\w\/\(\)]+\])*)'
 SPEC_REGEX_NON_MATCHING = r'(?:[A-Za-z][A-Za-z0-9]*(?:@[\d]+)*(?:_\[[\w\/\(\)]+\])*)'
 OUTPUT_REACTION_REGEX = r'^\[[\w-]*\]$'
+OUTPUT_REACTION_PATTERN = re.compile(OUTPUT_REACTION_REGEX)
+NAME_DEF_VERB_REGEX = r'^\$x_(\S+)_\$y$'
+RULE_DEF_VAR_PATTERN = re.compile(r'(\$\S*?%)')
 # These reactions get split into two unidirectional ones, i.e. 'ppi' becomes 'ppi+' and 'ppi-'.
 # The contingency then only gets applied on the forward reaction.
 BIDIRECTIONAL_REACTIONS = [
@@ -28,6 +34,8 @@ class ReactionTerm:
     """ReactionTerm describes a single term in a reaction rule. The `specs` are the components on which the
     `states` live. The list `states` could be empty, e.g. for a kinase. However, the specs should all be
     components, and the states should all be elemental."""
+    __slots__ = ('specs', 'states')
+
     def __init__(self, specs: List[Spec], states: List[State]) -> None:
         if not all(spec.is_component_spec for spec in specs):
             raise SyntaxError('ReactionTerm contains non-component specs. Specs: {}; States: {}'.format(specs, states))
@@ -37,6 +45,11 @@ class ReactionTerm:
 
         self.specs, self.states = specs, states
 
+    def clone(self) -> 'ReactionTerm':
+        res = copy(self)
+        res.specs, res.states = list(self.specs), list(self.states)
+        return res
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, ReactionTerm):
             return NotImplemented
@@ -56,9 +69,32 @@ class ReactionDef:
     ARROW = '->'
 
     def __init__(self, reaction_class: str, name_def: str, vars_def: Dict[str, Any], rule_def: str) -> None:
-        self.reaction_class, self.name_def, self.vars_def, self.rule_def = reaction_class, name_def, vars_def, rule_def
+        self.reaction_class, self.vars_def, self.rule_def = reaction_class, vars_def, rule_def
+        self.name_def = name_def
         self._parse_reactants_def()
 
+    @property
+    def name_def(self) -> str:
+        return self._name_def
+
+    @name_def.setter
+    def name_def(self, name_def: str) -> None:
+        # The pattern matching reaction names is compiled on first use after the name definition is (re)set. Most
+        # definitions are never matched against, since reaction strings are dispatched on their verb.
+        self._name_def = name_def
+        self._matching_pattern = None  # type: Optional[Pattern[str]]
+        vars_in_order = sorted((var for var in self.vars_def.keys() if var in name_def), key=name_def.index)
+        self._var_to_group = {var: group for group, var in enumerate(vars_in_order, start=1)}
+
+    @property
+    def verb(self) -> Optional[str]:
+        """The lower case verb in the name definition '$x_verb_$y', or None if it is not of that form."""
+        verb_match = re.match(NAME_DEF_VERB_REGEX, self.name_def)
+        if verb_match and '_' not in verb_match.group(1):
+            return verb_match.group(1).lower()
+        else:
+            return None
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, ReactionDef):
             return NotImplemented
@@ -73,7 +109,7 @@ class ReactionDef:
                                                                         self.rule_def)
 
     def matches_name_def(self, name: str) -> bool:
-        return True if re.match(self._to_matching_regex(), name) else False
+        return True if self._compiled_pattern().match(name) else False
 
     def name_from_vars(self, var_to_val: Dict[str, Any]) -> str:
         representation = self.name_def
@@ -83,21 +119,11 @@ class ReactionDef:
         return representation
 
     def vars_from_name(self, name: str) -> Dict[str, Any]:
-        assert self.matches_name_def(name)
-
-        var_to_val = {}
-        for var, _ in self.vars_def.items():
-            var_regex = self._to_base_regex().replace(var, SPEC_REGEX_MATCHING)
-            for other_var in self.vars_def.keys():
-                if other_var != var:
-                    var_regex = var_regex.replace(other_var, SPEC_REGEX_NON_MATCHING)
+        name_match = self._compiled_pattern().match(name)
+        assert name_match
 
-            val_str = re.match(var_regex, name).group(1)
-            val = spec_from_str(val_str)
-
-            var_to_val[var] = val
-
-        return var_to_val
+        # The matching pattern captures the variables in the order in which they appear in the name definition.
+        return {var: spec_from_str(name_match.group(self._var_to_group[var])) for var in self.vars_def.keys()}
 
     def validate_vars(self, var_to_val: Dict[str, Any]) -> None:
         for var, val in var_to_val.items():
@@ -139,7 +165,7 @@ class ReactionDef:
                 raise SyntaxError('Error in ReactionDef {}'.format(self.reaction_class))
 
             result_str = vars_str
-            for x in re.findall(r'(\$\S*?%)', vars_str):
+            for x in RULE_DEF_VAR_PATTERN.findall(vars_str):
                 var_symbol = x.split('.')[0]
 
                 if var_symbol[-1] == '%':
@@ -166,6 +192,11 @@ class ReactionDef:
         except SyntaxError as e:
             raise SyntaxError('Could not parse reaction {}, {}'.format(term_def, e.msg))
 
+    def _compiled_pattern(self) -> Pattern[str]:
+        if self._matching_pattern is None:
+            self._matching_pattern = re.compile(self._to_matching_regex())
+        return self._matching_pattern
+
     def _to_base_regex(self) -> str:
         # The (?i) makes the regex case insensitive.
         return r'(?i)^{}$'.format(self.name_def.replace('+', r'\+'))
@@ -182,6 +213,17 @@ class ReactionDef:
 # In addition to the DEFAULT_REACTION_DEFS, reactions unique to the system under study can be defined
 # in the Excel sheet containing the rxncon system.
 REACTION_DEFS = []  # type: List[ReactionDef]
+# The additional definitions REACTION_DEFS was last initialized with, see additional_reaction_defs.
+_ADDITIONAL_REACTION_DEFS = []  # type: List[Dict[str, str]]
+# Dispatch table from the (lower case) verb to the ReactionDefs carrying it, and the parsed Reactions keyed by
+# the normalized reaction string and the 'standardize' flag. Both are reset whenever REACTION_DEFS changes, the
+# Reaction cache also when the StateModifiers are reinitialized, see _check_reaction_defs. The Reaction cache
+# holds at most REACTION_CACHE_SIZE Reactions, evicting the least recently parsed ones.
+REACTION_CACHE_SIZE = 2 ** 14
+_DISPATCHED_REACTION_DEFS = []  # type: List[ReactionDef]
+_CACHED_STATE_MODIFIER = None  # type: Any
+_VERB_TO_REACTION_DEFS = {}  # type: Dict[Optional[str], List[ReactionDef]]
+_REACTION_CACHE = LRUCache(REACTION_CACHE_SIZE)  # type: MutableMapping[Tuple[str, bool], Reaction]
 
 
 DEFAULT_REACTION_DEFS = [
@@ -392,9 +434,11 @@ def initialize_reaction_defs(additional_defs: List[Dict[str, str]]=None) -> None
     global REACTION_DEFS
     global DEFAULT_REACTION_DEFS
     global BIDIRECTIONAL_REACTIONS
+    global _ADDITIONAL_REACTION_DEFS
 
     if not additional_defs:
         additional_defs = []
+    _ADDITIONAL_REACTION_DEFS = [dict(x) for x in additional_defs]
 
     type_str_to_spec = {
         'Any': Spec,
@@ -452,6 +496,33 @@ def initialize_reaction_defs(additional_defs: List[Dict[str, str]]=None) -> None
     REACTION_DEFS = DEFAULT_REACTION_DEFS + parsed_defs
 
 
+def additional_reaction_defs() -> List[Dict[str, str]]:
+    """Returns the additional reaction definitions REACTION_DEFS was last initialized with, in the form taken by
+    initialize_reaction_defs, e.g. to initialize another process alike."""
+    return [dict(x) for x in _ADDITIONAL_REACTION_DEFS]
+
+
+def _check_reaction_defs() -> None:
+    """Rebuilds the verb dispatch table and empties the Reaction cache if REACTION_DEFS has changed since the
+    last call. The ReactionDefs whose name definition has no verb are stored under None. The Reaction cache is
+    also emptied if the StateModifiers have been reinitialized, since its ModificationStates carry the old ones."""
+    global _DISPATCHED_REACTION_DEFS, _CACHED_STATE_MODIFIER
+
+    if _CACHED_STATE_MODIFIER is not rxncon.core.state.StateModifier:
+        _CACHED_STATE_MODIFIER = rxncon.core.state.StateModifier
+        _REACTION_CACHE.clear()
+
+    if len(_DISPATCHED_REACTION_DEFS) == len(REACTION_DEFS) and \
+            all(x is y for x, y in zip(_DISPATCHED_REACTION_DEFS, REACTION_DEFS)):
+        return
+
+    _DISPATCHED_REACTION_DEFS = list(REACTION_DEFS)
+    _VERB_TO_REACTION_DEFS.clear()
+    for reaction_def in REACTION_DEFS:
+        _VERB_TO_REACTION_DEFS.setdefault(reaction_def.verb, []).append(reaction_def)
+    _REACTION_CACHE.clear()
+
+
 initialize_reaction_defs()
 
 
@@ -470,11 +541,8 @@ class Reaction:  # pylint: disable=too-many-instance-attributes
         self.terms_rhs = reaction_def.terms_rhs_from_vars(var_to_val)
         self.name = reaction_def.name_from_vars(var_to_val)
 
-        # This information is cached, and lazily initialised.
-        self._consumed_states = None  # type: Optional[List[State]]
-        self._produced_states = None  # type: Optional[List[State]]
-        self._synthesised_states = None  # type: Optional[List[State]]
-        self._degraded_states = None  # type: Optional[List[State]]
+        # The data derived from the terms is computed lazily, and cached until invalidate_state_cache is called.
+        self._memo = {}  # type: Dict[str, Any]
 
     def __hash__(self) -> int:
         return hash(str(self))
@@ -493,115 +561,110 @@ class Reaction:  # pylint: disable=too-many-instance-attributes
     def __getitem__(self, item: str) -> Any:
         return self.var_to_val[item]
 
+    def clone(self) -> 'Reaction':
+        """Returns a copy with its own ReactionTerms, which a RxnConSystem modifies when expanding the fully
+        neutral states."""
+        res = copy(self)
+        res.var_to_val = dict(self.var_to_val)
+        res.terms_lhs = [term.clone() for term in self.terms_lhs]
+        res.terms_rhs = [term.clone() for term in self.terms_rhs]
+        res.invalidate_state_cache()
+        return res
+
     def invalidate_state_cache(self) -> None:
-        self._consumed_states = None
-        self._produced_states = None
-        self._synthesised_states = None
-        self._degraded_states = None
+        """Drops all data derived from the terms, which has to be called after the terms have been modified."""
+        self._memo = {}
 
-    @property
-    def components_lhs(self) -> List[Spec]:
-        return [spec for term in self.terms_lhs for spec in term.specs]
+    def _memoized(self, key: str, derive: Callable[[], Any]) -> Any:
+        try:
+            return self._memo[key]
+        except KeyError:
+            derived = derive()
+            self._memo[key] = derived
+            return derived
 
     @property
-    def components_rhs(self) -> List[Spec]:
-        return [spec for term in self.terms_rhs for spec in term.specs]
+    def components_lhs(self) -> Tuple[Spec, ...]:
+        return self._memoized('components_lhs', lambda: tuple(spec for term in self.terms_lhs for spec in term.specs))
 
     @property
-    def components(self) -> List[Spec]:
-        return list(set(self.components_lhs + self.components_rhs))
+    def components_rhs(self) -> Tuple[Spec, ...]:
+        return self._memoized('components_rhs', lambda: tuple(spec for term in self.terms_rhs for spec in term.specs))
 
     @property
-    def components_lhs_structured(self) -> List[Spec]:
-        return [spec.with_struct_index(i) for i, spec in enumerate(self.components_lhs)]
+    def components_lhs_set(self) -> FrozenSet[Spec]:
+        return self._memoized('components_lhs_set', lambda: frozenset(self.components_lhs))
 
     @property
-    def components_rhs_structured(self) -> List[Spec]:
-        return [spec.with_struct_index(i) for i, spec in enumerate(self.components_rhs)]
+    def components_rhs_set(self) -> FrozenSet[Spec]:
+        return self._memoized('components_rhs_set', lambda: frozenset(self.components_rhs))
 
     @property
-    def consumed_states(self) -> List[State]:
-        if self._consumed_states is None:
-            self._consumed_states = []
-
-            for term in self.terms_lhs:
-                if all(spec in self.components_rhs for spec in term.specs):
-                    self._consumed_states += term.states
-
-        return self._consumed_states
+    def components(self) -> Tuple[Spec, ...]:
+        return self._memoized('components',
+                              lambda: tuple(OrderedDict.fromkeys(self.components_lhs + self.components_rhs)))
 
     @property
-    def produced_states(self) -> List[State]:
-        if self._produced_states is None:
-            self._produced_states = []
-
-            for term in self.terms_rhs:
-                if all(spec in self.components_lhs for spec in term.specs):
-                    self._produced_states += term.states
-
-        return self._produced_states
+    def components_lhs_structured(self) -> Tuple[Spec, ...]:
+        return self._memoized('components_lhs_structured',
+                              lambda: tuple(spec.with_struct_index(i) for i, spec in enumerate(self.components_lhs)))
 
     @property
-    def degraded_states(self) -> List[State]:
-        if self._degraded_states is None:
-            self._degraded_states = []
-
-            for term in self.terms_lhs:
-                if not any(spec in self.components_rhs for spec in term.specs):
-                    self._degraded_states += term.states
-
-        return self._degraded_states
+    def components_rhs_structured(self) -> Tuple[Spec, ...]:
+        return self._memoized('components_rhs_structured',
+                              lambda: tuple(spec.with_struct_index(i) for i, spec in enumerate(self.components_rhs)))
 
     @property
-    def synthesised_states(self) -> List[State]:
-        if self._synthesised_states is None:
-            self._synthesised_states = []
-
-            for term in self.terms_rhs:
-                if not any(spec in self.components_lhs for spec in term.specs):
-                    # if none of the components from the lhs are in termn_rhs do:
-                    self._synthesised_states += term.states
+    def consumed_states(self) -> Tuple[State, ...]:
+        return self._memoized('consumed_states', lambda: tuple(
+            state for term in self.terms_lhs if self.components_rhs_set.issuperset(term.specs)
+            for state in term.states))
 
+    @property
+    def produced_states(self) -> Tuple[State, ...]:
+        return self._memoized('produced_states', lambda: tuple(
+            state for term in self.terms_rhs if self.components_lhs_set.issuperset(term.specs)
+            for state in term.states))
 
-        return self._synthesised_states
+    @property
+    def degraded_states(self) -> Tuple[State, ...]:
+        return self._memoized('degraded_states', lambda: tuple(
+            state for term in self.terms_lhs if self.components_rhs_set.isdisjoint(term.specs)
+            for state in term.states))
 
     @property
-    def degraded_components(self) -> List[Spec]:
-        structured_components = [component for component in self.components_lhs_structured if component not in self.components_rhs_structured]
-        components = []
-        for component in structured_components:
-            # destructurize
-            component.struct_index = None
-            components.append(component)
-        return components
+    def synthesised_states(self) -> Tuple[State, ...]:
+        return self._memoized('synthesised_states', lambda: tuple(
+            state for term in self.terms_rhs if self.components_lhs_set.isdisjoint(term.specs)
+            for state in term.states))
 
     @property
-    def synthesised_components(self) -> List[Spec]:
-        structured_components= [component for component in self.components_rhs_structured if component not in self.components_lhs_structured]
-        components = []
-        for component in structured_components:
-            # destructurize
-            component.struct_index = None
-            components.append(component)
-        return components
+    def degraded_components(self) -> Tuple[Spec, ...]:
+        def derive() -> Tuple[Spec, ...]:
+            rhs_structured = frozenset(self.components_rhs_structured)
+            return tuple(component.to_non_struct_spec() for component in self.components_lhs_structured
+                         if component not in rhs_structured)
+
+        return self._memoized('degraded_components', derive)
 
     @property
-    def modifier_components(self) -> List[Spec]:
-        res = []  # type: List[Spec]
-        for term in self.terms_lhs:
-            if term in self.terms_rhs:
-                res += term.specs
+    def synthesised_components(self) -> Tuple[Spec, ...]:
+        def derive() -> Tuple[Spec, ...]:
+            lhs_structured = frozenset(self.components_lhs_structured)
+            return tuple(component.to_non_struct_spec() for component in self.components_rhs_structured
+                         if component not in lhs_structured)
 
-        return res
+        return self._memoized('synthesised_components', derive)
 
     @property
-    def modifier_states(self) -> List[State]:
-        res = []  # type: List[State]
-        for term in self.terms_lhs:
-            if term in self.terms_rhs:
-                res += term.states
+    def modifier_components(self) -> Tuple[Spec, ...]:
+        return self._memoized('modifier_components', lambda: tuple(
+            spec for term in self.terms_lhs if term in self.terms_rhs for spec in term.specs))
 
-        return res
+    @property
+    def modifier_states(self) -> Tuple[State, ...]:
+        return self._memoized('modifier_states', lambda: tuple(
+            state for term in self.terms_lhs if term in self.terms_rhs for state in term.states))
 
 
 class OutputReaction(Reaction):
@@ -611,6 +674,7 @@ class OutputReaction(Reaction):
         self.name = name
         self.terms_lhs = []
         self.terms_rhs = []
+        self._memo = {}
 
     def __hash__(self) -> int:
         return hash(str(self))
@@ -626,52 +690,73 @@ class OutputReaction(Reaction):
     def __repr__(self) -> str:
         return 'OutputReaction<{}>'.format(self.name)
 
-    @property
-    def components_rhs(self) -> List[Spec]:
-        return []
+    def clone(self) -> 'OutputReaction':
+        return OutputReaction(self.name)
 
     @property
-    def consumed_states(self) -> List[State]:
-        return []
+    def components_rhs(self) -> Tuple[Spec, ...]:
+        return ()
 
     @property
-    def degraded_states(self) -> List[State]:
-        return []
+    def consumed_states(self) -> Tuple[State, ...]:
+        return ()
 
     @property
-    def components_lhs(self) -> List[Spec]:
-        return []
+    def degraded_states(self) -> Tuple[State, ...]:
+        return ()
 
     @property
-    def synthesised_states(self) -> List[State]:
-        return []
+    def components_lhs(self) -> Tuple[Spec, ...]:
+        return ()
 
     @property
-    def degraded_components(self) -> List[Spec]:
-        return []
+    def synthesised_states(self) -> Tuple[State, ...]:
+        return ()
 
     @property
-    def synthesised_components(self) -> List[Spec]:
-        return []
+    def degraded_components(self) -> Tuple[Spec, ...]:
+        return ()
 
     @property
-    def produced_states(self) -> List[State]:
-        return []
+    def synthesised_components(self) -> Tuple[Spec, ...]:
+        return ()
 
-    def invalidate_state_cache(self) -> None:
-        pass
+    @property
+    def produced_states(self) -> Tuple[State, ...]:
+        return ()
 
 
 def matching_reaction_def(name: str) -> Optional[ReactionDef]:
-    """Given a ReactionDef string, returns the ReactionDef object or None."""
-    return next((reaction_def for reaction_def in REACTION_DEFS if reaction_def.matches_name_def(name)),
+    """Given a ReactionDef string, returns the ReactionDef object or None. Only the ReactionDefs whose verb
+    appears as a token in the name are tried."""
+    _check_reaction_defs()
+
+    tokens = {token.lower() for token in name.split('_')}
+    candidates = [reaction_def for verb, reaction_defs in _VERB_TO_REACTION_DEFS.items()
+                  if verb is None or verb in tokens for reaction_def in reaction_defs]
+    if len(candidates) > 1:
+        candidates.sort(key=REACTION_DEFS.index)
+
+    return next((reaction_def for reaction_def in candidates if reaction_def.matches_name_def(name)),
                 None)  # type: ignore
 
 
 def reaction_from_str(name: str, standardize: bool=True) -> Reaction:
     """Given a Reaction string, returns the Reaction object, or throws a SyntaxError if  not parsable.
     If 'standardize' is True, the parser is more lenient in what it accepts and first calls 'fixed_spec_types'
-    and 'fixed_resolutions'."""
+    and 'fixed_resolutions'. Parsed Reactions are memoized, every call returns a fresh clone."""
+    _check_reaction_defs()
+
+    key = (name.strip(), standardize)
+    try:
+        return _REACTION_CACHE[key].clone()
+    except KeyError:
+        reaction = _reaction_from_str(*key)
+        _REACTION_CACHE[key] = reaction
+        return reaction.clone()
+
+
+def _reaction_from_str(name: str, standardize: bool) -> Reaction:
     def fixed_spec_types(reaction_def: ReactionDef, var_to_val: Dict[str, Any]) -> Dict[str, Any]:
         """When the Specs appearing in a Reaction are not of the required type, e.g. a ProteinSpec is passed
         instead of a GeneSpec, this this function modifies them into the required type."""
@@ -705,17 +790,15 @@ def reaction_from_str(name: str, standardize: bool=True) -> Reaction:
             other = [x for x in keys if x != key][0]
             if not var_to_val[key].has_resolution(reaction_def.vars_def[key][1]):
                 if reaction_def.vars_def[key][1] == LocusResolution.domain:
-                    var_to_val[key].locus.domain = var_to_val[other].name
+                    var_to_val[key] = var_to_val[key].with_domain(var_to_val[other].name)
                 elif reaction_def.vars_def[key][1] == LocusResolution.residue:
-                    var_to_val[key].locus.residue = var_to_val[other].name
+                    var_to_val[key] = var_to_val[key].with_residue(var_to_val[other].name)
                 else:
                     raise NotImplementedError
 
         return var_to_val
 
-    name = name.strip()
-
-    if re.match(OUTPUT_REACTION_REGEX, name):
+    if OUTPUT_REACTION_PATTERN.match(name):
         return OutputReaction(name)
 
     reaction_def = matching_reaction_def(name)
@@ -4,27 +4,72 @@ get created by a synthesis reaction; this information is determined here. Also s
 e.g. a check that all States appearing in contingencies are actually appearing in reactions."""
 
 
-from typing import List, Dict, Tuple
-from itertools import product
-from collections import defaultdict, Counter
+from typing import List, Dict, Tuple, Optional, AbstractSet, MutableSet, Iterable, TYPE_CHECKING
+from collections import defaultdict, Counter, OrderedDict
 import logging
 
 from rxncon.core.contingency import ContingencyType, Contingency
 from rxncon.core.effector import Effector, AndEffector, OrEffector, NotEffector, StateEffector
-from rxncon.core.reaction import Reaction, ReactionTerm
-from rxncon.core.state import State, FullyNeutralState
+from rxncon.core.reaction import Reaction, ReactionTerm, OutputReaction, additional_reaction_defs, \
+    initialize_reaction_defs
+from rxncon.core.state import State, FullyNeutralState, StateExclusions, additional_state_modifiers, \
+    initialize_state_modifiers
 from rxncon.core.spec import Spec
-from rxncon.venntastic.sets import UniversalSet, Intersection, Set  # pylint: disable=unused-import
+from rxncon.util.profiling import span
+from rxncon.venntastic.sets import UniversalSet, Intersection, Complement, ValueSet, Set, BddVariableOrder, \
+    EXPR_BACKEND  # pylint: disable=unused-import
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext  # pylint: disable=unused-import
 
 LOGGER = logging.getLogger(__name__)
 
+# A (component name, domain, subdomain, residue) tuple, in which the locus fields can be None.
+LocusKey = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
 
 class RxnConSystem:  # pylint: disable=too-many-instance-attributes
-    """RxnConSystem holds all reactions and contingencies pertaining to a rxncon system."""
-    def __init__(self, reactions: List[Reaction], contingencies: List[Contingency]) -> None:
+    """RxnConSystem holds all reactions and contingencies pertaining to a rxncon system. The satisfiability of
+    the contingencies is validated per reaction, using validation_workers processes (default: serially) started
+    from validation_mp_context (default: the one of multiprocessing), and the venntastic validation_backend: pyeda
+    expressions (default) or BDDs with the variable order of the system."""
+    def __init__(self, reactions: List[Reaction], contingencies: List[Contingency],
+                 validation_workers: int=1, validation_backend: str=EXPR_BACKEND,
+                 validation_mp_context: Optional['BaseContext']=None) -> None:
+        self.validation_workers = validation_workers
+        self.validation_backend = validation_backend
+        self.validation_mp_context = validation_mp_context
+        self._bdd_variable_order = None  # type: Optional[BddVariableOrder]
+
+        # Indexes on the reactions and contingencies, lazily (re)built whenever either list is reassigned. Like the
+        # indexes on the states below, they are read through accessors building them upon first use, such as
+        # _reaction_numbers.
+        self._reaction_to_number = None  # type: Optional[Dict[Reaction, int]]
+        self._reaction_to_contingencies = None  # type: Optional[Dict[Reaction, Dict[str, List[Contingency]]]]
+
         self.reactions = reactions
         self.contingencies = contingencies
 
+        # The contingencies as given, i.e. before expansion and structuring, and the expanded and structured
+        # contingencies, per reaction. self.contingencies is assembled from the latter. Together with the reaction
+        # terms as they were before the expansion of the fully neutral states, these allow incremental updates.
+        self._source_contingencies = OrderedDict()  # type: Dict[Reaction, List[Contingency]]
+        for contingency in contingencies:
+            self._source_contingencies.setdefault(contingency.reaction, []).append(contingency)
+        self._structured_contingencies = {}  # type: Dict[Reaction, List[Contingency]]
+        self._unexpanded_terms = OrderedDict()  # type: Dict[Reaction, List[Tuple[ReactionTerm, List[State]]]]
+        # Indexes for incremental updates: from (non-structured) components to the reactions whose source
+        # contingencies contain a non-elemental state on them, see _index_non_elemental_contingencies, and from
+        # the (non-structured) states in the structured contingencies to their reactions.
+        self._component_to_non_elemental_reactions = defaultdict(set)  # type: Dict[Spec, MutableSet[Reaction]]
+        for reaction, reaction_contingencies in self._source_contingencies.items():
+            self._index_non_elemental_contingencies(reaction, reaction_contingencies, add=True)
+        self._state_to_contingency_reactions = defaultdict(set)  # type: Dict[State, MutableSet[Reaction]]
+        # Per role ('produced', 'consumed', 'synthesised'), the number of (distinct) reactions carrying a state
+        # after the expansion of the fully neutral states, per state the number of reactions carrying it before
+        # the expansion ('unexpanded') and the number of source contingencies requiring a global state ('global').
+        self._state_counts = {}  # type: Dict[str, Counter]
+
         self._components = []  # type: List[Spec]
         self._states = []  # type: List[State]
         self._produced_states = []  # type: List[State]
@@ -32,32 +77,172 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
         self._synthesised_states = []  # type: List[State]
         self._global_states = []  # type: List[State]
 
-        # Components get synthesised in a 'fully neutral' state. What this state is depends on all reactions
-        # in the system, so this 'fully neutral' state has to be expanded into the combination of all neutral
-        # states pertaining to the component.
-        self._expand_fully_neutral_states()
-        # These states are lazily generated.
-        self._calculate_produced_states()
-        self._calculate_consumed_states()
-        self._calculate_synthesised_states()
-        self._calculate_global_states()
-        self._calculate_states()
-
-        # Contingencies containing states at a non-elemental resolution are expanded to an OR of elemental
-        # contingencies.
-        self._expand_non_elemental_states()
-        self._structure_contingencies()
+        # Indexes on the states, lazily (re)built from self.states, see _calculate_state_indexes.
+        self._has_state_indexes = False
+        self._component_to_states = {}  # type: Dict[Spec, List[State]]
+        self._component_to_groups = {}  # type: Dict[Spec, Dict[Spec, List[State]]]
+        self._complements = {}  # type: Dict[Tuple[Spec, State], List[State]]
+        self._structured_complements = {}  # type: Dict[Tuple[Spec, State], List[State]]
+        # Indexes from (non-structured) states to the reactions acting on them, see _calculate_reaction_indexes.
+        self._state_to_reactions = None  # type: Optional[Dict[str, Dict[State, List[Reaction]]]]
+        # Index from (partial) loci to the states carrying a Spec at or below them, and the memoized subset
+        # states of non-elemental states, see subset_states.
+        self._locus_to_states = None  # type: Optional[Dict[LocusKey, List[State]]]
+        self._subset_states = {}  # type: Dict[State, List[State]]
+        # Mutual exclusions between the states, see state_exclusions.
+        self._state_exclusions = None  # type: Optional[StateExclusions]
+
+        with span('rxncon system construction'):
+            self._calculate_reaction_states()
+
+            # Contingencies containing states at a non-elemental resolution are expanded to an OR of elemental
+            # contingencies, after which they are structured.
+            self._structure_contingencies()
 
         self.validate()
 
+    @property
+    def reactions(self) -> List[Reaction]:
+        return self._reactions
+
+    @reactions.setter
+    def reactions(self, reactions: List[Reaction]) -> None:
+        self._reactions = reactions
+        self._reaction_to_number = None
+
+    @property
+    def contingencies(self) -> List[Contingency]:
+        return self._contingencies
+
+    @contingencies.setter
+    def contingencies(self, contingencies: List[Contingency]) -> None:
+        self._contingencies = contingencies
+        self._reaction_to_contingencies = None
+
     def reaction_number(self, reaction: Reaction) -> int:
-        return self.reactions.index(reaction)
+        try:
+            return self._reaction_numbers()[reaction]
+        except KeyError:
+            raise ValueError('{} is not in reactions'.format(reaction))
+
+    def validate(self, workers: Optional[int]=None) -> None:
+        with span('validation'):
+            self._validate(None, workers)
+
+    def update(self, add_reactions: Optional[List[Reaction]]=None, remove_reactions: Optional[List[Reaction]]=None,
+               add_contingencies: Optional[List[Contingency]]=None,
+               remove_contingencies: Optional[List[Contingency]]=None, workers: Optional[int]=None) -> List[Reaction]:
+        """Incrementally updates the system, instead of constructing a new one. Removing a Reaction also removes
+        its Contingencies, Contingencies are added and removed in the form in which they were given, i.e. before
+        expansion and structuring. Only the States of the added and removed Reactions are (un)counted, and only
+        the fully neutral States of the synthesis Reactions on components whose States changed are expanded anew,
+        see _update_reaction_states. Likewise only the Contingencies of the affected Reactions are expanded,
+        structured and validated anew.
+
+        Returns the Reactions, in the order of self.reactions, that were added or whose States or Contingencies
+        changed. If the updated system does not validate, the update is rolled back and an AssertionError is
+        raised."""
+        add_reactions, remove_reactions = add_reactions or [], remove_reactions or []
+        add_contingencies, remove_contingencies = add_contingencies or [], remove_contingencies or []
+
+        for reaction in remove_reactions:
+            self.reaction_number(reaction)
+        reaction_to_number = self._reaction_numbers()
+        for reaction in add_reactions:
+            if reaction in reaction_to_number and reaction not in remove_reactions:
+                raise ValueError('{} is already in reactions'.format(reaction))
+        for contingency in remove_contingencies:
+            if contingency not in self._source_contingencies.get(contingency.reaction, []):
+                raise ValueError('{} is not in contingencies'.format(contingency))
+
+        removed = set(remove_reactions)
+        reactions = [reaction for reaction in self.reactions if reaction not in removed] + add_reactions
+        missing_reactions = [contingency.reaction for contingency in add_contingencies
+                             if contingency.reaction in removed or
+                             (contingency.reaction not in reaction_to_number and
+                              contingency.reaction not in add_reactions)]
+        if missing_reactions:
+            raise AssertionError('Reactions(s) {0} appear(s) in contingencies, but are not defined in reaction list'
+                                 .format(', '.join(str(reaction) for reaction in missing_reactions)))
+
+        # The Reactions whose source Contingencies change, mapped to their new source Contingencies.
+        source_contingencies = OrderedDict(
+            (reaction, [contingency for contingency in self._source_contingencies.get(reaction, [])
+                        if contingency not in remove_contingencies])
+            for reaction in [contingency.reaction for contingency in remove_contingencies + add_contingencies]
+        )  # type: Dict[Reaction, List[Contingency]]
+        for contingency in add_contingencies:
+            source_contingencies[contingency.reaction].append(contingency)
+        for reaction in remove_reactions:
+            source_contingencies[reaction] = []
+
+        changed = set(add_reactions) | {reaction for reaction in source_contingencies if reaction not in removed}
+
+        previous = self.reactions, dict(self._structured_contingencies), self.contingencies
+        previous_source_contingencies = {reaction: self._source_contingencies.get(reaction)
+                                         for reaction in source_contingencies}
+
+        self.reactions = reactions
+        for reaction, reaction_contingencies in source_contingencies.items():
+            self._set_source_contingencies(reaction, reaction_contingencies)
+        for reaction in OrderedDict.fromkeys(remove_reactions):
+            self._index_contingency_states(reaction, self._structured_contingencies.pop(reaction, []), add=False)
+
+        try:
+            changed_states, reexpanded = self._update_reaction_states(
+                list(OrderedDict.fromkeys(remove_reactions)), add_reactions,
+                [contingency for contingencies in previous_source_contingencies.values() for contingency in
+                 contingencies or []],
+                [contingency for contingencies in source_contingencies.values() for contingency in contingencies])
+            changed |= set(reexpanded)
+
+            affected_components = {component for state in changed_states for component in state.components}
+            restructure = changed | {reaction for component in affected_components
+                                     for reaction in self._component_to_non_elemental_reactions.get(component, ())}
+            self._structure_contingencies(sorted(restructure, key=self.reaction_number))
+
+            # Contingencies requiring a vanished State have to be validated again, to report the missing State.
+            invalidated = restructure | {reaction for state in changed_states
+                                         for reaction in self._state_to_contingency_reactions.get(state, ())}
+            invalidated_reactions = sorted(invalidated, key=self.reaction_number)
+
+            with span('validation'):
+                self._validate(invalidated_reactions, workers)
+        except Exception:
+            self.reactions, self._structured_contingencies, self.contingencies = previous
+            for reaction, previous_contingencies in previous_source_contingencies.items():
+                self._set_source_contingencies(reaction, previous_contingencies or [])
+            self._calculate_contingency_state_index()
+            self._calculate_reaction_states()
+            raise
+
+        return invalidated_reactions
+
+    def add_reaction(self, reaction: Reaction) -> List[Reaction]:
+        """Adds a Reaction, see update."""
+        return self.update(add_reactions=[reaction])
+
+    def remove_reaction(self, reaction: Reaction) -> List[Reaction]:
+        """Removes a Reaction and its Contingencies, see update."""
+        return self.update(remove_reactions=[reaction])
+
+    def add_contingency(self, contingency: Contingency) -> List[Reaction]:
+        """Adds a (non-expanded, non-structured) Contingency, see update."""
+        return self.update(add_contingencies=[contingency])
+
+    def remove_contingency(self, contingency: Contingency) -> List[Reaction]:
+        """Removes a Contingency in the form in which it was given, see update."""
+        return self.update(remove_contingencies=[contingency])
+
+    def _validate(self, reactions: Optional[List[Reaction]], workers: Optional[int]) -> None:
+        """Validates the Contingencies of the Reactions given (default: all)."""
+        if workers is None:
+            workers = self.validation_workers
 
-    def validate(self) -> None:
         if not self.reactions:
             raise AssertionError('No reactions, boring!')
 
-        missing_states = self._missing_states()
+        missing_states = self._missing_states(reactions)
         if missing_states:
             raise AssertionError('State(s) {0} appear(s) in contingencies, but is not produced or consumed'
                                  .format(', '.join(str(state) for state in missing_states)))
@@ -67,7 +252,7 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
             raise AssertionError('Reactions(s) {0} appear(s) in contingencies, but are not defined in reaction list'
                                  .format(', '.join(str(reaction) for reaction in missing_reactions)))
 
-        unsatisfiable_contingencies = self._unsatisfiable_contingencies()
+        unsatisfiable_contingencies = self._unsatisfiable_contingencies(workers, reactions)
         if unsatisfiable_contingencies:
             reason_str = '\n'.join('{} : {}'.format(rxn, reason) for rxn, reason in unsatisfiable_contingencies)
             raise AssertionError('Unsatisfiable reaction contingencies:\n{}'.format(reason_str))
@@ -78,18 +263,60 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
         return self._components
 
     def contingencies_for_reaction(self, reaction: Reaction) -> List[Contingency]:
-        assert reaction in self.reactions
-        return [x for x in self.contingencies if x.reaction == reaction]
+        """Returns all Contingencies for the given Reaction. The returned list should not be modified."""
+        return self._contingencies_for_reaction(reaction, 'all')
 
     def q_contingencies_for_reaction(self, reaction: Reaction) -> List[Contingency]:
-        assert reaction in self.reactions
-        return [x for x in self.contingencies if x.reaction == reaction and x.contingency_type
-                in [ContingencyType.positive, ContingencyType.negative]]
+        """Returns the quantitative (k+, k-) Contingencies for the given Reaction. The returned list should
+        not be modified."""
+        return self._contingencies_for_reaction(reaction, 'quantitative')
 
     def s_contingencies_for_reaction(self, reaction: Reaction) -> List[Contingency]:
-        assert reaction in self.reactions
-        return [x for x in self.contingencies if x.reaction == reaction and x.contingency_type
-                in [ContingencyType.requirement, ContingencyType.inhibition]]
+        """Returns the strict (!, x) Contingencies for the given Reaction. The returned list should not be
+        modified."""
+        return self._contingencies_for_reaction(reaction, 'strict')
+
+    def _contingencies_for_reaction(self, reaction: Reaction, kind: str) -> List[Contingency]:
+        assert reaction in self._reaction_numbers()
+
+        try:
+            return self._contingency_index()[reaction][kind]
+        except KeyError:
+            return []
+
+    def _reaction_numbers(self) -> Dict[Reaction, int]:
+        if self._reaction_to_number is None:
+            self._reaction_to_number = self._calculate_reaction_numbers()
+        return self._reaction_to_number
+
+    def _contingency_index(self) -> Dict[Reaction, Dict[str, List[Contingency]]]:
+        if self._reaction_to_contingencies is None:
+            self._reaction_to_contingencies = self._calculate_contingency_index()
+        return self._reaction_to_contingencies
+
+    def _calculate_reaction_numbers(self) -> Dict[Reaction, int]:
+        reaction_to_number = {}  # type: Dict[Reaction, int]
+        for number, reaction in enumerate(self.reactions):
+            # Mimic list.index: the first occurrence wins.
+            reaction_to_number.setdefault(reaction, number)
+
+        return reaction_to_number
+
+    def _calculate_contingency_index(self) -> Dict[Reaction, Dict[str, List[Contingency]]]:
+        """Builds the index Reaction -> {'all', 'quantitative', 'strict'} -> Contingencies, preserving the
+        order in self.contingencies."""
+        index = defaultdict(
+            lambda: {'all': [], 'quantitative': [], 'strict': []})  # type: Dict[Reaction, Dict[str, List[Contingency]]]
+
+        for contingency in self.contingencies:
+            entry = index[contingency.reaction]
+            entry['all'].append(contingency)
+            if contingency.contingency_type in (ContingencyType.positive, ContingencyType.negative):
+                entry['quantitative'].append(contingency)
+            elif contingency.contingency_type in (ContingencyType.requirement, ContingencyType.inhibition):
+                entry['strict'].append(contingency)
+
+        return dict(index)
 
     @property
     def states(self) -> List[State]:
@@ -121,27 +348,33 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
             self._calculate_global_states()
         return self._global_states
 
+    @property
+    def state_exclusions(self) -> StateExclusions:
+        """The mutual exclusions between States. The elemental States of the system carry the dense ids
+        0, 1, ... in the order of self.states, other (e.g. structured) States, as well as States added by
+        incremental updates, get their ids appended upon first use."""
+        if self._state_exclusions is None:
+            self._state_exclusions = StateExclusions(state for state in self.states if state != FullyNeutralState())
+        return self._state_exclusions
+
+    @property
+    def bdd_variable_order(self) -> BddVariableOrder:
+        """The variable order shared by the BDDs of the venntastic Sets of the system, see the BDD backend of
+        venntastic. The States get their variables upon first use, the order is kept across updates."""
+        if self._bdd_variable_order is None:
+            self._bdd_variable_order = BddVariableOrder()
+        return self._bdd_variable_order
+
     def states_for_component(self, component: Spec) -> List[State]:
-        """Returns all the States that live on a certain Component."""
+        """Returns all the States that live on a certain Component. The returned list should not be modified."""
         assert component.is_component_spec
-        return [x for x in self.states if component.to_non_struct_spec() in x.components]
+        return self._states_by_component().get(component.to_non_struct_spec(), [])
 
     def states_for_component_grouped(self, component: Spec) -> Dict[Spec, List[State]]:
         """Returns all the States that live on a certain component, grouped by their Spec.
-        Within a group, each State is mutually exclusive with each other State."""
-        states = self.states_for_component(component)  # type: List[State]
-        grouped = defaultdict(list)  # type: Dict[Spec, List[State]]
-
-        while states:
-            state = states.pop()
-
-            for spec in state.specs:
-                if spec.to_component_spec() != component:
-                    continue
-
-                grouped[spec].append(state)
-
-        return grouped
+        Within a group, each State is mutually exclusive with each other State. The returned
+        dictionary should not be modified."""
+        return self._groups_by_component().get(component, {})
 
     def complement_states(self, state: State) -> List[State]:
         """Returns all States mutually exclusive with the State given. For multi-component States,
@@ -153,18 +386,159 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
         return states
 
     def complement_states_for_component(self, component: Spec, state: State) -> List[State]:
-        """Returns all States mutually exclusive with the State given that live on the Component given."""
+        """Returns all States mutually exclusive with the State given that live on the Component given.
+        The returned list should not be modified."""
         if not state.is_structured:
-            for group in self.states_for_component_grouped(component).values():
-                if state in group:
-                    return [x for x in group if x != state]
-            raise AssertionError
+            try:
+                return self._complements_by_component()[(component, state)]
+            except KeyError:
+                raise AssertionError
         else:
             # The structure information is first thrown away to determine the mutually exclusive
             # states, and then applied again (as far as possible).
-            complements = self.complement_states_for_component(component.to_non_struct_spec(),
-                                                               state.to_non_structured())
-            return [x.to_structured_from_state(state) for x in complements]
+            try:
+                return self._structured_complements[(component, state)]
+            except KeyError:
+                complements = self.complement_states_for_component(component.to_non_struct_spec(),
+                                                                   state.to_non_structured())
+                structured = [x.to_structured_from_state(state) for x in complements]
+                self._structured_complements[(component, state)] = structured
+                return structured
+
+    def subset_states(self, state: State) -> List[State]:
+        """Returns the States of the system that are a subset of the (typically non-elemental) State given, in
+        the order of self.states. The returned list should not be modified."""
+        state = state.to_non_structured()
+        try:
+            return self._subset_states[state]
+        except KeyError:
+            pass
+
+        if state.specs:
+            # Every subset State carries a Spec below each of the State's Specs: take the smallest candidate list.
+            locus_to_states = self._states_by_locus()
+            candidates = min((locus_to_states.get(_locus_key(spec), []) for spec in state.specs), key=len)
+        else:
+            candidates = self.states
+
+        subsets = [x for x in candidates if x.is_subset_of(state)]
+        self._subset_states[state] = subsets
+        return subsets
+
+    def producing_reactions(self, state: State) -> List[Reaction]:
+        """Returns the Reactions producing the (non-structured version of the) State given."""
+        return self._reactions_for_state('produced', state)
+
+    def consuming_reactions(self, state: State) -> List[Reaction]:
+        """Returns the Reactions consuming the (non-structured version of the) State given."""
+        return self._reactions_for_state('consumed', state)
+
+    def synthesising_reactions(self, state: State) -> List[Reaction]:
+        """Returns the Reactions synthesising the (non-structured version of the) State given."""
+        return self._reactions_for_state('synthesised', state)
+
+    def degrading_reactions(self, state: State) -> List[Reaction]:
+        """Returns the Reactions degrading the (non-structured version of the) State given."""
+        return self._reactions_for_state('degraded', state)
+
+    def _reactions_for_state(self, role: str, state: State) -> List[Reaction]:
+        return self._reactions_by_state()[role].get(state.to_non_structured(), [])
+
+    def _states_by_component(self) -> Dict[Spec, List[State]]:
+        if not self._has_state_indexes:
+            self._calculate_state_indexes()
+        return self._component_to_states
+
+    def _groups_by_component(self) -> Dict[Spec, Dict[Spec, List[State]]]:
+        if not self._has_state_indexes:
+            self._calculate_state_indexes()
+        return self._component_to_groups
+
+    def _complements_by_component(self) -> Dict[Tuple[Spec, State], List[State]]:
+        if not self._has_state_indexes:
+            self._calculate_state_indexes()
+        return self._complements
+
+    def _states_by_locus(self) -> Dict[LocusKey, List[State]]:
+        if self._locus_to_states is None:
+            self._locus_to_states = self._calculate_locus_index()
+        return self._locus_to_states
+
+    def _reactions_by_state(self) -> Dict[str, Dict[State, List[Reaction]]]:
+        if self._state_to_reactions is None:
+            self._state_to_reactions = self._calculate_reaction_indexes()
+        return self._state_to_reactions
+
+    def _calculate_state_indexes(self) -> None:
+        """Builds the component -> states, component -> mutually exclusive groups and (component, state) ->
+        complements indexes from self.states."""
+        component_to_states = defaultdict(list)  # type: Dict[Spec, List[State]]
+        for state in self.states:
+            # Homodimers carry the same component twice.
+            for component in OrderedDict.fromkeys(state.components):
+                component_to_states[component].append(state)
+
+        self._has_state_indexes = True
+        self._component_to_states = {}
+        self._component_to_groups = {}
+        self._complements = {}
+        self._structured_complements = {}
+        for component, states in component_to_states.items():
+            self._index_component_states(component, states)
+
+    def _index_component_states(self, component: Spec, states: List[State]) -> None:
+        """(Re)indexes the States living on the component, see _calculate_state_indexes."""
+        for state in self._component_to_states.get(component, []):
+            self._complements.pop((component, state), None)
+
+        grouped = defaultdict(list)  # type: Dict[Spec, List[State]]
+        for state in reversed(states):
+            for spec in state.specs:
+                if spec.to_component_spec() != component:
+                    continue
+
+                grouped[spec].append(state)
+
+        for group in grouped.values():
+            for state in group:
+                self._complements.setdefault((component, state), [x for x in group if x != state])
+
+        if states:
+            self._component_to_states[component] = states
+            self._component_to_groups[component] = dict(grouped)
+        else:
+            self._component_to_states.pop(component, None)
+            self._component_to_groups.pop(component, None)
+
+    def _calculate_locus_index(self) -> Dict[LocusKey, List[State]]:
+        """Builds the index from (component name, domain, subdomain, residue) keys, in which any of the locus
+        fields can be left out, to the States carrying a Spec at or below that key."""
+        locus_to_states = defaultdict(list)  # type: Dict[LocusKey, List[State]]
+        for state in self.states:
+            # Homodimers carry Specs that share keys.
+            for key in OrderedDict.fromkeys(key for spec in state.specs for key in _locus_superkeys(spec)):
+                locus_to_states[key].append(state)
+
+        return dict(locus_to_states)
+
+    def _calculate_reaction_indexes(self) -> Dict[str, Dict[State, List[Reaction]]]:
+        """Builds the indexes from non-structured States to the Reactions producing, consuming, synthesising
+        and degrading them."""
+        state_to_reactions = {
+            'produced': defaultdict(list),
+            'consumed': defaultdict(list),
+            'synthesised': defaultdict(list),
+            'degraded': defaultdict(list),
+        }  # type: Dict[str, Dict[State, List[Reaction]]]
+
+        for reaction in self.reactions:
+            for role, states in (('produced', reaction.produced_states), ('consumed', reaction.consumed_states),
+                                 ('synthesised', reaction.synthesised_states),
+                                 ('degraded', reaction.degraded_states)):
+                for state in OrderedDict.fromkeys(x.to_non_structured() for x in states):
+                    state_to_reactions[role][state].append(reaction)
+
+        return {role: dict(index) for role, index in state_to_reactions.items()}
 
     def _calculate_components(self) -> None:
         """Determines all components in the system, and stores it in self._components."""
@@ -178,6 +552,18 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
     def _calculate_states(self) -> None:
         self._states = list(
             set(self.produced_states + self.consumed_states + self.synthesised_states + self.global_states))
+        self._invalidate_indexes()
+
+    def _invalidate_indexes(self) -> None:
+        self._has_state_indexes = False
+        self._component_to_states = {}
+        self._component_to_groups = {}
+        self._complements = {}
+        self._structured_complements = {}
+        self._state_to_reactions = None
+        self._locus_to_states = None
+        self._subset_states = {}
+        self._state_exclusions = None
 
     def _calculate_produced_states(self) -> None:
         states = []  # type: List[State]
@@ -202,81 +588,325 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
 
     def _calculate_global_states(self) -> None:
         states = []  # type: List[State]
-        for contingency in self.contingencies:
-            states += [state for state in contingency.effector.states if state.is_global]
+        for contingencies in self._source_contingencies.values():
+            for contingency in contingencies:
+                states += [state for state in contingency.effector.states if state.is_global]
 
         self._global_states = list(set(states))
 
-    def _expand_fully_neutral_states(self) -> None:
-        for reaction in self.reactions:
-            self._expand_reaction_terms(reaction.terms_lhs)
-            self._expand_reaction_terms(reaction.terms_rhs)
-            reaction.invalidate_state_cache()
+    def _calculate_reaction_states(self) -> None:
+        """(Re)determines the States of the system from all its Reactions, starting from the Reaction terms as
+        they were before the expansion of the fully neutral States. Also counts the States per Reaction, see
+        _update_reaction_states for the incremental counterpart."""
+        for reaction in list(self._unexpanded_terms):
+            self._restore_reaction_terms(reaction)
+
+        self._components = []
+        self._states = []
+        self._produced_states = []
+        self._consumed_states = []
+        self._synthesised_states = []
+        self._global_states = []
+        self._invalidate_indexes()
+
+        reactions = list(OrderedDict.fromkeys(self.reactions))
+        self._state_counts = {role: Counter() for role in ('produced', 'consumed', 'synthesised', 'unexpanded',
+                                                           'global')}
+        for reaction in reactions:
+            self._count_unexpanded_states(reaction, 1)
+        self._count_global_states([contingency for contingencies in self._source_contingencies.values()
+                                   for contingency in contingencies], 1)
 
-    def _expand_reaction_terms(self, terms: List[ReactionTerm]) -> None:
+        # Components get synthesised in a 'fully neutral' state. What this state is depends on all reactions
+        # in the system, so this 'fully neutral' state has to be expanded into the combination of all neutral
+        # states pertaining to the component.
+        for reaction in reactions:
+            self._expand_fully_neutral_states(reaction)
+        for reaction in reactions:
+            self._count_states(reaction, 1)
+
+        # These states are lazily generated.
+        self._calculate_produced_states()
+        self._calculate_consumed_states()
+        self._calculate_synthesised_states()
+        self._calculate_global_states()
+        self._calculate_states()
+
+    def _update_reaction_states(self, removed_reactions: List[Reaction], added_reactions: List[Reaction],
+                                removed_contingencies: List[Contingency], added_contingencies: List[Contingency]) \
+            -> Tuple[AbstractSet[State], List[Reaction]]:
+        """Updates the States of the system for the removed and added (distinct) Reactions and source
+        Contingencies, counting the States of these only. Since the States the fully neutral States expand into
+        are States of the system living on the synthesised components, only the synthesis Reactions of
+        components whose States appeared or vanished are expanded anew. The indexes on the States are updated
+        for these components only.
+
+        Returns the States that appeared or vanished, and the Reactions whose expansion changed."""
+        previous_states = set(self._states)
+
+        for reaction in removed_reactions:
+            self._count_states(reaction, -1)
+            self._restore_reaction_terms(reaction)
+            self._count_unexpanded_states(reaction, -1)
+        for reaction in added_reactions:
+            self._count_unexpanded_states(reaction, 1)
+        self._count_global_states(removed_contingencies, -1)
+        self._count_global_states(added_contingencies, 1)
+
+        states = self._counted_states()
+        appeared = [state for state in states if state not in previous_states]
+        vanished = previous_states - set(states)
+        affected_components = {component for state in appeared + list(vanished) for component in state.components}
+        self._update_state_indexes(appeared, vanished, affected_components)
+
+        reexpanded = []  # type: List[Reaction]
+        for reaction in [reaction for reaction, terms in self._unexpanded_terms.items()
+                         if any(spec.to_non_struct_spec() in affected_components
+                                for term, _ in terms for spec in term.specs)]:
+            previous_reaction_states = self._reaction_states(reaction)
+            self._count_states(reaction, -1)
+            self._restore_reaction_terms(reaction)
+            self._expand_fully_neutral_states(reaction)
+            self._count_states(reaction, 1)
+            if self._reaction_states(reaction) != previous_reaction_states:
+                reexpanded.append(reaction)
+
+        for reaction in added_reactions:
+            self._expand_fully_neutral_states(reaction)
+            self._count_states(reaction, 1)
+
+        self._produced_states = list(self._state_counts['produced'])
+        self._consumed_states = list(self._state_counts['consumed'])
+        self._synthesised_states = list(self._state_counts['synthesised'])
+        self._global_states = list(self._state_counts['global'])
+
+        return set(appeared) | vanished, reexpanded
+
+    def _counted_states(self) -> List[State]:
+        """The States of the system according to self._state_counts: those of the Reactions and the global
+        States. The States of the Reactions after the expansion of the fully neutral States are those before it,
+        but for the fully neutral State itself."""
+        fully_neutral_state = FullyNeutralState()
+        return [state for state in OrderedDict.fromkeys(list(self._state_counts['unexpanded']) +
+                                                         list(self._state_counts['global']))
+                if state != fully_neutral_state]
+
+    def _update_state_indexes(self, appeared: List[State], vanished: AbstractSet[State],
+                              affected_components: AbstractSet[Spec]) -> None:
+        """Updates self.states and the (already built) indexes on it for the States that appeared or vanished,
+        which live on the affected components. New States are appended to self.states, so that the indexes stay
+        in its order. The mutual exclusions are kept: they do not depend on the other States, new States get
+        their ids upon first use. The index from States to the Reactions acting on them is rebuilt when needed."""
+        self._states = [state for state in self._states if state not in vanished] + appeared
+        self._components = []
+        self._state_to_reactions = None
+
+        if not appeared and not vanished:
+            return
+
+        if self._has_state_indexes:
+            for component in affected_components:
+                self._index_component_states(
+                    component, [state for state in self._component_to_states.get(component, [])
+                                if state not in vanished] +
+                    [state for state in appeared if component in state.components])
+            self._structured_complements = {key: complements for key, complements in
+                                            self._structured_complements.items()
+                                            if key[0].to_non_struct_spec() not in affected_components}
+
+        if self._locus_to_states is not None:
+            for state in vanished:
+                for key in OrderedDict.fromkeys(key for spec in state.specs for key in _locus_superkeys(spec)):
+                    self._locus_to_states[key].remove(state)
+            for state in appeared:
+                for key in OrderedDict.fromkeys(key for spec in state.specs for key in _locus_superkeys(spec)):
+                    self._locus_to_states.setdefault(key, []).append(state)
+
+        # The subset States of a State are those below its Specs, or all States if it has none.
+        self._subset_states = {state: subsets for state, subsets in self._subset_states.items()
+                               if state.specs and not affected_components & set(state.components)}
+
+    def _reaction_states(self, reaction: Reaction) -> Dict[str, AbstractSet[State]]:
+        """The (non-structured) States the Reaction produces, consumes and synthesises."""
+        return {
+            'produced': {state.to_non_structured() for state in reaction.produced_states},
+            'consumed': {state.to_non_structured() for state in reaction.consumed_states},
+            'synthesised': {state.to_non_structured() for state in reaction.synthesised_states},
+        }
+
+    def _count_states(self, reaction: Reaction, count: int) -> None:
+        for role, states in self._reaction_states(reaction).items():
+            _add_counts(self._state_counts[role], states, count)
+
+    def _count_unexpanded_states(self, reaction: Reaction, count: int) -> None:
+        _add_counts(self._state_counts['unexpanded'],
+                    {state for states in self._reaction_states(reaction).values() for state in states}, count)
+
+    def _count_global_states(self, contingencies: List[Contingency], count: int) -> None:
+        for contingency in contingencies:
+            _add_counts(self._state_counts['global'],
+                        {state for state in contingency.effector.states if state.is_global}, count)
+
+    def _expand_fully_neutral_states(self, reaction: Reaction) -> None:
+        self._expand_reaction_terms(reaction, reaction.terms_lhs)
+        self._expand_reaction_terms(reaction, reaction.terms_rhs)
+        reaction.invalidate_state_cache()
+
+    def _restore_reaction_terms(self, reaction: Reaction) -> None:
+        """Restores the terms of the Reaction to what they were before the expansion of the fully neutral
+        States."""
+        for term, states in self._unexpanded_terms.pop(reaction, []):
+            term.states = states
+        reaction.invalidate_state_cache()
+
+    def _expand_reaction_terms(self, reaction: Reaction, terms: List[ReactionTerm]) -> None:
         """Expands the reaction rules that contain a FullyNeutralState, which appear in synthesis reactions.
         This state is expanded in a combination of all neutral states for the component."""
         for term in terms:
             if FullyNeutralState() in term.states:
+                self._unexpanded_terms.setdefault(reaction, []).append((term, term.states))
                 existing_states = [state for state in term.states if state != FullyNeutralState()]
+                exclusions = self.state_exclusions
+                existing_ids = sum(1 << exclusions.state_id(state) for state in set(existing_states))
                 new_states = [state for component in term.specs for state in self.states_for_component(component)
                               if state.is_neutral and state != FullyNeutralState() and state not in existing_states and
-                              not any(state.is_mutually_exclusive_with(existing) for existing in existing_states)]
+                              not exclusions.exclusion_mask(state) & existing_ids]
 
                 term.states = existing_states + new_states
 
-    def _expand_non_elemental_states(self) -> None:
-        """Expands the non-elemental States appearing in contingencies, these get expanded into a Union of
-        the elemental States of which the non-elemental State is a superset."""
-        def expanded_effector(effector: Effector) -> Effector:
-            if isinstance(effector, StateEffector):
-                if effector.expr.is_elemental:
-                    return effector
-                else:
-                    elemental_states = [state.to_structured_from_state(effector.expr)
-                                        for state in self.states if state.is_subset_of(effector.expr)]
-                    assert elemental_states, 'Could not find elemental states which are subset of the non-elemental ' \
-                                             'state {}'.format(effector.expr)
-                    assert all(state.is_elemental for state in elemental_states)
-
-                    LOGGER.info('expanded_effector: {} -> {}'
-                                .format(str(effector.expr), ' | '.join(str(x) for x in elemental_states)))
-                    return OrEffector(*(StateEffector(x) for x in elemental_states), name=str(effector.expr))
-            elif isinstance(effector, AndEffector):
-                return AndEffector(*(expanded_effector(x) for x in effector.exprs), name=effector.name,
-                                   equivs=effector.equivs)
-            elif isinstance(effector, OrEffector):
-                return OrEffector(*(expanded_effector(x) for x in effector.exprs), name=effector.name,
-                                  equivs=effector.equivs)
-            elif isinstance(effector, NotEffector):
-                return NotEffector(expanded_effector(effector.expr), name=effector.name)
+    def _expanded_effector(self, effector: Effector, memo: Optional[Dict[int, Tuple[Effector, Effector]]]=None) \
+            -> Effector:
+        """Expands the non-elemental States appearing in the Effector, these get expanded into a Union of
+        the elemental States of which the non-elemental State is a superset. Subtrees without non-elemental States
+        are shared with the Effector. The expansions of the nodes are stored in memo (keyed by their id, holding
+        on to the node), so that nodes shared between Effectors are expanded once, into shared nodes."""
+        if memo is None:
+            memo = {}
+        try:
+            return memo[id(effector)][1]
+        except KeyError:
+            pass
+
+        expanded = self._expanded_effector_node(effector, memo)
+        memo[id(effector)] = (effector, expanded)
+        return expanded
+
+    def _expanded_effector_node(self, effector: Effector, memo: Dict[int, Tuple[Effector, Effector]]) -> Effector:
+        if isinstance(effector, StateEffector):
+            if effector.expr.is_elemental:
+                return effector
             else:
-                raise AssertionError
-
-        for contingency in self.contingencies:
-            contingency.effector = expanded_effector(contingency.effector)
-
-    def _structure_contingencies(self) -> None:
-        """Structures (i.e. augment with topological data) all contingencies."""
-        structured_conts = []
-
-        for rxn in self.reactions:
-            counter_start = 2
-            for con in self.contingencies_for_reaction(rxn):
-                structured_conts.append(con.to_structured(counter_start))
-                counter_start += 100
+                elemental_states = [state.to_structured_from_state(effector.expr)
+                                    for state in self.subset_states(effector.expr)]
+                assert elemental_states, 'Could not find elemental states which are subset of the non-elemental ' \
+                                         'state {}'.format(effector.expr)
+                assert all(state.is_elemental for state in elemental_states)
+
+                LOGGER.info('expanded_effector: {} -> {}'
+                            .format(str(effector.expr), ' | '.join(str(x) for x in elemental_states)))
+                return OrEffector(*(StateEffector(x) for x in elemental_states), name=str(effector.expr))
+        elif isinstance(effector, (AndEffector, OrEffector)):
+            exprs = tuple(self._expanded_effector(x, memo) for x in effector.exprs)
+            if all(x is y for x, y in zip(exprs, effector.exprs)):
+                return effector
+            return type(effector)(*exprs, name=effector.name, equivs=effector.equivs)
+        elif isinstance(effector, NotEffector):
+            expr = self._expanded_effector(effector.expr, memo)
+            if expr is effector.expr:
+                return effector
+            return NotEffector(expr, name=effector.name)
+        else:
+            raise AssertionError
 
-        self.contingencies = structured_conts
+    def _structure_contingencies(self, reactions: Optional[List[Reaction]]=None) -> None:
+        """Expands the non-elemental States in, and structures (i.e. augment with topological data) the
+        contingencies of the given reactions (default: all), and reassembles self.contingencies.
+
+        Effectors shared between contingencies (e.g. a boolean contingency used by many reactions) are expanded
+        once. Structuring an Effector only depends on the reactants of the reaction, it is done once per
+        reactant signature, see _reactant_signature."""
+        expanded_effectors = {}  # type: Dict[int, Tuple[Effector, Effector]]
+        structured_effectors = {}  # type: Dict[Tuple[int, Tuple, int], Tuple[Effector, Effector]]
+        for rxn in OrderedDict.fromkeys(self.reactions if reactions is None else reactions):
+            with span('contingency structuring', rxn):
+                structured_conts = []
+                counter_start = 2
+                for con in self._source_contingencies.get(rxn, []):
+                    effector = self._expanded_effector(con.effector, expanded_effectors)
+                    key = (id(effector), _reactant_signature(con.reaction), counter_start)
+                    try:
+                        structured_effector = structured_effectors[key][1]
+                    except KeyError:
+                        structured_effector = Contingency(con.reaction, con.contingency_type, effector,
+                                                          validate_equivs_specs=False) \
+                            .to_structured(counter_start).effector
+                        structured_effectors[key] = (effector, structured_effector)
+
+                    structured_conts.append(Contingency(con.reaction, con.contingency_type, structured_effector,
+                                                        validate_equivs_specs=False))
+                    counter_start += 100
+
+                self._index_contingency_states(rxn, self._structured_contingencies.get(rxn, []), add=False)
+                self._index_contingency_states(rxn, structured_conts, add=True)
+                self._structured_contingencies[rxn] = structured_conts
+
+        self.contingencies = [con for rxn in self.reactions for con in self._structured_contingencies[rxn]]
+
+    def _set_source_contingencies(self, reaction: Reaction, contingencies: List[Contingency]) -> None:
+        """Replaces the source Contingencies of the Reaction, keeping the index of the non-elemental States in
+        source Contingencies up to date."""
+        self._index_non_elemental_contingencies(reaction, self._source_contingencies.get(reaction, []), add=False)
+        if contingencies:
+            self._source_contingencies[reaction] = contingencies
+            self._index_non_elemental_contingencies(reaction, contingencies, add=True)
+        else:
+            self._source_contingencies.pop(reaction, None)
+
+    def _index_non_elemental_contingencies(self, reaction: Reaction, contingencies: List[Contingency],
+                                           add: bool) -> None:
+        """Adds the Reaction to (or removes it from) the index entries of the (non-structured) components on
+        which the given source Contingencies contain a non-elemental State. The expansion of these depends on the
+        States in the system."""
+        components = {component.to_non_struct_spec() for contingency in contingencies
+                      for state in contingency.effector.states if not state.is_elemental
+                      for component in state.components}
+        for component in components:
+            if add:
+                self._component_to_non_elemental_reactions[component].add(reaction)
+            else:
+                self._component_to_non_elemental_reactions[component].discard(reaction)
+
+    def _index_contingency_states(self, reaction: Reaction, contingencies: List[Contingency], add: bool) -> None:
+        """Adds the Reaction to (or removes it from) the index entries of the (non-structured versions of the)
+        States in the given structured Contingencies."""
+        for state in {state.to_non_structured() for contingency in contingencies
+                      for state in contingency.effector.states}:
+            if add:
+                self._state_to_contingency_reactions[state].add(reaction)
+            else:
+                self._state_to_contingency_reactions[state].discard(reaction)
+
+    def _calculate_contingency_state_index(self) -> None:
+        self._state_to_contingency_reactions = defaultdict(set)
+        for reaction, contingencies in self._structured_contingencies.items():
+            self._index_contingency_states(reaction, contingencies, add=True)
+
+    def _missing_states(self, reactions: Optional[List[Reaction]]=None) -> List[State]:
+        """Returns the States that appear in contingencies (of the given Reactions, default: all), but which are
+        not produced, consumed, synthesised or degraded by the Reactions."""
+        if reactions is None:
+            contingencies = self.contingencies
+        else:
+            contingencies = [contingency for reaction in OrderedDict.fromkeys(reactions)
+                             for contingency in self._structured_contingencies[reaction]]
 
-    def _missing_states(self) -> List[State]:
-        """Returns the States that appear in contingencies, but which are not produced, consumed, synthesised
-        or degraded by the Reactions."""
         required_states = []  # type: List[State]
-        for contingency in self.contingencies:
+        for contingency in contingencies:
             required_states += [state.to_non_structured() for state in contingency.effector.states if
                                 not state.is_global]
 
-        return [state for state in required_states if state not in self.states]
+        states = set(self.states)
+        return [state for state in required_states if state not in states]
 
     def _missing_reactions(self) -> List[Reaction]:
         """Returns the Reactions that appear in the contingency list, but which are not in the Reaction list."""
@@ -284,61 +914,144 @@ class RxnConSystem:  # pylint: disable=too-many-instance-attributes
         for contingency in self.contingencies:
             required_reactions.append(contingency.reaction)
 
-        return [reaction for reaction in required_reactions if reaction not in self.reactions]
+        reaction_to_number = self._reaction_numbers()
+        return [reaction for reaction in required_reactions if reaction not in reaction_to_number]
+
+    def _unsatisfiable_contingencies(self, workers: int=1,
+                                     reactions: Optional[List[Reaction]]=None) -> List[Tuple[Reaction, str]]:
+        """Determines the contingencies (of the given reactions, default: all) that are not satisfiable, returns
+        a list of (Reaction, str) where the str contains the human-readable reason for the contingency not being
+        satisfiable. The reactions are independent of each other: for workers > 1 they are checked in a pool of
+        processes, the results are returned in reaction order nonetheless. With the BDD validation backend, the
+        worker processes use a variable order per reaction instead of the one of the system."""
+        if reactions is None:
+            reactions = self.reactions
+        contingencies = [self.s_contingencies_for_reaction(reaction) for reaction in reactions]
+        backend = self.validation_backend
+
+        if workers > 1 and len(reactions) > 1:
+            # Imported here since multiprocessing is expensive to import and only needed for parallel validation.
+            from concurrent.futures import ProcessPoolExecutor
+            # Worker processes that are not forked (e.g. with the 'spawn' start method) import rxncon afresh, they
+            # have to be initialized with the StateModifiers and ReactionDefs the States and Reactions rely on.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=self.validation_mp_context,
+                                     initializer=_initialize_worker,
+                                     initargs=(additional_state_modifiers(), additional_reaction_defs())) as executor:
+                chunksize = max(1, len(reactions) // (4 * workers))
+                per_reaction = list(executor.map(_unsatisfiable_contingencies_for_reaction, reactions,
+                                                 contingencies, [backend] * len(reactions), chunksize=chunksize))
+        else:
+            # Only in this case the time spent per reaction is profiled, spans in worker processes are lost.
+            order = self.bdd_variable_order if backend != EXPR_BACKEND else None
+            per_reaction = []
+            for reaction, reaction_contingencies in zip(reactions, contingencies):
+                with span('contingency validation', reaction):
+                    per_reaction.append(_unsatisfiable_contingencies_for_reaction(reaction, reaction_contingencies,
+                                                                                  backend, order))
+
+        return [unsatisfiable for reaction_unsatisfiables in per_reaction for unsatisfiable in reaction_unsatisfiables]
+
+
+def _initialize_worker(state_modifiers: Dict[str, str], reaction_defs: List[Dict[str, str]]) -> None:
+    """Initializes a validation worker process with the StateModifiers and ReactionDefs of the parent process."""
+    initialize_state_modifiers(state_modifiers)
+    initialize_reaction_defs(reaction_defs)
+
+
+def _unsatisfiable_contingencies_for_reaction(reaction: Reaction, contingencies: List[Contingency],
+                                              backend: str=EXPR_BACKEND, order: Optional[BddVariableOrder]=None) \
+        -> List[Tuple[Reaction, str]]:
+    """Determines the reasons for the strict contingencies of a single reaction not being satisfiable, answering
+    the satisfiability queries with the given venntastic backend (and for BDDs the given variable order, default:
+    a new one). This is a module-level function so that it can be shipped to worker processes."""
+    unsatisfiable = []  # type: List[Tuple[Reaction, str]]
+    if order is None and backend != EXPR_BACKEND:
+        order = BddVariableOrder()
+
+    # Make sure the contingency does not contain the states produced / consumed by the reaction.
+    states = (state for contingency in contingencies
+              for state in contingency.effector.states)
+
+    for state in states:
+        # We need to be talking about the states mentioning the reactants.
+        if not all(spec.struct_index in (0, 1) for spec in state.specs):
+            continue
+
+        if any(count > 1 for count in Counter(reaction.components_rhs).values()):
+            continue
+
+        # States appear non-structured in the '.produced_states' etc. properties.
+        state = state.to_non_structured()
+
+        if state in reaction.produced_states and state not in reaction.synthesised_states:
+            unsatisfiable.append((reaction, 'Produced state {} appears in contingencies'.format(str(state))))
+        if state in reaction.consumed_states and state not in reaction.degraded_states:
+            unsatisfiable.append((reaction, 'Consumed state {} appears in contingencies'.format(str(state))))
+
+    # Make sure at least one solution is there (this might still contain mutually exclusive states)
+    total_set = UniversalSet()  # type: Set[State]
+    for contingency in contingencies:
+        total_set = Intersection(total_set,
+                                 contingency.to_venn_set())  # pylint: disable=redefined-variable-type
+
+    if not total_set.is_satisfiable(backend, order):
+        unsatisfiable.append((reaction, 'Zero consistent solutions found.'))
+        return unsatisfiable
 
-    def _unsatisfiable_contingencies(self) -> List[Tuple[Reaction, str]]:
-        """Determines the contingencies that are not satisfiable, returns a list of (Reaction, str) where
-        the str contains the human-readable reason for the contingency not being satisfiable."""
-        unsatisfiable = []
+    # Make sure that at least one solution doesn't contain mutually exclusive states. Instead of enumerating
+    # all solutions, the exclusions are added as clauses and the SAT solver is asked for a single solution.
+    exclusive_pairs = _mutually_exclusive_pairs(total_set.values)
+    if not exclusive_pairs:
+        return unsatisfiable
 
-        for reaction in self.reactions:
-            contingencies = self.s_contingencies_for_reaction(reaction)
+    consistent_set = Intersection(total_set, *(Complement(Intersection(ValueSet(state), ValueSet(other)))
+                                               for state, other in exclusive_pairs))
+    if consistent_set.is_satisfiable(backend, order):
+        return unsatisfiable
 
-            # Make sure the contingency does not contain the states produced / consumed by the reaction.
-            states = (state for contingency in contingencies
-                      for state in contingency.effector.states)
+    # Report a pair that is true in every solution if there is one, otherwise one occurring in some solution.
+    for state, other in exclusive_pairs:
+        if not Intersection(total_set, Complement(Intersection(ValueSet(state), ValueSet(other)))) \
+                .is_satisfiable(backend, order):
+            break
+    else:
+        solution = total_set.calc_solution(backend, order)
+        assert solution is not None
+        state, other = next((state, other) for state, other in exclusive_pairs
+                            if solution.get(state) and solution.get(other))
 
-            for state in states:
-                # We need to be talking about the states mentioning the reactants.
-                if not all(spec.struct_index in (0, 1) for spec in state.specs):
-                    continue
+    unsatisfiable.append((reaction, 'State {} mutually exclusive with {}.'.format(str(state), str(other))))
 
-                if any(count > 1 for count in Counter(reaction.components_rhs).values()):
-                    continue
+    return unsatisfiable
 
-                # States appear non-structured in the '.produced_states' etc. properties.
-                state = state.to_non_structured()
 
-                if state in reaction.produced_states and state not in reaction.synthesised_states:
-                    unsatisfiable.append((reaction, 'Produced state {} appears in contingencies'.format(str(state))))
-                if state in reaction.consumed_states and state not in reaction.degraded_states:
-                    unsatisfiable.append((reaction, 'Consumed state {} appears in contingencies'.format(str(state))))
+def _add_counts(counter: Counter, states: Iterable[State], count: int) -> None:
+    """Adds count to the counts of the States, dropping the States whose count reaches zero."""
+    for state in states:
+        counter[state] += count
+        if not counter[state]:
+            del counter[state]
 
-            # Make sure at least one solution is there (this might still contain mutually exclusive states)
-            total_set = UniversalSet()  # type: Set[State]
-            for contingency in contingencies:
-                total_set = Intersection(total_set,
-                                         contingency.to_venn_set())  # pylint: disable=redefined-variable-type
-
-            solutions = total_set.calc_solutions()
-            if len(solutions) == 0:
-                unsatisfiable.append((reaction, 'Zero consistent solutions found.'))
-
-            # Make sure that at least one solution doesn't contain mutually exclusive states.
-            local_unsatisfiables = []
-            at_least_one_consistent_soln = False
-
-            for solution in solutions:
-                trues = [state for state, val in solution.items() if val]
-                if any(state.is_mutually_exclusive_with(other) for state, other in product(trues, trues)):
-                    state, other = next((state, other) for state, other in product(trues, trues) if
-                                        state.is_mutually_exclusive_with(other))
-                    local_unsatisfiables.append(
-                        (reaction, 'State {} mutually exclusive with {}.'.format(str(state), str(other))))
-                else:
-                    at_least_one_consistent_soln = True
-
-            if not at_least_one_consistent_soln:
-                unsatisfiable += local_unsatisfiables
 
-        return unsatisfiable
+def _reactant_signature(reaction: Reaction) -> Tuple:
+    """The data of the Reaction on which the structuring of its contingencies depends, see
+    Contingency.to_structured and Contingency.validate_equivs_specs."""
+    return isinstance(reaction, OutputReaction), tuple(reaction.components_lhs_structured), tuple(reaction.components)
+
+
+def _mutually_exclusive_pairs(states: List[State]) -> List[Tuple[State, State]]:
+    """Returns the pairs of (unique) States that cannot hold simultaneously. The relation is checked in both
+    directions since it is not symmetric for all State types."""
+    return StateExclusions(states).exclusive_pairs(states)
+
+
+def _locus_key(spec: Spec) -> LocusKey:
+    return spec.name, spec.locus.domain or None, spec.locus.subdomain or None, spec.locus.residue or None
+
+
+def _locus_superkeys(spec: Spec) -> List[LocusKey]:
+    """Returns the keys of all Specs of which the given Spec is a subspec (cf. Spec.is_subspec_of), i.e. its
+    own key with any of the locus fields left out."""
+    name, domain, subdomain, residue = _locus_key(spec)
+    return list(OrderedDict.fromkeys((name, d, s, r) for d in (domain, None) for s in (subdomain, None)
+                                     for r in (residue, None)))
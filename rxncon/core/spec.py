@@ -2,14 +2,21 @@
 LocusResolution and SpecSuffix, as well as the constructor functions spec_from_str and locus_from_str.
 A Spec describes a molecule-like object (be it a Protein, a Gene or an mRNA) at a certain resolution.
 It consists of a component name and a Locus, the latter describing domain / residue information, and
-optionally a 'struct_index', which can be used to fix the topology of complexes."""
+optionally a 'struct_index', which can be used to fix the topology of complexes.
+
+The string parsers first try a single-pass scanner that understands the canonical grammar, e.g. 'A@0_[d/s(r)]',
+and fall back to the regular expressions below for anything else, so that the accepted strings, the objects
+returned and the errors raised are the same either way. Parsed strings are memoized."""
 
 from collections import OrderedDict
 from abc import ABC
-from copy import deepcopy
-from typing import Optional, MutableMapping, Type, Tuple  # pylint: disable=unused-import
+from typing import Optional, MutableMapping, Type, Tuple, Dict, Callable, FrozenSet, List, \
+    TYPE_CHECKING  # pylint: disable=unused-import
 from enum import Enum, unique
 import re
+import string
+
+from rxncon.util.utils import LRUCache
 
 DOMAIN_SUBDOMAIN_RESIDUE_REGEX = r'^[\w:-]+\/[\w:-]+\([\w:-]+\)$'
 DOMAIN_RESIDUE_REGEX = r'^[\w:-]+\([\w:-]+\)$'
@@ -17,45 +24,104 @@ DOMAIN_SUBDOMAIN_REGEX = r'^[\w:-]+\/[\w:-]+$'
 RESIDUE_REGEX = r'^\([\w:-]+\)$'
 DOMAIN_REGEX = r'^[\w:-]+$'
 
+# The ASCII subsets of the character classes in the regexes, as accepted by the scanner.
+NAME_START_CHARS = frozenset(string.ascii_letters)
+NAME_CHARS = frozenset(string.ascii_letters + string.digits)
+DIGIT_CHARS = frozenset(string.digits)
+LOCUS_CHARS = frozenset(string.ascii_letters + string.digits + '_:-')
+
 
 class Spec(ABC):
-    """Spec is the abstract superclass for ProteinSpec, GeneSpec and MRNASpec."""
+    """Spec is the abstract superclass for ProteinSpec, GeneSpec and MRNASpec. Specs are immutable and interned:
+    constructing a Spec with the same (type, name, struct_index, locus) returns the existing object, which carries
+    a precomputed string form and hash."""
+    __slots__ = ('name', 'struct_index', 'locus', '_str', '_hash', '_derived')
+
+    def __new__(cls, name: str, struct_index: Optional[int], locus: 'Locus') -> 'Spec':
+        key = (cls, name, struct_index, locus)
+        try:
+            return _SPEC_CACHE[key]
+        except KeyError:
+            pass
+
+        spec = super().__new__(cls)
+        object.__setattr__(spec, 'name', name)
+        object.__setattr__(spec, 'struct_index', struct_index)
+        object.__setattr__(spec, 'locus', locus)
+        spec._validate()
+        object.__setattr__(spec, '_str', spec._calc_str())
+        object.__setattr__(spec, '_hash', hash(spec._str))
+        object.__setattr__(spec, '_derived', {})
+
+        _SPEC_CACHE[key] = spec
+        return spec
 
     def __init__(self, name: str, struct_index: Optional[int], locus: 'Locus') -> None:
-        self.name, self.struct_index, self.locus = name, struct_index, locus
-        self._validate()
+        # All initialization happens in __new__, since Specs are interned. The assignments below never run,
+        # they declare the attributes for the type checker.
+        if TYPE_CHECKING:
+            self.name = name
+            self.struct_index = struct_index
+            self.locus = locus
+            self._str = ''
+            self._hash = 0
+            self._derived = {}  # type: Dict[Tuple, Spec]
+
+    def __setattr__(self, key: str, value: object) -> None:
+        raise AttributeError('Spec {} is immutable, cannot set attribute {}'.format(self, key))
+
+    def __reduce__(self) -> Tuple:
+        return type(self), (self.name, self.struct_index, self.locus)
+
+    def __copy__(self) -> 'Spec':
+        return self
+
+    def __deepcopy__(self, memodict: Dict) -> 'Spec':
+        return self
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __repr__(self) -> str:
-        return str(self)
+        return self._str
 
     def __str__(self) -> str:
-        def struct_name(spec: Spec, spec_suffix: 'SpecSuffix') -> str:
-            if spec.struct_index is not None:
-                return "{0}{1}@{2}".format(spec.name, spec_suffix.value, spec.struct_index)
-            else:
-                return "{0}{1}".format(spec.name, spec_suffix.value)
-
-        suffix = SPEC_TO_SUFFIX[type(self)]
-
-        if str(self.locus):
-            return '{0}_[{1}]'.format(struct_name(self, suffix), str(self.locus))
-        else:
-            return '{0}'.format(struct_name(self, suffix))
+        return self._str
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Spec):
             return NotImplemented
         return isinstance(other, type(self)) and self.name == other.name and self.locus == other.locus and \
                self.struct_index == other.struct_index
 
     def __lt__(self, other: 'Spec') -> bool:
-        return str(self) < str(other)
+        return self._str < other._str
+
+    def _calc_str(self) -> str:
+        suffix = SPEC_TO_SUFFIX[type(self)]
+
+        if self.struct_index is not None:
+            struct_name = "{0}{1}@{2}".format(self.name, suffix.value, self.struct_index)
+        else:
+            struct_name = "{0}{1}".format(self.name, suffix.value)
+
+        if str(self.locus):
+            return '{0}_[{1}]'.format(struct_name, str(self.locus))
+        else:
+            return '{0}'.format(struct_name)
+
+    def _memoized(self, key: Tuple, derive: Callable[[], 'Spec']) -> 'Spec':
+        try:
+            return self._derived[key]
+        except KeyError:
+            derived = derive()
+            self._derived[key] = derived
+            return derived
 
     def clone(self) -> 'Spec':
-        return deepcopy(self)
+        return self
 
     def is_subspec_of(self, other: 'Spec') -> bool:
         """Specs have a subset / superset relation, e.g. A_[(r)] is a subset of A."""
@@ -97,42 +163,46 @@ class Spec(ABC):
         except ValueError:
             return type(self)(self.name + suffix, self.struct_index, self.locus)
 
-    def with_struct_index(self, index: int) -> 'Spec':
-        """Returns a new Spec of the same type with a given struct index."""
-        return type(self)(self.name, index, self.locus)
+    def with_struct_index(self, index: Optional[int]) -> 'Spec':
+        """Returns a Spec of the same type with a given struct index."""
+        return self._memoized(('struct_index', index), lambda: type(self)(self.name, index, self.locus))
 
     def with_struct_from_spec(self, other: 'Spec') -> 'Spec':
-        """Returns a new Spec of the same type with a struct index matching the one carried by the Spec given."""
+        """Returns a Spec of the same type with a struct index matching the one carried by the Spec given."""
         assert other.struct_index is not None
         assert self.name == other.name
-        return type(self)(self.name, other.struct_index, self.locus)
+        return self.with_struct_index(other.struct_index)
 
     def with_locus(self, locus: 'Locus') -> 'Spec':
-        """Returns a new Spec of the same type with a given Locus."""
-        return type(self)(self.name, self.struct_index, locus.clone())
+        """Returns a Spec of the same type with a given Locus."""
+        return type(self)(self.name, self.struct_index, locus)
 
     def with_domain(self, domain: str) -> 'Spec':
-        """Returns a new Spec of the same type with its domain changed into the one given."""
+        """Returns a Spec of the same type with its domain changed into the one given."""
         return type(self)(self.name, self.struct_index, self.locus.with_domain(domain))
 
+    def with_residue(self, residue: str) -> 'Spec':
+        """Returns a Spec of the same type with its residue changed into the one given."""
+        return type(self)(self.name, self.struct_index, self.locus.with_residue(residue))
+
     def to_non_struct_spec(self) -> 'Spec':
-        """Returns a new Spec of the same type without struct index."""
-        return type(self)(self.name, None, self.locus)
+        """Returns a Spec of the same type without struct index."""
+        return self.with_struct_index(None)
 
     def to_component_spec(self) -> 'Spec':
-        """Returns a new Spec of the same type without Locus."""
-        return type(self)(self.name, self.struct_index, EmptyLocus())
+        """Returns a Spec of the same type without Locus."""
+        return self._memoized(('component',), lambda: type(self)(self.name, self.struct_index, EmptyLocus()))
 
     def to_protein_component_spec(self) -> 'ProteinSpec':
-        """Returns a new ProteinSpec with the same name, without structure index or Locus."""
+        """Returns a ProteinSpec with the same name, without structure index or Locus."""
         return ProteinSpec(self.name, None, EmptyLocus())
 
     def to_gene_component_spec(self) -> 'GeneSpec':
-        """Returns a new GeneSpec with the same name, without structure index or Locus."""
+        """Returns a GeneSpec with the same name, without structure index or Locus."""
         return GeneSpec(self.name, None, EmptyLocus())
 
     def to_mrna_component_spec(self) -> 'MRNASpec':
-        """Returns a new MRNASpec with the same name, without structure index or Locus."""
+        """Returns a MRNASpec with the same name, without structure index or Locus."""
         return MRNASpec(self.name, None, EmptyLocus())
 
     @property
@@ -147,34 +217,74 @@ class Spec(ABC):
 
 
 class ProteinSpec(Spec):
-    def __hash__(self) -> int:
-        return hash(str(self))
+    __slots__ = ()
 
 
 class MRNASpec(Spec):
-    def __hash__(self) -> int:
-        return hash(str(self))
+    __slots__ = ()
 
 
 class GeneSpec(Spec):
-    def __hash__(self) -> int:
-        return hash(str(self))
+    __slots__ = ()
 
 
 class Locus:
-    """Locus contains domain, subdomain and residue information for a Spec."""
+    """Locus contains domain, subdomain and residue information for a Spec. Like Specs, Loci are immutable
+    and interned."""
+    __slots__ = ('domain', 'subdomain', 'residue', '_str', '_hash', '_resolution')
+
+    def __new__(cls, domain: Optional[str], subdomain: Optional[str], residue: Optional[str]) -> 'Locus':
+        key = (domain, subdomain, residue)
+        try:
+            return _LOCUS_CACHE[key]
+        except KeyError:
+            pass
+
+        locus = super().__new__(cls)
+        object.__setattr__(locus, 'domain', domain)
+        object.__setattr__(locus, 'subdomain', subdomain)
+        object.__setattr__(locus, 'residue', residue)
+        locus.validate()
+        object.__setattr__(locus, '_str', locus._calc_str())
+        object.__setattr__(locus, '_hash', hash(locus._str))
+        object.__setattr__(locus, '_resolution', locus._calc_resolution())
+
+        _LOCUS_CACHE[key] = locus
+        return locus
 
     def __init__(self, domain: Optional[str], subdomain: Optional[str], residue: Optional[str]) -> None:
-        self.domain, self.subdomain, self.residue = domain, subdomain, residue
-        self.validate()
+        # All initialization happens in __new__, since Loci are interned. The assignments below never run,
+        # they declare the attributes for the type checker.
+        if TYPE_CHECKING:
+            self.domain = domain
+            self.subdomain = subdomain
+            self.residue = residue
+            self._str = ''
+            self._hash = 0
+            self._resolution = LocusResolution.component
+
+    def __setattr__(self, key: str, value: object) -> None:
+        raise AttributeError('Locus {} is immutable, cannot set attribute {}'.format(self, key))
+
+    def __reduce__(self) -> Tuple:
+        return type(self), (self.domain, self.subdomain, self.residue)
+
+    def __copy__(self) -> 'Locus':
+        return self
+
+    def __deepcopy__(self, memodict: Dict) -> 'Locus':
+        return self
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __repr__(self) -> str:
-        return str(self)
+        return self._str
 
     def __str__(self) -> str:
+        return self._str
+
+    def _calc_str(self) -> str:
         if self.domain and self.subdomain and self.residue:
             return '{0}/{1}({2})'.format(self.domain, self.subdomain, self.residue)
         elif self.domain and not self.subdomain and self.residue:
@@ -191,6 +301,8 @@ class Locus:
             raise AssertionError('Unable to stringify Spec')
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Locus):
             return NotImplemented
         return self.domain == other.domain and self.subdomain == other.subdomain and self.residue == other.residue
@@ -198,7 +310,7 @@ class Locus:
     def __lt__(self, other):
         if not isinstance(other, Locus):
             return NotImplemented
-        return str(self) < str(other)
+        return self._str < other._str
 
     def validate(self) -> None:
         if self.domain:
@@ -210,13 +322,13 @@ class Locus:
             assert re.match(r'\w+', self.residue)
 
     def clone(self) -> 'Locus':
-        return deepcopy(self)
+        return self
 
     def with_domain(self, domain: str) -> 'Locus':
-        locus = self.clone()
-        locus.domain = domain
-        locus.validate()
-        return locus
+        return Locus(domain, self.subdomain, self.residue)
+
+    def with_residue(self, residue: str) -> 'Locus':
+        return Locus(self.domain, self.subdomain, residue)
 
     @property
     def is_empty(self) -> bool:
@@ -224,6 +336,9 @@ class Locus:
 
     @property
     def resolution(self) -> 'LocusResolution':
+        return self._resolution
+
+    def _calc_resolution(self) -> 'LocusResolution':
         if not self.domain and not self.subdomain and not self.residue:
             return LocusResolution.component
         elif self.domain and not self.subdomain and not self.residue:
@@ -236,6 +351,13 @@ class Locus:
             raise AssertionError('Inconsistent resolution for Spec {}'.format(str(self)))
 
 
+# Interning tables for Specs and Loci, keyed by their constructor arguments. These are deliberately unbounded:
+# evicting an entry would let an equal Spec or Locus be constructed a second time, breaking the uniqueness the
+# shared string forms and derived Specs rely on. Their size is that of the set of distinct Specs and Loci in use.
+_SPEC_CACHE = {}  # type: Dict[Tuple[Type[Spec], str, Optional[int], Locus], Spec]
+_LOCUS_CACHE = {}  # type: Dict[Tuple[Optional[str], Optional[str], Optional[str]], Locus]
+
+
 def EmptyLocus() -> Locus:  # pylint: disable=invalid-name
     return Locus(None, None, None)
 
@@ -275,11 +397,119 @@ SUFFIX_TO_SPEC = OrderedDict(
     ]
 )  # type: MutableMapping[SpecSuffix, Type[Spec]]
 
+# The suffixes in the order of SUFFIX_TO_SPEC as plain and lower case strings, used by scan_spec.
+SUFFIX_STRS_TO_SPEC = [(suffix.value, suffix.value.lower(), spec_class)
+                       for suffix, spec_class in SUFFIX_TO_SPEC.items()]  # type: List[Tuple[str, str, Type[Spec]]]
+
 SPEC_TO_SUFFIX = OrderedDict((k, v) for v, k in SUFFIX_TO_SPEC.items())  # type: MutableMapping[Type[Spec], SpecSuffix]
 
 
+# Memoization tables for the string parsers, keyed by the string given. Unlike the interning tables these are
+# bounded, since every spelling of a Spec that a long-running process parses would otherwise stay in them.
+STR_CACHE_SIZE = 2 ** 17
+_LOCUS_STR_CACHE = LRUCache(STR_CACHE_SIZE)  # type: MutableMapping[str, Locus]
+_SPEC_STR_CACHE = LRUCache(STR_CACHE_SIZE)  # type: MutableMapping[str, Spec]
+
+
 def locus_from_str(locus_str: str) -> Locus:
     """Returns a Locus object parsed from the given string, raises SyntaxError if not parsable."""
+    try:
+        return _LOCUS_STR_CACHE[locus_str]
+    except KeyError:
+        pass
+
+    locus = scan_locus(locus_str.strip('[]'), LOCUS_CHARS)
+    if locus is None:
+        locus = _locus_from_str_by_regex(locus_str)
+
+    _LOCUS_STR_CACHE[locus_str] = locus
+    return locus
+
+
+def spec_from_str(spec_str: str) -> Spec:
+    """Returns a Spec object parsed from the given string, raises SyntaxError if not parsable."""
+    try:
+        return _SPEC_STR_CACHE[spec_str]
+    except KeyError:
+        pass
+
+    spec = scan_spec(spec_str, LOCUS_CHARS, False)
+    if spec is None:
+        spec = _spec_from_str_by_regex(spec_str)
+
+    _SPEC_STR_CACHE[spec_str] = spec
+    return spec
+
+
+def scan_locus(locus_str: str, locus_chars: FrozenSet[str]) -> Optional[Locus]:
+    """Scans an unbracketed locus string of the form 'd', 'd/s', 'd/s(r)', 'd(r)' or '(r)', where the
+    domain, subdomain and residue consist of locus_chars. Returns None if the string is not of this form."""
+    def is_token(token: str) -> bool:
+        return bool(token) and locus_chars.issuperset(token)
+
+    domain, subdomain, residue = None, None, None  # type: Optional[str], Optional[str], Optional[str]
+
+    body, paren, residue_str = locus_str.partition('(')
+    if paren:
+        if not residue_str.endswith(')') or not is_token(residue_str[:-1]):
+            return None
+        residue = residue_str[:-1]
+
+    domain_str, slash, subdomain_str = body.partition('/')
+    if slash:
+        if not is_token(domain_str) or not is_token(subdomain_str):
+            return None
+        domain, subdomain = domain_str, subdomain_str
+    elif domain_str:
+        if not is_token(domain_str):
+            return None
+        domain = domain_str
+    elif not paren:
+        return None
+
+    return Locus(domain, subdomain, residue)
+
+
+def scan_spec(spec_str: str, locus_chars: FrozenSet[str], bracketed_locus: bool) -> Optional[Spec]:
+    """Scans a spec string of the form 'Name', 'Name@0', 'Name_[locus]' or 'Name@0_[locus]', where the name
+    carries an optional 'mRNA' or 'Gene' suffix. If bracketed_locus is False the brackets around the locus are
+    optional, as they are in spec_from_str. Returns None if the string is not of this form."""
+    head, underscore, locus_str = spec_str.partition('_')
+    name, at, index_str = head.partition('@')
+
+    if not name or name[0] not in NAME_START_CHARS or not NAME_CHARS.issuperset(name):
+        return None
+
+    struct_index = None  # type: Optional[int]
+    if at:
+        if not index_str or not DIGIT_CHARS.issuperset(index_str):
+            return None
+        struct_index = int(index_str)
+
+    if underscore:
+        if bracketed_locus:
+            if len(locus_str) < 2 or locus_str[0] != '[' or locus_str[-1] != ']':
+                return None
+            locus = scan_locus(locus_str[1:-1], locus_chars)
+        else:
+            locus = scan_locus(locus_str.strip('[]'), locus_chars)
+        if locus is None:
+            return None
+    else:
+        locus = EmptyLocus()
+
+    lower_name = name.lower()
+    for suffix, lower_suffix, spec_class in SUFFIX_STRS_TO_SPEC:
+        if name.endswith(suffix):
+            name = name[:len(name) - len(suffix)]
+            return spec_class(name, struct_index, locus) if name else None
+        elif lower_name.endswith(lower_suffix):
+            return None
+
+    return None
+
+
+def _locus_from_str_by_regex(locus_str: str) -> Locus:
     def locus_items_from_str(full_locus_str: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         domain, subdomain, residue = None, None, None  # type: Optional[str], Optional[str], Optional[str]
 
@@ -311,8 +541,7 @@ def locus_from_str(locus_str: str) -> Locus:
     return Locus(*locus_items_from_str(locus_str.strip('[]')))
 
 
-def spec_from_str(spec_str: str) -> Spec:
-    """Returns a Spec object parsed from the given string, raises SyntaxError if not parsable."""
+def _spec_from_str_by_regex(spec_str: str) -> Spec:
     def spec_from_suffixed_name_and_locus(name: str, struct_index: Optional[int],
                                           locus: Locus) -> Spec:  # pylint: disable=invalid-name
         for suffix in SUFFIX_TO_SPEC:
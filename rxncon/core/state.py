@@ -1,16 +1,21 @@
 """Module containing the abstract class State, classes InteractionState, EmptyBindingState, SelfInteractionState,
-ModificationState, GlobalState, FullyNeutralState. Also contains constructor functions state_from_str,
+ModificationState, GlobalState, FullyNeutralState, and the class StateExclusions holding the mutual exclusions
+between States. Also contains constructor functions state_from_str,
 state_modifier_from_str. The function initialize_state_modifiers allows runtime addition of state modifiers, and
-is initially run when importing the module."""
+is initially run when importing the module. Like the Spec parsers, state_from_str tries a single-pass scanner before
+the regular expressions, and memoizes the States it parsed."""
 
 import re
+import string
 from enum import Enum
-from typing import List, Dict
+from typing import Dict, Tuple, Callable, Any, Iterable, List, Optional, MutableMapping, TYPE_CHECKING
+from collections import OrderedDict
 from abc import ABCMeta, abstractmethod
 import logging
-from copy import deepcopy
 
-from rxncon.core.spec import Spec, LocusResolution, locus_from_str, spec_from_str
+from rxncon.core.spec import Spec, LocusResolution, locus_from_str, spec_from_str, scan_locus, scan_spec, \
+    STR_CACHE_SIZE
+from rxncon.util.utils import LRUCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,7 +30,17 @@ SELF_INTERACTION_STATE_REGEX = r'^{}--\[{}\]$'.format(SPEC_REGEX, LOCUS_REGEX)
 GLOBAL_STATE_REGEX = r'^\[{}\]$'.format(STR_REGEX)
 MODIFICATION_STATE_REGEX = r'^' + SPEC_REGEX + r'-{' + STR_REGEX + r'}$'
 
+# The ASCII subsets of the character classes in STR_REGEX and LOCUS_REGEX, as accepted by the scanner.
+STR_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+STATE_LOCUS_CHARS = STR_CHARS
+
+# Memoization table for state_from_str, keyed by the string given, bounded like those of the Spec parsers.
+# Emptied when the StateModifiers change.
+_STATE_STR_CACHE = LRUCache(STR_CACHE_SIZE)  # type: MutableMapping[str, State]
+
 StateModifier = None
+# The additional modifiers StateModifier was last initialized with, see additional_state_modifiers.
+_ADDITIONAL_STATE_MODIFIERS = {}  # type: Dict[str, str]
 
 DEFAULT_STATE_MODIFIERS = {
     'neutral': '0',
@@ -44,18 +59,26 @@ def initialize_state_modifiers(additional_modifiers: Dict[str, str]=None) -> Non
     if not additional_modifiers:
         additional_modifiers = {}
 
-    global StateModifier
+    global StateModifier, _ADDITIONAL_STATE_MODIFIERS
+    _ADDITIONAL_STATE_MODIFIERS = dict(additional_modifiers)
     modifiers = {
         **{k.lower(): v.lower() for k, v in DEFAULT_STATE_MODIFIERS.items()},
         **{k.lower(): v.lower() for k, v in additional_modifiers.items()}
     }
 
     StateModifier = Enum('StateModifier', modifiers)  # type: ignore
+    _STATE_STR_CACHE.clear()
 
 
 initialize_state_modifiers()
 
 
+def additional_state_modifiers() -> Dict[str, str]:
+    """Returns the additional modifiers the StateModifiers were last initialized with, in the form taken by
+    initialize_state_modifiers, e.g. to initialize another process alike."""
+    return dict(_ADDITIONAL_STATE_MODIFIERS)
+
+
 def state_modifier_from_str(modifier_str: str) -> StateModifier:
     try:
         return StateModifier(modifier_str.lower())
@@ -66,7 +89,31 @@ def state_modifier_from_str(modifier_str: str) -> StateModifier:
 
 
 class State(metaclass=ABCMeta):
-    """Abstract Base Class for all States."""
+    """Abstract Base Class for all States. States are immutable value objects: their name and hash are computed
+    once upon construction, and the States derived from them (non-structured, structured, neutral) are memoized."""
+    __slots__ = ('_name', '_hash', '_memo')
+
+    def __setattr__(self, key: str, value: object) -> None:
+        raise AttributeError('State {} is immutable, cannot set attribute {}'.format(self, key))
+
+    def __copy__(self) -> 'State':
+        return self
+
+    def __deepcopy__(self, memodict: Dict) -> 'State':
+        return self
+
+    def __reduce__(self) -> Tuple:
+        return type(self), self._args()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __str__(self) -> str:
+        return self._name
+
+    def __repr__(self) -> str:
+        return self._name
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, State):
             return NotImplemented
@@ -76,11 +123,37 @@ class State(metaclass=ABCMeta):
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, State):
             return NotImplemented
-        else:
-            raise NotImplementedError
+
+        return str(self) < str(other)
+
+    def _set(self, **fields: Any) -> None:
+        """Sets the attributes of a State under construction. Since these are not visible to the type checker,
+        the subclasses also assign them under TYPE_CHECKING, which never runs."""
+        for key, value in fields.items():
+            object.__setattr__(self, key, value)
+
+    def _freeze(self, name: str) -> None:
+        self._set(_name=name, _hash=hash(name), _memo={})
+        if TYPE_CHECKING:
+            self._name = name
+            self._hash = hash(name)
+            self._memo = {}  # type: Dict[Tuple, Any]
+
+    def _memoized(self, key: Tuple, derive: Callable[[], Any]) -> Any:
+        try:
+            return self._memo[key]
+        except KeyError:
+            derived = derive()
+            self._memo[key] = derived
+            return derived
+
+    @abstractmethod
+    def _args(self) -> Tuple:
+        """The constructor arguments, used for pickling."""
+        pass
 
     def clone(self) -> 'State':
-        return deepcopy(self)
+        return self
 
     @property
     @abstractmethod
@@ -119,16 +192,17 @@ class State(metaclass=ABCMeta):
 
     @property
     @abstractmethod
-    def neutral_states(self) -> List['State']:
-        return []
+    def neutral_states(self) -> Tuple['State', ...]:
+        return ()
 
     @property
     @abstractmethod
-    def specs(self) -> List[Spec]:
-        return []
+    def specs(self) -> Tuple[Spec, ...]:
+        return ()
 
     @abstractmethod
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
+        """Returns a State in which the Specs appearing as keys in `updates` are replaced by their values."""
         pass
 
     @abstractmethod
@@ -140,7 +214,7 @@ class State(metaclass=ABCMeta):
         pass
 
     def to_structured_from_state(self, state: 'State') -> 'State':
-        structured = self.clone()
+        structured = self
         for spec in state.specs:
             structured = structured.to_structured_from_spec(spec)
 
@@ -148,41 +222,41 @@ class State(metaclass=ABCMeta):
 
     @property
     @abstractmethod
-    def components(self) -> List[Spec]:
+    def components(self) -> Tuple[Spec, ...]:
         pass
 
 
 class InteractionState(State):
     """A State A_[x]--B_[y]."""
+    __slots__ = ('first', 'second', '_specs')
+
     def __init__(self, first: Spec, second: Spec) -> None:
-        self.first, self.second = sorted([first, second])  # type: Spec, Spec
+        first, second = sorted([first, second])
+        self._set(first=first, second=second, _specs=(first, second))
+        if TYPE_CHECKING:
+            self.first, self.second = first, second
+            self._specs = (first, second)  # type: Tuple[Spec, ...]
         self._validate()
+        self._freeze('{}--{}'.format(str(self.first), str(self.second)))
+
+    def _args(self) -> Tuple:
+        return self.first, self.second
 
     @property
     def name(self) -> str:
-        return '{}--{}'.format(str(self.first), str(self.second))
-
-    def __str__(self) -> str:
-        return self.name
-
-    def __repr__(self) -> str:
-        return self.name
+        return self._name
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, State):
             return NotImplemented
         else:
             return isinstance(other, InteractionState) and self.first == other.first and self.second == other.second
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, State):
-            return NotImplemented
-
-        return str(self) < str(other)
-
     def _validate(self) -> None:
         if self.first.resolution > LocusResolution.domain or self.second.resolution > LocusResolution.domain:
             raise SyntaxError(
@@ -190,11 +264,11 @@ class InteractionState(State):
 
         if self.first.is_structured and self.second.is_structured:
             assert not self.first.struct_index == self.second.struct_index, \
-                'Interaction state {} has identical struct indices!'.format(self)
+                'Interaction state {}--{} has identical struct indices!'.format(self.first, self.second)
 
     @property
-    def specs(self) -> List[Spec]:
-        return [self.first.clone(), self.second.clone()]
+    def specs(self) -> Tuple[Spec, ...]:
+        return self._specs
 
     @property
     def is_global(self) -> bool:
@@ -223,31 +297,26 @@ class InteractionState(State):
         return self.first.to_component_spec().to_non_struct_spec() == self.second.to_component_spec().to_non_struct_spec()
 
     @property
-    def neutral_states(self) -> List['State']:
-        if self.is_homodimer:
-            return [EmptyBindingState(self.first)]
-        else:
-            return [EmptyBindingState(self.first), EmptyBindingState(self.second)]
+    def neutral_states(self) -> Tuple['State', ...]:
+        def neutral_states() -> Tuple['State', ...]:
+            if self.is_homodimer:
+                return EmptyBindingState(self.first),
+            else:
+                return EmptyBindingState(self.first), EmptyBindingState(self.second)
 
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
-        try:
-            self.first = updates[self.first]
-        except KeyError:
-            pass
-        try:
-            self.second = updates[self.second]
-        except KeyError:
-            pass
+        return self._memoized(('neutral_states',), neutral_states)
 
-        self.first, self.second = sorted([self.first, self.second])
-        self._validate()
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
+        return InteractionState(updates.get(self.first, self.first), updates.get(self.second, self.second))
 
     def to_non_structured(self) -> 'State':
-        return InteractionState(self.first.to_non_struct_spec(), self.second.to_non_struct_spec())
+        return self._memoized(('non_structured',), lambda: InteractionState(self.first.to_non_struct_spec(),
+                                                                            self.second.to_non_struct_spec()))
 
     @property
-    def components(self) -> List[Spec]:
-        return [self.first.to_component_spec(), self.second.to_component_spec()]
+    def components(self) -> Tuple[Spec, ...]:
+        return self._memoized(('components',), lambda: (self.first.to_component_spec(),
+                                                        self.second.to_component_spec()))
 
     def is_subset_of(self, other: 'State') -> bool:
         return isinstance(other, InteractionState) and ((self.first.is_subspec_of(other.first) and
@@ -262,12 +331,15 @@ class InteractionState(State):
         if not spec.is_structured:
             return self
 
-        if not self.first.is_structured and self.first.to_component_spec() == spec.to_non_struct_spec().to_component_spec():
-            return InteractionState(self.first.with_struct_from_spec(spec), self.second)
-        elif not self.second.is_structured and self.second.to_component_spec() == spec.to_non_struct_spec().to_component_spec():
-            return InteractionState(self.first, self.second.with_struct_from_spec(spec))
-        else:
-            return self
+        def structured() -> 'State':
+            if not self.first.is_structured and self.first.to_component_spec() == spec.to_non_struct_spec().to_component_spec():
+                return InteractionState(self.first.with_struct_from_spec(spec), self.second)
+            elif not self.second.is_structured and self.second.to_component_spec() == spec.to_non_struct_spec().to_component_spec():
+                return InteractionState(self.first, self.second.with_struct_from_spec(spec))
+            else:
+                return self
+
+        return self._memoized(('structured', spec), structured)
 
     def to_structured_from_state(self, state: 'State') -> 'State':
         if self.is_homodimer and state.is_homodimer and state.is_structured:
@@ -280,39 +352,38 @@ class InteractionState(State):
 
 class EmptyBindingState(State):
     """A State A_[x]--0."""
+    __slots__ = ('spec', '_specs')
+
     def __init__(self, spec: Spec) -> None:
         if spec.resolution > LocusResolution.domain:
             raise SyntaxError('Resolution for EmptyBindingState too high {}'.format(str(spec)))
-        self.spec = spec
+        self._set(spec=spec, _specs=(spec,))
+        if TYPE_CHECKING:
+            self.spec = spec
+            self._specs = (spec,)  # type: Tuple[Spec, ...]
+        self._freeze('{}--0'.format(str(self.spec)))
+
+    def _args(self) -> Tuple:
+        return self.spec,
 
     @property
     def name(self) -> str:
-        return '{}--0'.format(str(self.spec))
-
-    def __str__(self) -> str:
-        return self.name
-
-    def __repr__(self) -> str:
-        return self.name
+        return self._name
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, State):
             return NotImplemented
         else:
             return isinstance(other, EmptyBindingState) and self.spec == other.spec
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, State):
-            return NotImplemented
-
-        return str(self) < str(other)
-
     @property
-    def specs(self) -> List[Spec]:
-        return [self.spec.clone()]
+    def specs(self) -> Tuple[Spec, ...]:
+        return self._specs
 
     @property
     def is_global(self) -> bool:
@@ -339,21 +410,18 @@ class EmptyBindingState(State):
         return False
 
     @property
-    def neutral_states(self) -> List['State']:
-        return [self]
+    def neutral_states(self) -> Tuple['State', ...]:
+        return self,
 
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
-        try:
-            self.spec = updates[self.spec]
-        except KeyError:
-            pass
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
+        return EmptyBindingState(updates.get(self.spec, self.spec))
 
     def to_non_structured(self) -> 'State':
-        return EmptyBindingState(self.spec.to_non_struct_spec())
+        return self._memoized(('non_structured',), lambda: EmptyBindingState(self.spec.to_non_struct_spec()))
 
     @property
-    def components(self) -> List[Spec]:
-        return [self.spec.to_component_spec()]
+    def components(self) -> Tuple[Spec, ...]:
+        return self._memoized(('components',), lambda: (self.spec.to_component_spec(),))
 
     def is_subset_of(self, other: 'State') -> bool:
         return isinstance(other, EmptyBindingState) and self.spec.is_subspec_of(other.spec)
@@ -362,43 +430,46 @@ class EmptyBindingState(State):
         return self == other or other.is_subset_of(self)
 
     def to_structured_from_spec(self, spec: Spec) -> 'State':
-        if spec.is_structured and self.spec.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec():
-            return EmptyBindingState(self.spec.with_struct_from_spec(spec))
-        else:
-            return self
+        def structured() -> 'State':
+            if spec.is_structured and self.spec.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec():
+                return EmptyBindingState(self.spec.with_struct_from_spec(spec))
+            else:
+                return self
+
+        return self._memoized(('structured', spec), structured)
 
 
 class SelfInteractionState(State):
     """A State A_[x]--[y]."""
+    __slots__ = ('first', 'second', '_specs')
+
     def __init__(self, first: Spec, second: Spec) -> None:
-        self.first, self.second = sorted([first, second])  # type: Spec, Spec
+        first, second = sorted([first, second])
+        self._set(first=first, second=second, _specs=(first, second))
+        if TYPE_CHECKING:
+            self.first, self.second = first, second
+            self._specs = (first, second)  # type: Tuple[Spec, ...]
         self._validate()
+        self._freeze('{}--[{}]'.format(str(self.first), str(self.second.locus)))
+
+    def _args(self) -> Tuple:
+        return self.first, self.second
 
     @property
     def name(self) -> str:
-        return '{}--[{}]'.format(str(self.first), str(self.second.locus))
-
-    def __str__(self) -> str:
-        return self.name
-
-    def __repr__(self) -> str:
-        return self.name
+        return self._name
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, State):
             return NotImplemented
         else:
             return isinstance(other, SelfInteractionState) and self.first == other.first and self.second == other.second
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, State):
-            return NotImplemented
-
-        return str(self) < str(other)
-
     def _validate(self) -> None:
         assert self.first.to_component_spec() == self.second.to_component_spec()
         if self.first.resolution > LocusResolution.domain or self.second.resolution > LocusResolution.domain:
@@ -406,8 +477,8 @@ class SelfInteractionState(State):
                 'Resolution for SelfInteractionState too high {} {}'.format(str(self.first), str(self.second)))
 
     @property
-    def specs(self) -> List[Spec]:
-        return [self.first.clone(), self.second.clone()]
+    def specs(self) -> Tuple[Spec, ...]:
+        return self._specs
 
     @property
     def is_global(self) -> bool:
@@ -437,28 +508,20 @@ class SelfInteractionState(State):
         return False
 
     @property
-    def neutral_states(self) -> List['State']:
-        return [EmptyBindingState(self.first), EmptyBindingState(self.second)]
-
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
-        try:
-            self.first = updates[self.first]
-        except KeyError:
-            pass
-        try:
-            self.second = updates[self.second]
-        except KeyError:
-            pass
+    def neutral_states(self) -> Tuple['State', ...]:
+        return self._memoized(('neutral_states',), lambda: (EmptyBindingState(self.first),
+                                                            EmptyBindingState(self.second)))
 
-        self.first, self.second = sorted([self.first, self.second])
-        self._validate()
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
+        return SelfInteractionState(updates.get(self.first, self.first), updates.get(self.second, self.second))
 
     def to_non_structured(self) -> 'State':
-        return SelfInteractionState(self.first.to_non_struct_spec(), self.second.to_non_struct_spec())
+        return self._memoized(('non_structured',), lambda: SelfInteractionState(self.first.to_non_struct_spec(),
+                                                                                self.second.to_non_struct_spec()))
 
     @property
-    def components(self) -> List[Spec]:
-        return [self.first.to_component_spec()]
+    def components(self) -> Tuple[Spec, ...]:
+        return self._memoized(('components',), lambda: (self.first.to_component_spec(),))
 
     def is_subset_of(self, other: 'State') -> bool:
         return isinstance(other, SelfInteractionState) and self.first.is_subspec_of(other.first) and \
@@ -468,46 +531,49 @@ class SelfInteractionState(State):
         return self == other or other.is_subset_of(self)
 
     def to_structured_from_spec(self, spec: Spec) -> 'State':
-        if self.first.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec():
-            assert self.second.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec()
-            return SelfInteractionState(self.first.with_struct_from_spec(spec), self.second.with_struct_from_spec(spec))
-        else:
-            return self
+        def structured() -> 'State':
+            if self.first.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec():
+                assert self.second.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec()
+                return SelfInteractionState(self.first.with_struct_from_spec(spec),
+                                            self.second.with_struct_from_spec(spec))
+            else:
+                return self
+
+        return self._memoized(('structured', spec), structured)
 
 
 class ModificationState(State):
     """A State A_[(r)]-{p}."""
+    __slots__ = ('spec', 'modifier', '_specs')
+
     def __init__(self, spec: Spec, modifier: StateModifier) -> None:
-        self.spec, self.modifier = spec, modifier
+        self._set(spec=spec, modifier=modifier, _specs=(spec,))
+        if TYPE_CHECKING:
+            self.spec, self.modifier = spec, modifier
+            self._specs = (spec,)  # type: Tuple[Spec, ...]
+        self._freeze('{}-{{{}}}'.format(str(self.spec), self.modifier.value))
+
+    def _args(self) -> Tuple:
+        return self.spec, self.modifier
 
     @property
     def name(self) -> str:
-        return '{}-{{{}}}'.format(str(self.spec), self.modifier.value)
-
-    def __str__(self) -> str:
-        return self.name
-
-    def __repr__(self) -> str:
-        return self.name
+        return self._name
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, State):
             return NotImplemented
         else:
             return isinstance(other, ModificationState) and self.spec == other.spec and self.modifier == other.modifier
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, State):
-            return NotImplemented
-
-        return str(self) < str(other)
-
     @property
-    def specs(self) -> List[Spec]:
-        return [self.spec.clone()]
+    def specs(self) -> Tuple[Spec, ...]:
+        return self._specs
 
     @property
     def is_global(self) -> bool:
@@ -534,21 +600,20 @@ class ModificationState(State):
         return False
 
     @property
-    def neutral_states(self) -> List['State']:
-        return [ModificationState(self.spec, StateModifier.neutral)]  # type: ignore
+    def neutral_states(self) -> Tuple['State', ...]:
+        return self._memoized(('neutral_states',),
+                              lambda: (ModificationState(self.spec, StateModifier.neutral),))  # type: ignore
 
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
-        try:
-            self.spec = updates[self.spec]
-        except KeyError:
-            pass
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
+        return ModificationState(updates.get(self.spec, self.spec), self.modifier)
 
     def to_non_structured(self) -> 'State':
-        return ModificationState(self.spec.to_non_struct_spec(), self.modifier)
+        return self._memoized(('non_structured',),
+                              lambda: ModificationState(self.spec.to_non_struct_spec(), self.modifier))
 
     @property
-    def components(self) -> List[Spec]:
-        return [self.spec.to_component_spec()]
+    def components(self) -> Tuple[Spec, ...]:
+        return self._memoized(('components',), lambda: (self.spec.to_component_spec(),))
 
     def is_subset_of(self, other: 'State') -> bool:
         return isinstance(other, ModificationState) and self.spec.is_subspec_of(
@@ -558,41 +623,42 @@ class ModificationState(State):
         return self == other or other.is_subset_of(self)
 
     def to_structured_from_spec(self, spec: Spec) -> 'State':
-        if self.spec.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec() and spec.is_structured:
-            return ModificationState(self.spec.with_struct_from_spec(spec), self.modifier)
-        else:
-            return self
+        def structured() -> 'State':
+            if self.spec.to_non_struct_spec().to_component_spec() == spec.to_non_struct_spec().to_component_spec() and spec.is_structured:
+                return ModificationState(self.spec.with_struct_from_spec(spec), self.modifier)
+            else:
+                return self
+
+        return self._memoized(('structured', spec), structured)
 
 
 class GlobalState(State):
     """A State [Turgor]."""
-    def __init__(self, name: str) -> None:
-        self.name = '[{}]'.format(name.strip('[]'))
+    __slots__ = ('name',)
 
-    def __str__(self) -> str:
-        return self.name
+    def __init__(self, name: str) -> None:
+        self._set(name='[{}]'.format(name.strip('[]')))
+        if TYPE_CHECKING:
+            self.name = name
+        self._freeze(self.name)
 
-    def __repr__(self) -> str:
-        return self.name
+    def _args(self) -> Tuple:
+        return self.name,
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, State):
             return NotImplemented
         else:
             return isinstance(other, GlobalState) and self.name == other.name
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, State):
-            return NotImplemented
-
-        return str(self) < str(other)
-
     @property
-    def specs(self) -> List[Spec]:
-        return []
+    def specs(self) -> Tuple[Spec, ...]:
+        return ()
 
     @property
     def is_global(self) -> bool:
@@ -614,11 +680,11 @@ class GlobalState(State):
         return False
 
     @property
-    def neutral_states(self) -> List['State']:
-        return []
+    def neutral_states(self) -> Tuple['State', ...]:
+        return ()
 
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
-        pass
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
+        return self
 
     def to_non_structured(self) -> 'State':
         return self
@@ -628,8 +694,8 @@ class GlobalState(State):
         return True
 
     @property
-    def components(self) -> List[Spec]:
-        return []
+    def components(self) -> Tuple[Spec, ...]:
+        return ()
 
     def is_subset_of(self, other: 'State') -> bool:
         return self == other
@@ -645,23 +711,25 @@ class FullyNeutralState(State):
     """A State 0. This happens in synthesis reactions, and serves as a placeholder for the actual
     combination of neutral states it is going to be replaced with. This actual set of states is unknown
     until the entire system is known."""
-    def __init__(self) -> None:
-        self.name = 'FullyNeutralState'
+    __slots__ = ('name',)
 
-    def __hash__(self) -> int:
-        return hash(str(self))
-
-    def __str__(self) -> str:
-        return 'fully-neutral-state'
+    def __init__(self) -> None:
+        self._set(name='FullyNeutralState')
+        if TYPE_CHECKING:
+            self.name = ''
+        self._freeze('fully-neutral-state')
 
-    def __repr__(self) -> str:
-        return str(self)
+    def _args(self) -> Tuple:
+        return ()
 
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, State):
             return NotImplemented
         return True
 
+    def __hash__(self) -> int:
+        return self._hash
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, State):
             return NotImplemented
@@ -678,12 +746,12 @@ class FullyNeutralState(State):
         raise NotImplementedError
 
     @property
-    def neutral_states(self) -> List['State']:
+    def neutral_states(self) -> Tuple['State', ...]:
         raise NotImplementedError
 
     @property
-    def components(self) -> List[Spec]:
-        return []
+    def components(self) -> Tuple[Spec, ...]:
+        return ()
 
     @property
     def is_elemental(self) -> bool:
@@ -710,10 +778,10 @@ class FullyNeutralState(State):
         raise NotImplementedError
 
     @property
-    def specs(self) -> List[Spec]:
+    def specs(self) -> Tuple[Spec, ...]:
         raise NotImplementedError
 
-    def update_specs(self, updates: Dict[Spec, Spec]) -> None:
+    def with_updated_specs(self, updates: Dict[Spec, Spec]) -> 'State':
         raise NotImplementedError
 
     @property
@@ -721,7 +789,149 @@ class FullyNeutralState(State):
         raise NotImplementedError
 
 
-def state_from_str(state_str: str) -> State:  # pylint: disable=too-many-return-statements
+class StateExclusions:
+    """StateExclusions assigns dense integer ids to States and keeps their mutual exclusions as a bit matrix:
+    bit j of row i is set iff State i and State j cannot both hold. Checking a set of States for consistency
+    then takes one bitwise AND per State.
+
+    States get their ids in the order they are added. Since exclusivity depends on the structure indices, a
+    structured State gets its own id, distinct from the one of its non-structured counterpart. Two States can
+    only be mutually exclusive if they share a Spec, so a new State is only compared against the States sharing
+    one of its Specs. The relation is symmetric: it holds if it holds in either direction."""
+    def __init__(self, states: Iterable[State] = ()) -> None:
+        self._state_to_id = {}  # type: Dict[State, int]
+        self._states = []  # type: List[State]
+        self._rows = []  # type: List[int]
+        self._spec_to_ids = {}  # type: Dict[Spec, List[int]]
+
+        for state in states:
+            self.state_id(state)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def state_id(self, state: State) -> int:
+        """Returns the id of the State, adding it to the matrix if it was not known yet."""
+        try:
+            return self._state_to_id[state]
+        except KeyError:
+            pass
+
+        new_id = len(self._states)
+        new_bit = 1 << new_id
+        row = 0
+
+        candidate_ids = {other_id for spec in state.specs for other_id in self._spec_to_ids.get(spec, [])}
+        for other_id in candidate_ids:
+            other = self._states[other_id]
+            if state.is_mutually_exclusive_with(other) or other.is_mutually_exclusive_with(state):
+                row |= 1 << other_id
+                self._rows[other_id] |= new_bit
+
+        self._state_to_id[state] = new_id
+        self._states.append(state)
+        self._rows.append(row)
+        for spec in set(state.specs):
+            self._spec_to_ids.setdefault(spec, []).append(new_id)
+
+        return new_id
+
+    def state(self, state_id: int) -> State:
+        return self._states[state_id]
+
+    def exclusion_mask(self, state: State) -> int:
+        """Returns the bitset of the ids of the States mutually exclusive with the given State."""
+        return self._rows[self.state_id(state)]
+
+    def is_mutually_exclusive(self, state: State, other: State) -> bool:
+        state_id, other_id = self.state_id(state), self.state_id(other)
+        return bool(self._rows[state_id] & (1 << other_id))
+
+    def are_consistent(self, states: Iterable[State]) -> bool:
+        """Returns whether the States can hold simultaneously, i.e. no two of them are mutually exclusive."""
+        seen = 0
+        for state in states:
+            state_id = self.state_id(state)
+            if self._rows[state_id] & seen:
+                return False
+            seen |= 1 << state_id
+
+        return True
+
+    def exclusive_pairs(self, states: Iterable[State]) -> List[Tuple[State, State]]:
+        """Returns the mutually exclusive pairs among the (unique) States, in the order in which they appear."""
+        ids = list(OrderedDict.fromkeys(self.state_id(state) for state in states))
+        mask = sum(1 << state_id for state_id in ids)
+
+        pairs = []  # type: List[Tuple[State, State]]
+        for i, state_id in enumerate(ids):
+            row = self._rows[state_id] & mask
+            if row:
+                pairs += [(self._states[state_id], self._states[other_id]) for other_id in ids[i + 1:]
+                          if row & (1 << other_id)]
+
+        return pairs
+
+
+def state_from_str(state_str: str) -> State:
+    """Returns a State object parsed from the given string, raises SyntaxError if not parsable."""
+    try:
+        return _STATE_STR_CACHE[state_str]
+    except KeyError:
+        pass
+
+    state = scan_state(state_str.strip())
+    if state is None:
+        state = _state_from_str_by_regex(state_str)
+
+    _STATE_STR_CACHE[state_str] = state
+    return state
+
+
+def scan_state(state_str: str) -> Optional[State]:  # pylint: disable=too-many-return-statements
+    """Scans a stripped State string in a single pass, splitting it on the '--' or '-{' separator, and
+    scanning the Specs on either side. Returns None if the string is not of a canonical form."""
+    def scan_bracketed_spec(spec_str: str) -> Optional[Spec]:
+        return scan_spec(spec_str, STATE_LOCUS_CHARS, True)
+
+    if state_str == '0':
+        return FullyNeutralState()
+    elif state_str[:1] == '[':
+        if state_str[-1] == ']' and len(state_str) > 2 and STR_CHARS.issuperset(state_str[1:-1]):
+            return GlobalState(state_str)
+        return None
+
+    first_str, bond, second_str = state_str.partition('--')
+    if bond:
+        first_spec = scan_bracketed_spec(first_str)
+        if first_spec is None:
+            return None
+        elif second_str == '0':
+            return EmptyBindingState(first_spec)
+        elif second_str[:1] == '[':
+            if second_str[-1] != ']':
+                return None
+            locus = scan_locus(second_str[1:-1], STATE_LOCUS_CHARS)
+            if locus is None:
+                return None
+            return SelfInteractionState(first_spec, first_spec.with_locus(locus))
+        else:
+            second_spec = scan_bracketed_spec(second_str)
+            if second_spec is None:
+                return None
+            return InteractionState(first_spec, second_spec)
+
+    spec_str, brace, mod_str = state_str.partition('-{')
+    if brace and mod_str[-1:] == '}' and len(mod_str) > 1 and STR_CHARS.issuperset(mod_str[:-1]):
+        spec = scan_bracketed_spec(spec_str)
+        if spec is None:
+            return None
+        return ModificationState(spec, state_modifier_from_str(mod_str[:-1]))
+
+    return None
+
+
+def _state_from_str_by_regex(state_str: str) -> State:  # pylint: disable=too-many-return-statements
     state_str = state_str.strip()
 
     if re.match(GLOBAL_STATE_REGEX, state_str):
@@ -1,6 +1,6 @@
 """Module containing the class ExcelBook, which is used to read in a rxncon system from an Excel file."""
 
-from typing import List, Optional
+from typing import List, Optional, Dict
 import os.path
 import xlrd
 import logging
@@ -12,6 +12,8 @@ from rxncon.input.shared.reaction_preprocess import split_bidirectional_reaction
 from rxncon.core.reaction import Reaction, reaction_from_str, OutputReaction, initialize_reaction_defs
 from rxncon.core.state import initialize_state_modifiers
 from rxncon.core.contingency import Contingency
+from rxncon.util.profiling import span
+from rxncon.venntastic.sets import EXPR_BACKEND
 
 NOT_APPLICABLE = 'N/A'
 
@@ -48,13 +50,17 @@ logger = logging.getLogger(__name__)
 
 
 class ExcelBook:
-    def __init__(self, filename: str) -> None:
+    def __init__(self, filename: str, validation_workers: int=1, validation_backend: str=EXPR_BACKEND) -> None:
         self.filename = filename
+        self._validation_workers = validation_workers
+        self._validation_backend = validation_backend
         self._xlrd_book = None  # type: Optional[xlrd.Book]
         self._reactions = []  # type: List[Reaction]
         self._cont_list_entries = []  # type: List[ContingencyListEntry]
         self._contingencies = []  # type: List[Contingency]
         self._rxncon_system = None  # type: Optional[RxnConSystem]
+        self._state_modifiers = None  # type: Optional[Dict[str, str]]
+        self._reaction_defs = None  # type: Optional[List[Dict[str, str]]]
 
         self._column_modification_type = None  # type: Optional[int]
         self._column_modification_label = None  # type: Optional[int]
@@ -71,15 +77,16 @@ class ExcelBook:
         self._column_rxn_def_resolution_y = None  # type: Optional[int]
         self._column_rule = None  # type: Optional[int]
 
-        self._open_file()
-        self._validate_book()
-        self._determine_column_numbers()
-        self._initialize_modification_types()
-        self._initialize_reaction_defs()
-        self._load_reaction_list()
-        self._load_contingency_list_entries()
-        self._construct_output_reactions()
-        self._construct_contingencies()
+        with span('excel parsing'):
+            self._open_file()
+            self._validate_book()
+            self._determine_column_numbers()
+            self._initialize_modification_types()
+            self._initialize_reaction_defs()
+            self._load_reaction_list()
+            self._load_contingency_list_entries()
+            self._construct_output_reactions()
+            self._construct_contingencies()
         self._construct_rxncon_system()
 
     @property
@@ -87,6 +94,16 @@ class ExcelBook:
         assert self._rxncon_system is not None, 'Could not construct rxncon system!'
         return self._rxncon_system
 
+    @property
+    def state_modifiers(self) -> Optional[Dict[str, str]]:
+        """The additional StateModifiers the book was initialized with, or None if it has none."""
+        return self._state_modifiers
+
+    @property
+    def reaction_defs(self) -> Optional[List[Dict[str, str]]]:
+        """The additional ReactionDefs the book was initialized with, or None if it has none."""
+        return self._reaction_defs
+
     def _open_file(self) -> None:
         if not os.path.isfile(self.filename):
             raise IOError('Could not find file {}'.format(self.filename))
@@ -181,6 +198,7 @@ class ExcelBook:
 
         # The new modifiers are loaded using this function.
         initialize_state_modifiers(modifiers)
+        self._state_modifiers = modifiers
 
     def _initialize_reaction_defs(self) -> None:
         if self._column_rxn_def_reaction is None:
@@ -204,6 +222,7 @@ class ExcelBook:
             })
 
         initialize_reaction_defs(rxn_defs)
+        self._reaction_defs = rxn_defs
 
     def _load_reaction_list(self) -> None:
         sheet = self._xlrd_book.sheet_by_name(SHEET_REACTION_LIST)  # type: ignore
@@ -251,4 +270,5 @@ class ExcelBook:
         self._contingencies = contingencies_from_contingency_list_entries(self._cont_list_entries)
 
     def _construct_rxncon_system(self) -> None:
-        self._rxncon_system = RxnConSystem(self._reactions, self._contingencies)
+        self._rxncon_system = RxnConSystem(self._reactions, self._contingencies, self._validation_workers,
+                                           self._validation_backend)
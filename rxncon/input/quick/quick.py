@@ -10,17 +10,22 @@ from rxncon.core.rxncon_system import RxnConSystem
 from rxncon.core.reaction import Reaction
 from rxncon.core.contingency import Contingency
 from rxncon.input.shared.reaction_preprocess import split_bidirectional_reaction_str
+from rxncon.util.profiling import span
+from rxncon.venntastic.sets import EXPR_BACKEND
 
 
 class Quick:
-    def __init__(self, rxncon_str: str) -> None:
+    def __init__(self, rxncon_str: str, validation_workers: int=1, validation_backend: str=EXPR_BACKEND) -> None:
         self.quick_input = rxncon_str.split('\n')
+        self._validation_workers = validation_workers
+        self._validation_backend = validation_backend
         self._rxncon_system = None              # type: Optional[RxnConSystem]
         self._reactions = []                    # type: List[Reaction]
         self._contingencies = []                # type: List[Contingency]
         self._contingency_list_entries = []     # type: List[ContingencyListEntry]
-        self._parse_str()
-        self._construct_contingencies()
+        with span('quick parsing'):
+            self._parse_str()
+            self._construct_contingencies()
         self._construct_rxncon_system()
         assert self._rxncon_system is not None
 
@@ -61,4 +66,5 @@ class Quick:
         self._contingencies = contingencies_from_contingency_list_entries(self._contingency_list_entries)
 
     def _construct_rxncon_system(self) -> None:
-        self._rxncon_system = RxnConSystem(self._reactions, self._contingencies)
\ No newline at end of file
+        self._rxncon_system = RxnConSystem(self._reactions, self._contingencies, self._validation_workers,
+                                           self._validation_backend)
\ No newline at end of file
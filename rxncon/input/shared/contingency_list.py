@@ -8,7 +8,8 @@ they arised from different boolean contingencies, but actually refer to the same
 
 import re
 import logging
-from typing import Dict, List, Union, Tuple, Optional
+from copy import deepcopy
+from typing import Callable, Dict, List, Union, Tuple, Optional
 
 from rxncon.core.contingency import ContingencyType, Contingency
 from rxncon.core.effector import StateEffector, NotEffector, OrEffector, Effector, AndEffector, \
@@ -126,31 +127,23 @@ def contingency_list_entry_from_strs(subject_str: str, verb_str: Union[str, floa
 
 def contingencies_from_contingency_list_entries(entries: List[ContingencyListEntry]) -> List[Contingency]:
     """Constructs contingencies from the tabular entries. Will dereference pointers to boolean contingencies
-    into nested expressions."""
+    into nested expressions. Every boolean contingency is compiled once, the Effectors of the contingencies
+    share the compiled Effectors, see _BooleanContingencyCompiler."""
     contingencies = []
 
     boolean_entries = [x for x in entries if x.is_boolean_entry]
     reaction_entries = [x for x in entries if x.is_reaction_entry]
 
+    compiler = _BooleanContingencyCompiler(_create_boolean_contingency_to_effector(boolean_entries))
+
     while reaction_entries:
         entry = reaction_entries.pop()
         assert isinstance(entry.subj, Reaction)
         contingencies.append(Contingency(entry.subj,
                                          ContingencyType(entry.verb),
-                                         _unary_effector_from_boolean_contingency_entry(entry),
+                                         compiler.compile(_unary_effector_from_boolean_contingency_entry(entry)),
                                          validate_equivs_specs=False))
 
-    Effector.dereference = _dereference_boolean_contingency_effectors  # type: ignore
-    Effector.contains_booleans = _contains_boolean_contingency_effectors  # type: ignore
-    effectors = _create_boolean_contingency_to_effector(boolean_entries)
-
-    while any(x.effector.contains_booleans() for x in contingencies):  # type: ignore
-        for contingency in contingencies:
-            contingency.effector.dereference(effectors)  # type: ignore
-
-    del Effector.dereference  # type: ignore
-    del Effector.contains_booleans  # type: ignore
-
     for contingency in contingencies:
         contingency.validate_equivs_specs()
 
@@ -179,44 +172,98 @@ class _BooleanContingencyEffector(Effector):
         return []
 
 
-def _dereference_boolean_contingency_effectors(self: Effector, effector_table: Dict[str, Effector]) -> None:
-    if isinstance(self, _BooleanContingencyEffector):
-        LOGGER.debug('_dereference_boolean_contingency_effectors : Expr: {}'.format(self.expr))
-        LOGGER.debug('_dereference_boolean_contingency_effectors : EffTable: {}'.format(effector_table))
-        LOGGER.debug('_dereference_boolean_contingency_effectors : Equivs: {}'.format(self.equivs))
-        name = self.expr.name
-        equivs = self.equivs
-        self.__class__ = effector_table[self.expr.name].__class__
-        self.__dict__ = effector_table[self.expr.name].__dict__
-        self.name = name
+class _BooleanContingencyCompiler:
+    """Replaces the references to boolean contingencies in Effectors by their definitions. Every definition is
+    compiled once, and the compiled Effectors are hash-consed: equal nodes are constructed once, so that the
+    Effectors of all contingencies form a DAG in which e.g. a boolean contingency used by many reactions is
+    shared. A reference carrying equivalences becomes a node of its own, sharing the members of the definition."""
+    def __init__(self, definitions: Dict[str, Effector]) -> None:
+        self._definitions = definitions
+        self._compiled_definitions = {}  # type: Dict[str, Effector]
+        self._compiling = []  # type: List[str]
+        # The keys contain the ids of the member nodes, which are kept alive by this table.
+        self._nodes = {}  # type: Dict[Tuple, Effector]
+
+    def compile(self, effector: Effector) -> Effector:
+        if isinstance(effector, _BooleanContingencyEffector):
+            return self._compiled_reference(effector.expr.name, effector.equivs)
+        elif isinstance(effector, StateEffector):
+            return self._node((StateEffector, effector.expr, effector.name), lambda: effector)
+        elif isinstance(effector, NotEffector):
+            expr = self.compile(effector.expr)
+            return self._node((NotEffector, id(expr), effector.name),
+                              lambda: effector if expr is effector.expr else NotEffector(expr, name=effector.name))
+        elif isinstance(effector, (AndEffector, OrEffector)):
+            exprs = tuple(self.compile(x) for x in effector.exprs)
+            return self._node((type(effector), tuple(id(x) for x in exprs), effector.name,
+                               _equivs_key(effector.equivs)),
+                              lambda: type(effector)(*exprs, name=effector.name, equivs=effector.equivs))
+        else:
+            raise AssertionError('Unknown effector type {} in _BooleanContingencyCompiler'.format(effector))
+
+    def _compiled_reference(self, name: str, equivs: StructEquivalences) -> Effector:
+        assert name in self._definitions, 'Boolean contingency {} is not defined'.format(name)
+        assert name not in self._compiling, 'Boolean contingency {} is defined in terms of itself: {}' \
+            .format(name, ' -> '.join(self._compiling + [name]))
+
+        definition = self._definitions[name]
+        if isinstance(definition, _BooleanContingencyEffector):
+            # A boolean contingency consisting of a single reference is an alias: the reference is replaced by one
+            # to the referenced boolean contingency, carrying the equivalences of both references.
+            merged_equivs = deepcopy(definition.equivs)
+            merged_equivs.merge_with(equivs, [])
+            self._compiling.append(name)
+            try:
+                return self._compiled_reference(definition.expr.name, merged_equivs)
+            finally:
+                self._compiling.pop()
+
+        return self._named(self._compiled_definition(name), name, equivs)
+
+    def _compiled_definition(self, name: str) -> Effector:
         try:
-            self.equivs.merge_with(equivs, [])
-            LOGGER.debug('_dereference_boolean_contingency_effectors : Merged structure information.')
-        except AttributeError:
-            self.equivs = equivs
-            LOGGER.debug('_dereference_boolean_contingency_effectors : Initialized structure information.')
-    elif isinstance(self, StateEffector):
-        pass
-    elif isinstance(self, NotEffector):
-        _dereference_boolean_contingency_effectors(self.expr, effector_table)
-    elif isinstance(self, OrEffector) or isinstance(self, AndEffector):
-        for expr in self.exprs:
-            _dereference_boolean_contingency_effectors(expr, effector_table)
-    else:
-        raise AssertionError('Unknown effector type {} in _dereference_boolean_contingency_effectors'.format(self))
-
-
-def _contains_boolean_contingency_effectors(self: Effector) -> bool:
-    if isinstance(self, _BooleanContingencyEffector):
-        return True
-    elif isinstance(self, StateEffector):
-        return False
-    elif isinstance(self, NotEffector):
-        return _contains_boolean_contingency_effectors(self.expr)
-    elif isinstance(self, AndEffector) or isinstance(self, OrEffector):
-        return any(_contains_boolean_contingency_effectors(expr) for expr in self.exprs)
-    else:
-        raise AssertionError
+            return self._compiled_definitions[name]
+        except KeyError:
+            pass
+
+        LOGGER.debug('_BooleanContingencyCompiler : Compiling {}'.format(name))
+        self._compiling.append(name)
+        try:
+            compiled = self.compile(self._definitions[name])
+        finally:
+            self._compiling.pop()
+
+        self._compiled_definitions[name] = compiled
+        return compiled
+
+    def _named(self, definition: Effector, name: str, equivs: StructEquivalences) -> Effector:
+        """The node for a reference to the boolean contingency `name`: the compiled definition, carrying the name
+        and (if it is an AndEffector or OrEffector) the equivalences of the definition merged with those of the
+        reference."""
+        if isinstance(definition, StateEffector):
+            return self._node((StateEffector, definition.expr, name), lambda: StateEffector(definition.expr, name=name))
+        elif isinstance(definition, NotEffector):
+            return self._node((NotEffector, id(definition.expr), name),
+                              lambda: NotEffector(definition.expr, name=name))
+        elif isinstance(definition, (AndEffector, OrEffector)):
+            merged_equivs = deepcopy(definition.equivs)
+            merged_equivs.merge_with(equivs, [])
+            return self._node((type(definition), tuple(id(x) for x in definition.exprs), name,
+                               _equivs_key(merged_equivs)),
+                              lambda: type(definition)(*definition.exprs, name=name, equivs=merged_equivs))
+        else:
+            raise AssertionError('Unknown effector type {} in _BooleanContingencyCompiler'.format(definition))
+
+    def _node(self, key: Tuple, construct: Callable[[], Effector]) -> Effector:
+        try:
+            return self._nodes[key]
+        except KeyError:
+            node = self._nodes[key] = construct()
+            return node
+
+
+def _equivs_key(equivs: StructEquivalences) -> Tuple[Tuple[str, ...], ...]:
+    return tuple(tuple(str(qual_spec) for qual_spec in eq_class) for eq_class in equivs.eq_classes)
 
 
 def _create_boolean_contingency_to_effector(boolean_contingencies: List[ContingencyListEntry]) \
@@ -0,0 +1,144 @@
+"""Module containing functions to write and read binary snapshots of a constructed RxnConSystem, together with the
+additional StateModifiers and ReactionDefs it was parsed with. The function rxncon_system_from_excel keeps such
+snapshots in a cache directory, keyed by a hash of the contents of the Excel file and of the rxncon sources, so that
+reading the same file again skips parsing and validation."""
+
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import rxncon
+from rxncon.core.rxncon_system import RxnConSystem
+from rxncon.core.reaction import initialize_reaction_defs
+from rxncon.core.state import initialize_state_modifiers
+from rxncon.util.profiling import span
+
+if TYPE_CHECKING:
+    from rxncon.input.excel_book.excel_book import ExcelBook  # pylint: disable=unused-import
+
+LOGGER = logging.getLogger(__name__)
+
+# Increase whenever the layout of the snapshot changes.
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = '.snapshot'
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                 'rxncon')
+
+_SOURCE_HASH = None  # type: Optional[str]
+
+
+def write_snapshot(filename: str, rxncon_system: RxnConSystem, state_modifiers: Optional[Dict[str, str]]=None,
+                   reaction_defs: Optional[List[Dict[str, str]]]=None) -> None:
+    """Writes the RxnConSystem to a snapshot file, which is replaced atomically. The StateModifiers and ReactionDefs
+    are those the RxnConSystem was parsed with, in the form taken by initialize_state_modifiers and
+    initialize_reaction_defs; None means the defaults were left untouched."""
+    dirname = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(dirname, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile('wb', dir=dirname, suffix=SNAPSHOT_EXTENSION, delete=False) as f:
+        try:
+            pickle.dump((SNAPSHOT_VERSION, state_modifiers, reaction_defs), f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(rxncon_system, f, pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+
+    os.replace(f.name, filename)
+
+
+def read_snapshot(filename: str) -> RxnConSystem:
+    """Reads a RxnConSystem from a snapshot file. As when reading the Excel file, the StateModifiers and ReactionDefs
+    stored in the snapshot are initialized first. Raises ValueError if the snapshot has another version."""
+    with open(filename, 'rb') as f, span('snapshot reading'):
+        header = pickle.load(f)  # type: Tuple[int, Optional[Dict[str, str]], Optional[List[Dict[str, str]]]]
+        version, state_modifiers, reaction_defs = header
+        if version != SNAPSHOT_VERSION:
+            raise ValueError('Snapshot {} has version {}, expected {}'.format(filename, version, SNAPSHOT_VERSION))
+
+        if state_modifiers is not None:
+            initialize_state_modifiers(state_modifiers)
+        if reaction_defs is not None:
+            initialize_reaction_defs(reaction_defs)
+
+        rxncon_system = pickle.load(f)
+
+    if not isinstance(rxncon_system, RxnConSystem):
+        raise ValueError('Snapshot {} does not contain a RxnConSystem'.format(filename))
+
+    return rxncon_system
+
+
+def snapshot_filename(input_filename: str, cache_dir: str) -> str:
+    """Returns the file name in the cache directory of the snapshot for the given input file. Besides the contents
+    of the file, the key covers the rxncon sources and the Python version, which determine the pickled layout."""
+    content_hash = hashlib.sha256()
+    with open(input_filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            content_hash.update(block)
+
+    content_hash.update('{}:{}:{}.{}'.format(SNAPSHOT_VERSION, _source_hash(), *sys.version_info[:2]).encode())
+
+    return os.path.join(cache_dir, content_hash.hexdigest() + SNAPSHOT_EXTENSION)
+
+
+def rxncon_system_from_excel(excel_filename: str, validation_workers: int=1,
+                             cache_dir: Optional[str]=DEFAULT_CACHE_DIR) -> RxnConSystem:
+    """Returns the RxnConSystem read from the Excel file. If cache_dir is not None, a snapshot of the RxnConSystem
+    is looked up there first, and written there after reading the Excel file otherwise. Unreadable snapshots are
+    ignored, snapshots that cannot be written are skipped."""
+    if cache_dir is None:
+        return _read_excel_book(excel_filename, validation_workers).rxncon_system
+
+    if not os.path.isfile(excel_filename):
+        raise IOError('Could not find file {}'.format(excel_filename))
+
+    filename = snapshot_filename(excel_filename, cache_dir)
+
+    if os.path.isfile(filename):
+        try:
+            rxncon_system = read_snapshot(filename)
+            LOGGER.info('rxncon_system_from_excel: read snapshot {} for {}'.format(filename, excel_filename))
+            return rxncon_system
+        except Exception as e:  # pylint: disable=broad-except
+            LOGGER.warning('rxncon_system_from_excel: ignoring unreadable snapshot {}: {}'.format(filename, e))
+
+    excel_book = _read_excel_book(excel_filename, validation_workers)
+
+    try:
+        write_snapshot(filename, excel_book.rxncon_system, excel_book.state_modifiers, excel_book.reaction_defs)
+        LOGGER.info('rxncon_system_from_excel: wrote snapshot {} for {}'.format(filename, excel_filename))
+    except (OSError, pickle.PicklingError) as e:
+        LOGGER.warning('rxncon_system_from_excel: could not write snapshot {}: {}'.format(filename, e))
+
+    return excel_book.rxncon_system
+
+
+def _source_hash() -> str:
+    """Returns a hash of the rxncon sources outside of the tests, computed once per process."""
+    global _SOURCE_HASH
+
+    if _SOURCE_HASH is None:
+        source_hash = hashlib.sha256()
+        root = os.path.dirname(os.path.abspath(rxncon.__file__))
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(x for x in dirnames if x not in ('test', '__pycache__'))
+            for filename in sorted(x for x in filenames if x.endswith('.py')):
+                path = os.path.join(dirpath, filename)
+                source_hash.update(os.path.relpath(path, root).encode())
+                with open(path, 'rb') as f:
+                    source_hash.update(f.read())
+        _SOURCE_HASH = source_hash.hexdigest()
+
+    return _SOURCE_HASH
+
+
+def _read_excel_book(excel_filename: str, validation_workers: int) -> 'ExcelBook':
+    # Imported here, the ExcelBook (and with it xlrd) is only needed if there is no snapshot to read.
+    from rxncon.input.excel_book.excel_book import ExcelBook
+    return ExcelBook(excel_filename, validation_workers)
@@ -0,0 +1,224 @@
+"""Module containing a generator of synthetic rxncon systems, used to measure how rxncon scales. The systems are
+written in the Quick format, and parameterized by the number of components, the number of domains (and residues)
+per component, the mix of reaction types, the number of contingencies per reaction and the nesting depth of the
+boolean contingencies.
+
+The generated systems are valid by construction: the contingencies of a reaction only mention states produced by
+reactions in the system, on components on the left hand side of the reaction, not on a locus the reaction itself
+acts on, and no two states in the contingencies of a reaction share a locus. Therefore they are never mutually
+exclusive, and all contingencies are satisfiable."""
+
+from typing import Dict, List, Optional, Set, Tuple
+import random
+
+from rxncon.core.reaction import reaction_from_str, Reaction
+from rxncon.core.rxncon_system import RxnConSystem
+from rxncon.core.state import State, SelfInteractionState
+from rxncon.input.quick.quick import Quick
+from rxncon.input.shared.reaction_preprocess import split_bidirectional_reaction_str
+
+
+DEFAULT_REACTION_MIX = {
+    'ppi': 0.4,
+    'p+':  0.3,
+    'ipi': 0.1,
+    'syn': 0.1,
+    'deg': 0.1,
+}  # type: Dict[str, float]
+
+# The reaction types the generator knows, mapped to functions (rng, components, domains) -> reaction string.
+REACTION_TEMPLATES = {
+    'ppi': lambda rng, comps, doms: 'C{0}_[d{2}]_ppi_C{1}_[d{3}]'.format(*_two(rng, comps), rng.randrange(doms),
+                                                                        rng.randrange(doms)),
+    'ipi': lambda rng, comps, doms: 'C{0}_[d{1}]_ipi_C{0}_[d{2}]'.format(rng.randrange(comps), *_two(rng, doms)),
+    'p+':  lambda rng, comps, doms: 'C{0}_p+_C{1}_[(r{2})]'.format(*_two(rng, comps), rng.randrange(doms)),
+    'p-':  lambda rng, comps, doms: 'C{0}_p-_C{1}_[(r{2})]'.format(*_two(rng, comps), rng.randrange(doms)),
+    'syn': lambda rng, comps, doms: 'C{0}_syn_C{1}'.format(*_two(rng, comps)),
+    'deg': lambda rng, comps, doms: 'C{0}_deg_C{1}'.format(*_two(rng, comps)),
+}
+
+
+def synthetic_quick_str(components: int=10, domains: int=3, reactions: Optional[int]=None,
+                        reaction_mix: Optional[Dict[str, float]]=None, contingency_density: float=1.0,
+                        nesting_depth: int=0, seed: int=0) -> str:
+    """Returns the Quick string of a synthetic rxncon system.
+
+    Args:
+        components: Number of components C0, C1, ...
+        domains: Number of domains d0, d1, ... and residues r0, r1, ... per component.
+        reactions: Number of reactions (bidirectional ones counting once), default: twice the number of components.
+        reaction_mix: Relative frequencies of the reaction types (keys of REACTION_TEMPLATES), default:
+            DEFAULT_REACTION_MIX.
+        contingency_density: Mean number of contingencies per reaction.
+        nesting_depth: Depth of the boolean contingencies, 0 meaning only contingencies on elemental states.
+            A boolean contingency of depth n is a tree of alternating AND / OR of depth n with two children per
+            node, the leaves being elemental states.
+        seed: Seed of the random number generator, equal arguments give equal systems.
+
+    Returns:
+        The Quick string.
+
+    Raises:
+        ValueError: If the arguments do not allow for any system.
+    """
+    if reactions is None:
+        reactions = 2 * components
+    if reaction_mix is None:
+        reaction_mix = DEFAULT_REACTION_MIX
+
+    if components < 2 or domains < 2:
+        raise ValueError('At least two components with two domains each are required')
+    unknown_types = set(reaction_mix.keys()) - set(REACTION_TEMPLATES.keys())
+    if unknown_types:
+        raise ValueError('Unknown reaction types {}, known are {}'
+                         .format(', '.join(sorted(unknown_types)), ', '.join(sorted(REACTION_TEMPLATES.keys()))))
+    if contingency_density < 0 or nesting_depth < 0:
+        raise ValueError('The contingency density and nesting depth cannot be negative')
+
+    rng = random.Random(seed)
+    reaction_strs = _reaction_strs(rng, components, domains, reactions, reaction_mix)
+    forward_reactions = [reaction_from_str(split_bidirectional_reaction_str(x)[0]) for x in reaction_strs]
+
+    # The states the contingencies are drawn from, together with the loci they live on. The rule-based model does
+    # not support all contingencies on self-interactions, these are therefore left out.
+    states = []  # type: List[State]
+    self_interaction_loci = set()  # type: Set[str]
+    for reaction in forward_reactions:
+        for state in reaction.produced_states:
+            if isinstance(state, SelfInteractionState):
+                self_interaction_loci.update(str(spec) for spec in state.specs)
+            elif not state.is_neutral and state not in states:
+                states.append(state)
+    component_to_states = {}  # type: Dict[str, List[State]]
+    for state in states:
+        for component in state.components:
+            component_to_states.setdefault(str(component), []).append(state)
+
+    lines = []  # type: List[str]
+    boolean_lines = []  # type: List[str]
+    for index, (reaction_str, reaction) in enumerate(zip(reaction_strs, forward_reactions)):
+        candidates = _candidate_states(reaction, component_to_states)
+        rng.shuffle(candidates)
+        negatable = {state for state in candidates if _is_negatable(state, reaction, self_interaction_loci)}
+
+        contingency_count = int(contingency_density) + (1 if rng.random() < contingency_density % 1 else 0)
+        contingency_strs = []  # type: List[str]
+        for contingency_index in range(contingency_count):
+            if not candidates:
+                break
+
+            # The rule-based model does not support all negated states, see _is_negatable. The other states are
+            # therefore only required, and not used as leaves of boolean contingencies containing an OR (whose
+            # solutions contain the negated leaves).
+            depth = min(nesting_depth, (len(candidates) - 1).bit_length())
+            if depth == 0:
+                leaf = _pop_leaf(candidates)
+                assert leaf is not None
+                if leaf in negatable:
+                    contingency_strs.append('{} {}'.format(rng.choice(['!', 'x']), leaf))
+                else:
+                    contingency_strs.append('! {}'.format(leaf))
+            else:
+                name = 'R{}B{}'.format(index, contingency_index)
+                boolean_name = _boolean(name, depth, candidates, negatable if depth > 1 else None, boolean_lines) or \
+                    _boolean(name, 1, candidates, None, boolean_lines)
+                contingency_strs.append('! {}'.format(boolean_name))
+
+        lines.append('; '.join([reaction_str] + contingency_strs))
+
+    return '\n'.join(lines + boolean_lines)
+
+
+def synthetic_rxncon_system(components: int=10, domains: int=3, reactions: Optional[int]=None,
+                            reaction_mix: Optional[Dict[str, float]]=None, contingency_density: float=1.0,
+                            nesting_depth: int=0, seed: int=0, validation_workers: int=1) -> RxnConSystem:
+    """Returns the RxnConSystem of a synthetic rxncon system, see synthetic_quick_str for the arguments."""
+    return Quick(synthetic_quick_str(components, domains, reactions, reaction_mix, contingency_density,
+                                     nesting_depth, seed), validation_workers).rxncon_system
+
+
+def _two(rng: random.Random, count: int) -> Tuple[int, int]:
+    first, second = rng.sample(range(count), 2)
+    return first, second
+
+
+def _reaction_strs(rng: random.Random, components: int, domains: int, reactions: int,
+                   reaction_mix: Dict[str, float]) -> List[str]:
+    types = sorted(reaction_mix.keys())
+    weights = [reaction_mix[x] for x in types]
+
+    reaction_strs = []  # type: List[str]
+    seen = set()  # type: Set[str]
+    attempts = 0
+    while len(reaction_strs) < reactions:
+        attempts += 1
+        if attempts > 100 * reactions:
+            raise ValueError('Could not generate {} distinct reactions, increase the number of components or domains'
+                             .format(reactions))
+
+        reaction_str = REACTION_TEMPLATES[rng.choices(types, weights)[0]](rng, components, domains)
+        if reaction_str not in seen:
+            seen.add(reaction_str)
+            reaction_strs.append(reaction_str)
+
+    return reaction_strs
+
+
+def _candidate_states(reaction: Reaction, component_to_states: Dict[str, List[State]]) -> List[State]:
+    """The states that can appear in the contingencies of the reaction, sorted: those on the components on the
+    left hand side, that do not live on a locus the reaction acts on."""
+    own_loci = {str(spec) for state in reaction.produced_states + reaction.consumed_states for spec in state.specs}
+
+    candidates = []  # type: List[State]
+    for component in reaction.components_lhs:
+        for state in component_to_states.get(str(component), []):
+            if state not in candidates and not own_loci & {str(spec) for spec in state.specs}:
+                candidates.append(state)
+
+    return sorted(candidates, key=str)
+
+
+def _is_negatable(state: State, reaction: Reaction, self_interaction_loci: Set[str]) -> bool:
+    """Whether the state can appear negated in the contingencies of the reaction: the rule-based model supports
+    negated states on the reactants, but not all negated interactions with other components, nor negated states
+    on loci that also take part in self-interactions."""
+    return set(state.components) <= reaction.components_lhs_set and \
+        not self_interaction_loci & {str(spec) for spec in state.specs}
+
+
+def _pop_leaf(candidates: List[State], only: Optional[Set[State]]=None) -> Optional[State]:
+    """Pops the last state from candidates (that is in only, if given), and removes the candidates sharing a
+    locus with it. Returns None if there is no such state."""
+    eligible = [i for i, state in enumerate(candidates) if only is None or state in only]
+    if not eligible:
+        return None
+
+    leaf = candidates.pop(eligible[-1])
+    leaf_loci = {str(spec) for spec in leaf.specs}
+    candidates[:] = [x for x in candidates if not leaf_loci & {str(spec) for spec in x.specs}]
+    return leaf
+
+
+def _boolean(name: str, depth: int, candidates: List[State], only: Optional[Set[State]],
+             boolean_lines: List[str]) -> Optional[str]:
+    """Appends the lines defining a boolean contingency of the given depth to boolean_lines, returns its name.
+    The leaves are popped from candidates, see _pop_leaf. Returns None if there are no leaves."""
+    operator = 'AND' if depth % 2 else 'OR'
+
+    children = []  # type: List[str]
+    for child_index in range(2):
+        if depth == 1:
+            leaf = _pop_leaf(candidates, only)
+            child = str(leaf) if leaf else None
+        else:
+            child = _boolean('{}{}'.format(name, child_index), depth - 1, candidates, only, boolean_lines)
+
+        if child is None:
+            break
+        children.append(child)
+
+    if not children:
+        return None
+
+    boolean_lines.append('<{}>; '.format(name) + '; '.join('{} {}'.format(operator, x) for x in children))
+    return '<{}>'.format(name)
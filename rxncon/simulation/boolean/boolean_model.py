@@ -1,5 +1,5 @@
 from abc import ABCMeta
-from copy import deepcopy
+from copy import copy, deepcopy
 from enum import Enum
 from itertools import product
 from typing import List, Dict, Tuple, Optional
@@ -8,6 +8,7 @@ from rxncon.core.reaction import Reaction, OutputReaction
 from rxncon.core.rxncon_system import RxnConSystem
 from rxncon.core.spec import Spec
 from rxncon.core.state import State, InteractionState
+from rxncon.util.profiling import span
 from rxncon.venntastic.sets import Set as VennSet, ValueSet, Intersection, Union, Complement, UniversalSet, EmptySet
 
 MAX_STEADY_STATE_ITERS = 20
@@ -126,6 +127,8 @@ class BooleanModelState:
 
 class Target(metaclass=ABCMeta):
     """Abstract base class for the different targets."""
+    __slots__ = ()
+
     def __hash__(self) -> int:
         return hash(str(self))
 
@@ -139,6 +142,9 @@ class ReactionTarget(Target):
     since (1) the contingencies determine what the reaction degrades (which obviously becomes problematic
     in the case of a logical disjunction), and (2) the degradation of bonds should produce empty binding
     partners. We refer to our paper."""
+    __slots__ = ('reaction_parent', 'produced_targets', 'consumed_targets', 'synthesised_targets', 'degraded_targets',
+                 'contingency_variant_index', 'interaction_variant_index', 'contingency_factor')
+
     def __init__(self, reaction_parent: Reaction, contingency_variant: Optional[int]=None,
                  interaction_variant: Optional[int] = None, contingency_factor: VennSet['StateTarget']=None) -> None:
         self.reaction_parent = reaction_parent  # type: Reaction
@@ -154,7 +160,7 @@ class ReactionTarget(Target):
         if contingency_factor is None:
             self.contingency_factor = UniversalSet()  # type: VennSet[StateTarget]
         else:
-            self.contingency_factor = contingency_factor  # type: VennSet[StateTarget]
+            self.contingency_factor = contingency_factor
 
     def __hash__(self) -> int:
         return hash(str(self))
@@ -180,6 +186,16 @@ class ReactionTarget(Target):
     def __repr__(self) -> str:
         return str(self)
 
+    def clone(self) -> 'ReactionTarget':
+        """Returns a copy whose target lists can be modified independently. The parent Reaction, the
+        (immutable) States and the contingency factor are shared with the original."""
+        res = copy(self)
+        res.produced_targets = list(self.produced_targets)
+        res.consumed_targets = list(self.consumed_targets)
+        res.synthesised_targets = list(self.synthesised_targets)
+        res.degraded_targets = list(self.degraded_targets)
+        return res
+
     def produces(self, state_target: 'StateTarget') -> bool:
         return state_target in self.produced_targets
 
@@ -193,28 +209,30 @@ class ReactionTarget(Target):
         return state_target in self.degraded_targets
 
     @property
-    def components_lhs(self) -> List[Spec]:
+    def components_lhs(self) -> Tuple[Spec, ...]:
         return self.reaction_parent.components_lhs
 
     @property
-    def components_rhs(self) -> List[Spec]:
+    def components_rhs(self) -> Tuple[Spec, ...]:
         return self.reaction_parent.components_rhs
 
     @property
     def degraded_components(self) -> List[Spec]:
-        return [component for component in self.components_lhs if component not in self.components_rhs]
+        return [component for component in self.components_lhs
+                if component not in self.reaction_parent.components_rhs_set]
 
     @property
     def synthesised_components(self) -> List[Spec]:
-        return [component for component in self.components_rhs if component not in self.components_lhs]
+        return [component for component in self.components_rhs
+                if component not in self.reaction_parent.components_lhs_set]
 
     def degrades_component(self, spec: Spec) -> bool:
         assert spec.is_component_spec
-        return spec in self.degraded_components
+        return spec in self.reaction_parent.components_lhs_set and spec not in self.reaction_parent.components_rhs_set
 
     def synthesises_component(self, spec: Spec) -> bool:
         assert spec.is_component_spec
-        return spec in self.synthesised_components
+        return spec in self.reaction_parent.components_rhs_set and spec not in self.reaction_parent.components_lhs_set
 
     def is_output(self) -> bool:
         return isinstance(self.reaction_parent, OutputReaction)
@@ -224,6 +242,8 @@ class StateTarget(Target):
     """State target of the Boolean model. The relation between rxncon states and Boolean state targets
     is generally 1:1, but not quite: the components that carry no internal state are assigned so-called
     ComponentStateTargets (see next class.)"""
+    __slots__ = ('state_parent',)
+
     def __init__(self, state_parent: State) -> None:
         self.state_parent = state_parent
 
@@ -254,7 +274,7 @@ class StateTarget(Target):
         return self.state_parent.is_global
 
     @property
-    def components(self) -> List[Spec]:
+    def components(self) -> Tuple[Spec, ...]:
         return self.state_parent.components
 
     def shares_component_with(self, other_target: 'StateTarget') -> bool:
@@ -286,6 +306,8 @@ class StateTarget(Target):
 
 class ComponentStateTarget(StateTarget):
     """ComponentStateTarget describes a rxncon component that carries no states."""
+    __slots__ = ('component',)
+
     def __init__(self, component: Spec) -> None:
         self.component = component
 
@@ -304,8 +326,8 @@ class ComponentStateTarget(StateTarget):
         return hash(str(self))
 
     @property
-    def components(self) -> List[Spec]:
-        return [self.component]
+    def components(self) -> Tuple[Spec, ...]:
+        return (self.component,)
 
     @property
     def is_neutral(self) -> bool:
@@ -320,6 +342,8 @@ class KnockoutTarget(ComponentStateTarget):
     """When enabled, KnockoutTargets are ANDed into the update rule for each target, one KnockoutTarget
     per component. The KnockoutTarget itself has a trivial update rule. By changing the initial conditions
     for the KnockoutTarget we can knock out all states for a particular component, making them always FALSE."""
+    __slots__ = ()
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Target):
             return NotImplemented
@@ -337,6 +361,8 @@ class KnockoutTarget(ComponentStateTarget):
 
 class OverexpressionTarget(ComponentStateTarget):
     """Similar to KnockoutTarget, but now (a set of) states per component can be made always TRUE."""
+    __slots__ = ()
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Target):
             return NotImplemented
@@ -465,29 +491,37 @@ def boolean_model_from_rxncon(rxncon_sys: RxnConSystem,
         split of the degradation reaction in as many reactions as OR statements. Each OR will be assigned to one
         instance of the reaction."""
         reaction_targets = set()
+        # Reactions sharing their contingencies (e.g. a boolean contingency) share the simplified factor.
+        simplified_factors = {}  # type: Dict[VennSet[StateTarget], VennSet[StateTarget]]
 
         for reaction in rxncon_sys.reactions:
-            factors = (x.to_venn_set(k_plus_strict=k_plus_strict, k_minus_strict=k_minus_strict, structured=False,
-                                     state_wrapper=StateTarget)
-                       for x in rxncon_sys.contingencies_for_reaction(reaction))
-            cont = Intersection(*factors).to_simplified_set()  # type: VennSet[StateTarget]
-            # The reaction is not a degradation reaction or the DNF has just one term.
-            if not reaction.degraded_components or len(cont.to_dnf_list()) == 1:
-                reaction_targets.add(ReactionTarget(reaction, contingency_factor=cont))
-            # The reaction is a degradation reaction
-            else:
-                # The reaction is split into separated entities according to the number of minterms of the
-                # disjunctive normal form (dnf). Each minterm will be assigned to a entity of the degradation reaction.
-                for index, factor in enumerate(cont.to_dnf_list()):
-                    reaction_targets.add(
-                        ReactionTarget(reaction, contingency_variant=index, contingency_factor=factor))
+            with span('boolean contingency factors', reaction):
+                factors = (x.to_venn_set(k_plus_strict=k_plus_strict, k_minus_strict=k_minus_strict, structured=False,
+                                         state_wrapper=StateTarget)
+                           for x in rxncon_sys.contingencies_for_reaction(reaction))
+                factor = Intersection(*factors)  # type: VennSet[StateTarget]
+                try:
+                    cont = simplified_factors[factor]
+                except KeyError:
+                    cont = simplified_factors[factor] = factor.to_simplified_set()
+                # The reaction is not a degradation reaction or the DNF has just one term.
+                if not reaction.degraded_components or len(cont.to_dnf_list()) == 1:
+                    reaction_targets.add(ReactionTarget(reaction, contingency_factor=cont))
+                # The reaction is a degradation reaction
+                else:
+                    # The reaction is split into separated entities according to the number of minterms of the
+                    # disjunctive normal form (dnf). Each minterm will be assigned to a entity of the degradation
+                    # reaction.
+                    for index, factor in enumerate(cont.to_dnf_list()):
+                        reaction_targets.add(
+                            ReactionTarget(reaction, contingency_variant=index, contingency_factor=factor))
 
         return list(reaction_targets)
 
     def update_degs_add_component_states(reaction_targets: List[ReactionTarget],
                                          component_state_targets: List[ComponentStateTarget]) -> List[ReactionTarget]:
         """For degradation reactions, add the stateless components they degrade to the list of targets they degrade."""
-        result = deepcopy(reaction_targets)
+        result = [x.clone() for x in reaction_targets]
         for reaction_target in result:
             for degraded_component in reaction_target.degraded_components:
                 if ComponentStateTarget(degraded_component) in component_state_targets:
@@ -515,7 +549,7 @@ def boolean_model_from_rxncon(rxncon_sys: RxnConSystem,
 
                 return trues
 
-        result = deepcopy(reaction_targets)
+        result = [x.clone() for x in reaction_targets]
 
         for reaction_target in result:
             solutions = reaction_target.contingency_factor.calc_solutions()
@@ -559,7 +593,7 @@ def boolean_model_from_rxncon(rxncon_sys: RxnConSystem,
                                          .format(', '.join(str(x) for x in degraded_interaction_targets),
                                                  str(reaction_target), str(interaction_target),
                                                  ', '.join(str(x) for x in empty_partners)))
-                new_reaction = deepcopy(reaction_target)
+                new_reaction = reaction_target.clone()
                 new_reaction.interaction_variant_index = index if len(degraded_interaction_targets) > 1 else None
                 new_reaction.consumed_targets.append(interaction_target)
                 new_reaction.produced_targets.append(empty_partners[0])
@@ -567,7 +601,7 @@ def boolean_model_from_rxncon(rxncon_sys: RxnConSystem,
                 appended = True
 
             if not appended:
-                result.append(deepcopy(reaction_target))
+                result.append(reaction_target.clone())
 
         return result
 
@@ -575,7 +609,7 @@ def boolean_model_from_rxncon(rxncon_sys: RxnConSystem,
                                           component_state_targets: List[ComponentStateTarget]) -> List[ReactionTarget]:
         """Update synthesis reaction with component states: stateless components that are synthesised have
         rights too."""
-        result = deepcopy(reaction_targets)
+        result = [x.clone() for x in reaction_targets]
 
         for reaction_target in result:
             for component in reaction_target.synthesised_components:
@@ -752,13 +786,14 @@ def boolean_model_from_rxncon(rxncon_sys: RxnConSystem,
     knockout_rules = []  # type: List[UpdateRule]
     overexpression_rules = []  # type: List[UpdateRule]
 
-    calc_reaction_rules()
-    calc_state_rules()
-    update_state_rules_with_knockouts(knockout_strategy)
-    update_state_rules_with_overexpressions(overexpression_strategy)
-    calc_knockout_rules()
-    calc_overexpression_rules()
-    update_input_output_rules()
+    with span('boolean rule building'):
+        calc_reaction_rules()
+        calc_state_rules()
+        update_state_rules_with_knockouts(knockout_strategy)
+        update_state_rules_with_overexpressions(overexpression_strategy)
+        calc_knockout_rules()
+        calc_overexpression_rules()
+        update_input_output_rules()
 
     return BooleanModel(state_targets + reaction_targets + knockout_targets + overexpression_targets,  # type: ignore
                         reaction_rules + state_rules + knockout_rules + overexpression_rules,
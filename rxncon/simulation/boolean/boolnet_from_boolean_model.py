@@ -8,6 +8,7 @@ from rxncon.core.rxncon_system import RxnConSystem
 from rxncon.simulation.boolean.boolean_model import BooleanModel, Target, ReactionTarget, KnockoutTarget, \
     OverexpressionTarget, StateTarget, UpdateRule, SmoothingStrategy, KnockoutStrategy, OverexpressionStrategy, \
     boolean_model_from_rxncon
+from rxncon.util.profiling import span
 from rxncon.venntastic.sets import Set as VennSet, ValueSet, Complement, Intersection, Union, EmptySet, UniversalSet
 
 
@@ -124,17 +125,19 @@ def boolnet_strs_from_rxncon(rxncon: RxnConSystem, smoothing_strategy: Smoothing
     else:
         raise AssertionError('Unknown QuantitativeContingencyStrategy {}'.format(k_minus_strategy))
 
-    model_str, symbol_dict, initial_val_dict = \
-        boolnet_from_boolean_model(boolean_model_from_rxncon(rxncon, smoothing_strategy=smoothing_strategy,
-                                                             knockout_strategy=knockout_strategy,
-                                                             overexpression_strategy=overexpression_strategy,
-                                                             k_plus_strict=k_plus_strict,
-                                                             k_minus_strict=k_minus_strict))
+    boolean_model = boolean_model_from_rxncon(rxncon, smoothing_strategy=smoothing_strategy,
+                                              knockout_strategy=knockout_strategy,
+                                              overexpression_strategy=overexpression_strategy,
+                                              k_plus_strict=k_plus_strict, k_minus_strict=k_minus_strict)
 
-    symbol_str = '\n'.join('{0}, {1}'.format(boolnet_sym, rxncon_sym) for boolnet_sym, rxncon_sym
-                           in sorted(symbol_dict.items(), key=sort_key)) + '\n'
+    with span('export'):
+        model_str, symbol_dict, initial_val_dict = boolnet_from_boolean_model(boolean_model)
 
-    initial_val_str = '\n'.join('{0}, {1: <5}  , #  {2}'.format(boolnet_sym, initial_val, symbol_dict[boolnet_sym])
-                                for boolnet_sym, initial_val in sorted(initial_val_dict.items(), key=sort_key)) + '\n'
+        symbol_str = '\n'.join('{0}, {1}'.format(boolnet_sym, rxncon_sym) for boolnet_sym, rxncon_sym
+                               in sorted(symbol_dict.items(), key=sort_key)) + '\n'
+
+        initial_val_str = '\n'.join('{0}, {1: <5}  , #  {2}'.format(boolnet_sym, initial_val, symbol_dict[boolnet_sym])
+                                    for boolnet_sym, initial_val in sorted(initial_val_dict.items(),
+                                                                           key=sort_key)) + '\n'
 
     return model_str, symbol_str, initial_val_str
@@ -2,7 +2,7 @@ import logging
 from collections import defaultdict, OrderedDict
 from copy import copy, deepcopy
 from datetime import datetime
-from itertools import combinations, product, chain, permutations, groupby
+from itertools import product, chain, permutations, groupby
 from re import match
 from typing import Dict, List, Optional, Tuple, Iterable, Iterator, Set  # pylint: disable=unused-import
 
@@ -12,7 +12,8 @@ from rxncon.core.rxncon_system import RxnConSystem
 from rxncon.core.spec import Spec, Locus
 from rxncon.core.state import State, StateModifier, ModificationState, InteractionState, SelfInteractionState, \
     GlobalState, \
-    EmptyBindingState
+    EmptyBindingState, StateExclusions
+from rxncon.util.profiling import span
 from rxncon.venntastic.sets import Set as VennSet, Intersection, Union, Complement, ValueSet, UniversalSet, \
     DisjunctiveUnion
 
@@ -128,6 +129,7 @@ class MolDefBuilder:
 
 class Mol:
     """Mol represents a molecule in a particular state."""
+    __slots__ = ('name', 'site_to_mod', 'site_to_bond', 'is_reactant')
 
     def __init__(self, name: str, site_to_mod: Dict[str, str], site_to_bond: Dict[str, Optional[int]],
                  is_reactant: bool) -> None:
@@ -234,6 +236,7 @@ class Complex:
     """Complex holds a bag of molecules in a particular state. The bonds between them are stored
     in the Mol objects. Every inter-molecule bond should therefore appear twice: once in either
     binding partner."""
+    __slots__ = ('mols',)
 
     def __init__(self, mols: List[Mol]) -> None:
         self.mols = sorted(mols)
@@ -482,34 +485,24 @@ class Rule:
         if self == other:
             return True
 
-        my_lhs = deepcopy(self.lhs)
-        my_rhs = deepcopy(self.rhs)
-
-        other_lhs = deepcopy(other.lhs)
-        other_rhs = deepcopy(other.rhs)
-
-        for complex in my_lhs + my_rhs:  # pylint: disable=redefined-builtin
-            complex.found = False  # type: ignore
-
-        for complex in other_lhs + other_rhs:
-            complex.visited = False  # type: ignore
+        def match(my_complexes: List[Complex], other_complexes: List[Complex]) -> Tuple[List[bool], List[bool]]:
+            # Pairs every complex with the first equivalent complex on the other side that is still unmatched,
+            # returns per complex whether it was found resp. visited.
+            found = [False] * len(my_complexes)
+            visited = [False] * len(other_complexes)
+            for i, my_complex in enumerate(my_complexes):
+                for j, other_complex in enumerate(other_complexes):
+                    if my_complex.is_equivalent_to(other_complex) and not visited[j]:
+                        found[i], visited[j] = True, True
+                        break
 
-        for my_complex in my_lhs:
-            for other_complex in other_lhs:
-                if my_complex.is_equivalent_to(other_complex) and not other_complex.visited:  # type: ignore
-                    my_complex.found = True  # type: ignore
-                    other_complex.visited = True  # type: ignore
-                    break
+            return found, visited
 
-        for my_complex in my_rhs:
-            for other_complex in other_rhs:
-                if my_complex.is_equivalent_to(other_complex) and not other_complex.visited:  # type: ignore
-                    my_complex.found = True  # type: ignore
-                    other_complex.visited = True  # type: ignore
-                    break
+        lhs_found, lhs_visited = match(self.lhs, other.lhs)
+        rhs_found, rhs_visited = match(self.rhs, other.rhs)
 
-        all_found = all(complex.found for complex in my_lhs + my_rhs)  # type: ignore
-        all_visited = all(complex.visited for complex in other_lhs and other_rhs)  # type: ignore
+        all_found = all(lhs_found + rhs_found)
+        all_visited = all(lhs_visited and rhs_visited)
 
         return all_found and all_visited
 
@@ -580,6 +573,8 @@ class BondComplex:
     """BondComplex is used to enumerate the different complexes that can be constructed.
     Logically this object is immutable, it is just the "caches" cannot_connect_with
     and already_combined_with that change, but these do not change the hash value."""
+    __slots__ = ('components', 'states', 'connected_bonds', 'contained_complexes', '_hash_value',
+                 'cannot_connect_with', 'already_combined_with')
 
     def __init__(self, components: Set[Spec], states: Dict[State, bool], connected_bonds: Set[State],
                  contained_complexes: Set['BondComplex']) -> None:
@@ -659,8 +654,11 @@ class BondComplex:
     def is_connected(self) -> bool:
         return not self.dangling_bonds()
 
-    def is_consistent(self) -> bool:
+    def is_consistent(self, exclusions: Optional[StateExclusions] = None) -> bool:
         # No two mutually exclusive states can be true at the same time.
+        if exclusions is not None:
+            return exclusions.are_consistent(state for state, val in self.states.items() if val)
+
         for state, val in self.states.items():
             if val and any(state.is_mutually_exclusive_with(other)
                            for other, other_val in self.states.items() if other_val):
@@ -674,9 +672,12 @@ class BondComplex:
         )
 
 
-def bond_complexes(cont_set: VennSet[State]) -> List[BondComplex]:
+def bond_complexes(cont_set: VennSet[State], exclusions: Optional[StateExclusions] = None) -> List[BondComplex]:
     """Returns a list of BondComplex objects, describing the valid complexes
     that could be built out of a contingency."""
+    if exclusions is None:
+        exclusions = StateExclusions(cont_set.values)
+
     bond_filter = make_bond_filter(cont_set)
     comp_to_bonds = group_states(cont_set, lambda s: bond_filter(s))
 
@@ -688,7 +689,7 @@ def bond_complexes(cont_set: VennSet[State]) -> List[BondComplex]:
         cur_component = (BondComplex({comp}, {state: val for state, val in zip(bonds, combi)},
                                      set(), set())
                          for combi in product((True, False), repeat=len(bonds)))
-        single_components |= {bc for bc in cur_component if bc.is_consistent()}
+        single_components |= {bc for bc in cur_component if bc.is_consistent(exclusions)}
 
     complexes = {bc for bc in single_components
                  if bc.contains_first_reactant() or bc.contains_second_reactant()}
@@ -738,7 +739,7 @@ def with_connectivity_constraints(cont_set: VennSet[State], rxncon_system: RxnCo
     LOGGER.debug('with_connectivity_constraints : calculating molecular microstates')
     components = components_microstate(cont_set, rxncon_system)
     LOGGER.debug('with_connectivity_constraints : calculating complexes')
-    complexes = bond_complexes(cont_set)
+    complexes = bond_complexes(cont_set, rxncon_system.state_exclusions)
 
     constraints = []
 
@@ -749,7 +750,8 @@ def with_connectivity_constraints(cont_set: VennSet[State], rxncon_system: RxnCo
 
 
 class QuantContingencyConfigs(Iterator[VennSet[State]]):  # pylint: disable=too-few-public-methods
-    """QuantContingencyConfigs is used to iterate over the quantitative contingency configurations."""
+    """QuantContingencyConfigs is used to iterate over the quantitative contingency configurations. The suffix
+    for the rate constant of the current configuration is given by rate_constant_desc."""
 
     def __init__(self, q_contingencies: List[Contingency]) -> None:
         self.q_contingencies = deepcopy(q_contingencies)
@@ -778,15 +780,17 @@ class QuantContingencyConfigs(Iterator[VennSet[State]]):  # pylint: disable=too-
     def __next__(self) -> VennSet[State]:
         try:
             self.current_combi_set += 1
-            the_set = self.combi_sets[self.current_combi_set]
-            if len(self.combi_sets) == 1:
-                the_set.rate_constant_desc = ''
-            else:
-                the_set.rate_constant_desc = '_{}'.format(self.current_combi_set + 1)
-            return the_set
+            return self.combi_sets[self.current_combi_set]
         except IndexError:
             raise StopIteration
 
+    @property
+    def rate_constant_desc(self) -> str:
+        if len(self.combi_sets) == 1:
+            return ''
+        else:
+            return '_{}'.format(self.current_combi_set + 1)
+
 
 def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  # pylint: disable=too-many-locals
     """Returns a RBM given a rxncon system."""
@@ -806,28 +810,19 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
 
         return list(mol_defs.values())
 
-    def remove_global_states(solutions: List[Dict[State, bool]]) -> List[Dict[State, bool]]:
-        filtered_solutions = []  # type: List[Dict[State, bool]]
-        for soln in solutions:
-            cleaned_solution = {}
-            for state, val in soln.items():
-                if state.is_global:
-                    LOGGER.warning('remove_global_states : REMOVING INPUT STATE {} from contingencies.'
-                                   .format(state))
-                else:
-                    cleaned_solution[state] = val
-
-            if cleaned_solution not in filtered_solutions:
-                filtered_solutions.append(cleaned_solution)
+    def non_global_states(cont_set: VennSet[State]) -> List[State]:
+        """The States the solutions of the contingencies are projected onto: the global States are left out."""
+        states = []  # type: List[State]
+        for state in OrderedDict.fromkeys(cont_set.values):
+            if state.is_global:
+                LOGGER.warning('non_global_states : REMOVING INPUT STATE {} from contingencies.'.format(state))
+            else:
+                states.append(state)
 
-        return filtered_solutions
+        return states
 
     def is_satisfiable(states: Iterable[State]) -> bool:
-        for pair in combinations(states, 2):
-            if pair[0].is_mutually_exclusive_with(pair[1]):
-                return False
-
-        return True
+        return rxncon_sys.state_exclusions.are_consistent(states)
 
     def calc_positive_solutions(rxncon_sys: RxnConSystem, solution: Dict[State, bool]) -> List[List[State]]:
         def complementary_state_combos(state: State) -> List[List[State]]:
@@ -867,8 +862,10 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
         ordered_solution = OrderedDict(sorted(solution.items(), key=lambda x: x[0]))
 
         trues = [state for state, val in ordered_solution.items() if val]
+        exclusions = rxncon_sys.state_exclusions
+        true_ids = sum(1 << exclusions.state_id(state) for state in trues)
         falses = [state for state, val in ordered_solution.items() if not val
-                  and not any(state.is_mutually_exclusive_with(x) for x in trues)]
+                  and not exclusions.exclusion_mask(state) & true_ids]
 
         if not falses:
             return [trues] if is_satisfiable(trues) else []
@@ -889,7 +886,8 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
 
         return solutions
 
-    def calc_rule(reaction: Reaction, cont_soln: List[State], quant_cont: VennSet[State]) -> Rule:
+    def calc_rule(reaction: Reaction, cont_soln: List[State], quant_cont: VennSet[State],
+                  rate_constant_desc: str) -> Rule:
         def calc_complexes(terms: List[ReactionTerm], states: List[State]) -> List[Complex]:
             if not all(x.is_structured for x in states):
                 unstructs = [x for x in states if not x.is_structured]
@@ -904,10 +902,9 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
             builder = ComplexExprBuilder(reaction=reaction)
             struct_index = 0
             for term in terms:
-                struct_states = deepcopy(term.states)
+                struct_states = list(term.states)
                 for spec in term.specs:
-                    struct_spec = copy(spec)
-                    struct_spec.struct_index = struct_index
+                    struct_spec = spec.with_struct_index(struct_index)
                     builder.add_mol(struct_spec, is_reactant=True)
                     struct_states = [state.to_structured_from_spec(struct_spec) for state in struct_states]
                     struct_index += 1
@@ -925,7 +922,7 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
         lhs = calc_complexes(reaction.terms_lhs, cont_soln)
         rhs = calc_complexes(reaction.terms_rhs, cont_soln)
 
-        rate = Parameter('k_{}{}'.format(rxncon_sys.reaction_number(reaction) + 1, quant_cont.rate_constant_desc),
+        rate = Parameter('k_{}{}'.format(rxncon_sys.reaction_number(reaction) + 1, rate_constant_desc),
                          '1.0',
                          description=str(reaction))
 
@@ -969,11 +966,11 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
 
         return observables
 
-    def add_structure_to_negative_interaction_states(states):
+    def add_structure_to_negative_interaction_states(solutions: List[List[State]]) -> List[List[State]]:
         """adding structure index to components connected through complements to empty domains"""
         m = 0
-        unstructured = []
-        for sol in positive_solutions:
+        unstructured = []  # type: List[Spec]
+        for sol in solutions:
             for s in sol:
                 if isinstance(s, InteractionState):
                     if s.first.is_structured:
@@ -987,11 +984,24 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
                         if s.second not in unstructured:
                             unstructured.append(s.second)
 
+        updates = {}  # type: Dict[Spec, Spec]
         for comp in unstructured:
             m += 1
-            comp.struct_index = m
+            updates[comp] = comp.with_struct_index(m)
+
+        if not updates:
+            return solutions
 
-        return (states)
+        structured_solutions = []  # type: List[List[State]]
+        for sol in solutions:
+            structured_sol = []  # type: List[State]
+            for s in sol:
+                if any(spec in updates for spec in s.specs):
+                    s = s.with_updated_specs(updates)
+                structured_sol.append(s)
+            structured_solutions.append(structured_sol)
+
+        return structured_solutions
 
     mol_defs = mol_defs_from_rxncon(rxncon_sys)
     LOGGER.debug(
@@ -1000,48 +1010,60 @@ def rule_based_model_from_rxncon(rxncon_sys: RxnConSystem) -> RuleBasedModel:  #
     rules = []  # type: List[Rule]
 
     for reaction in (x for x in rxncon_sys.reactions if not isinstance(x, OutputReaction)):
-        LOGGER.debug('rule_based_model_from_rxncon : Generating rules for reaction {}'.format(str(reaction)))
-        strict_cont_set = Intersection(*(x.to_venn_set() for x in
-                                         rxncon_sys.s_contingencies_for_reaction(reaction)))  # type: VennSet[State]
-        quant_contingencies = QuantContingencyConfigs(rxncon_sys.q_contingencies_for_reaction(reaction))
-        LOGGER.debug('rule_based_model_from_rxncon : Strict contingencies {}'.format(str(strict_cont_set)))
-
-        found_solution = False
-
-        for quant_contingency_set in quant_contingencies:
-            LOGGER.debug('rule_based_model_from_rxncon : quantitative contingency config: {}'
-                         .format(str(quant_contingency_set)))
-
-            cont_set = Intersection(strict_cont_set, quant_contingency_set)  # type: VennSet[State]
-            LOGGER.debug('rule_based_model_from_rxncon : adding constraints...')
-            cont_set = with_connectivity_constraints(cont_set, rxncon_sys)
-            LOGGER.debug('rule_based_model_from_rxncon {} : calculating solutions...'.format(datetime.now()))
-            solutions = cont_set.calc_solutions()
-            LOGGER.debug('rule_based_model_from_rxncon {} : found {} non-positivized solutions...'
-                         .format(datetime.now(), len(solutions)))
-            solutions = remove_global_states(solutions)
-
-            LOGGER.debug('rule_based_model_from_rxncon : contingency solutions {}'.format(str(solutions)))
-            positive_solutions = []  # type: List[List[State]]
-            for solution in solutions:
-                positive_solutions += calc_positive_solutions(rxncon_sys, solution)
-
-            positive_solutions = add_structure_to_negative_interaction_states(positive_solutions)
-            """added to add structure to binding partners of empty domains"""
-
-            for positive_solution in positive_solutions:
-                found_solution = True
-                LOGGER.debug('rule_based_model_from_rxncon : positivized contingency solution {}'
-                             .format(' & '.join(str(x) for x in positive_solution)))
-                rule = calc_rule(reaction, positive_solution, quant_contingency_set)
-                if not any(rule.is_equivalent_to(existing) for existing in rules):
-                    rules.append(rule)
-
-        if not found_solution:
-            LOGGER.error('rule_based_model_from_rxncon : could not find positive solutions for rxn {}'
-                         .format(str(reaction)))
-
-    return RuleBasedModel(mol_defs, calc_initial_conditions(mol_defs), [], calc_observables(rxncon_sys), rules)
+        with span('rule generation', reaction):
+            LOGGER.debug('rule_based_model_from_rxncon : Generating rules for reaction {}'.format(str(reaction)))
+            strict_contingencies = rxncon_sys.s_contingencies_for_reaction(reaction)
+            strict_cont_set = Intersection(*(x.to_venn_set() for x in strict_contingencies))  # type: VennSet[State]
+            quant_contingencies = QuantContingencyConfigs(rxncon_sys.q_contingencies_for_reaction(reaction))
+            LOGGER.debug('rule_based_model_from_rxncon : Strict contingencies {}'.format(str(strict_cont_set)))
+
+            found_solution = False
+
+            for quant_contingency_set in quant_contingencies:
+                LOGGER.debug('rule_based_model_from_rxncon : quantitative contingency config: {}'
+                             .format(str(quant_contingency_set)))
+
+                cont_set = Intersection(strict_cont_set, quant_contingency_set)  # type: VennSet[State]
+                LOGGER.debug('rule_based_model_from_rxncon : adding constraints...')
+                with span('connectivity constraints'):
+                    cont_set = with_connectivity_constraints(cont_set, rxncon_sys)
+                LOGGER.debug('rule_based_model_from_rxncon {} : calculating solutions...'.format(datetime.now()))
+                # The global States are projected out of the solutions, which are then streamed without duplicates.
+                # Since the solutions are calculated lazily, the spans alternate per solution.
+                with span('contingency solutions'):
+                    solutions = cont_set.iter_solutions(project_onto=non_global_states(cont_set))
+
+                positive_solutions = []  # type: List[List[State]]
+                while True:
+                    with span('contingency solutions'):
+                        solution = next(solutions, None)
+                    if solution is None:
+                        break
+
+                    LOGGER.debug('rule_based_model_from_rxncon : contingency solution {}'.format(str(solution)))
+                    with span('positive solutions'):
+                        positive_solutions += calc_positive_solutions(rxncon_sys, solution)
+
+                positive_solutions = add_structure_to_negative_interaction_states(positive_solutions)
+                """added to add structure to binding partners of empty domains"""
+
+                for positive_solution in positive_solutions:
+                    found_solution = True
+                    LOGGER.debug('rule_based_model_from_rxncon : positivized contingency solution {}'
+                                 .format(' & '.join(str(x) for x in positive_solution)))
+                    rule = calc_rule(reaction, positive_solution, quant_contingency_set,
+                                     quant_contingencies.rate_constant_desc)
+                    if not any(rule.is_equivalent_to(existing) for existing in rules):
+                        rules.append(rule)
+
+            if not found_solution:
+                LOGGER.error('rule_based_model_from_rxncon : could not find positive solutions for rxn {}'
+                             .format(str(reaction)))
+
+    with span('observables'):
+        observables = calc_observables(rxncon_sys)
+
+    return RuleBasedModel(mol_defs, calc_initial_conditions(mol_defs), [], observables, rules)
 
 
 def mol_from_str(mol_str: str) -> Mol:
@@ -1,5 +1,8 @@
+from copy import deepcopy
+
 import rxncon.core.effector as eff
 import rxncon.core.state as sta
+from rxncon.core.spec import spec_from_str
 
 
 def test_effector_states_property() -> None:
@@ -15,3 +18,60 @@ def test_effector_states_property() -> None:
 
     assert all(x in effector.states for x in [state_a1, state_a2, state_b1, state_b2])
     assert all(x in [state_a1, state_a2, state_b1, state_b2] for x in effector.states)
+
+
+def test_struct_equivalences_merge_classes() -> None:
+    equivs = eff.StructEquivalences()
+    equivs.add_equivalence(eff.qual_spec_from_str('A@0'), eff.qual_spec_from_str('<X>.A'))
+    equivs.add_equivalence(eff.qual_spec_from_str('B@1'), eff.qual_spec_from_str('<X>.B'))
+    equivs.add_equivalence(eff.qual_spec_from_str('<X>.<Y>.A_[x]'), eff.qual_spec_from_str('<X>.A_[y]'))
+
+    assert len(equivs.eq_classes) == 2
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<X>.<Y>.A_[z]')) == spec_from_str('A@0_[z]')
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<X>.B')) == spec_from_str('B@1')
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<X>.C')) is None
+
+    # Merging the classes keeps the first Spec in the root namespace.
+    equivs.add_equivalence(eff.qual_spec_from_str('<X>.B'), eff.qual_spec_from_str('<X>.<Y>.A'))
+    assert len(equivs.eq_classes) == 1
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<X>.A')) == spec_from_str('B@1')
+    assert sorted(equivs.indices_in_root_namespace()) == [0, 1]
+
+
+def test_struct_equivalences_keep_the_order_of_classes_and_members() -> None:
+    equivs = eff.StructEquivalences()
+    equivs.add_equivalence(eff.qual_spec_from_str('A@0'), eff.qual_spec_from_str('<X>.A'))
+    equivs.add_equivalence(eff.qual_spec_from_str('B@1'), eff.qual_spec_from_str('<X>.B'))
+    equivs.add_equivalence(eff.qual_spec_from_str('<X>.B'), eff.qual_spec_from_str('<Y>.B'))
+
+    # A new QualSpec joins an existing class in its place.
+    equivs.add_equivalence(eff.qual_spec_from_str('<Z>.A'), eff.qual_spec_from_str('A@0'))
+    assert [[str(x) for x in eq_class] for eq_class in equivs.eq_classes] == \
+        [['A@0', '<X>.A', '<Z>.A'], ['B@1', '<X>.B', '<Y>.B']]
+
+    # The members of the second class follow those of the first one, also if the first one is the smaller one.
+    equivs.add_equivalence(eff.qual_spec_from_str('<Z>.A'), eff.qual_spec_from_str('<Y>.B'))
+    equivs.add_equivalence(eff.qual_spec_from_str('C@2'), eff.qual_spec_from_str('<X>.C'))
+    equivs.add_equivalence(eff.qual_spec_from_str('<X>.C'), eff.qual_spec_from_str('A@0'))
+    assert [[str(x) for x in eq_class] for eq_class in equivs.eq_classes] == \
+        [['C@2', '<X>.C', 'A@0', '<X>.A', '<Z>.A', 'B@1', '<X>.B', '<Y>.B']]
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<Z>.A')) == spec_from_str('C@2')
+
+
+def test_struct_equivalences_merge_with() -> None:
+    inner = eff.StructEquivalences()
+    inner.add_equivalence(eff.qual_spec_from_str('A@2'), eff.qual_spec_from_str('<Y>.A'))
+    inner.add_equivalence(eff.qual_spec_from_str('C@3'), eff.qual_spec_from_str('<Y>.C'))
+
+    equivs = eff.StructEquivalences()
+    equivs.add_equivalence(eff.qual_spec_from_str('A@0'), eff.qual_spec_from_str('<X>.A@2'))
+    equivs.merge_with(inner, ['<X>'])
+
+    assert len(equivs.eq_classes) == 2
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<X>.<Y>.A')) == spec_from_str('A@0')
+    assert equivs.find_unqualified_spec(eff.qual_spec_from_str('<X>.<Y>.C')) is None
+
+    copied = deepcopy(equivs)
+    copied.add_equivalence(eff.qual_spec_from_str('<X>.C@3'), eff.qual_spec_from_str('<X>.A@2'))
+    assert len(copied.eq_classes) == 1
+    assert len(equivs.eq_classes) == 2
@@ -30,15 +30,15 @@ def test_ipi_reaction() -> None:
 def test_output_reaction() -> None:
     rxn = reaction_from_str('[Output]')
 
-    assert rxn.components_rhs == []
-    assert rxn.components_lhs == []
-    assert rxn.degraded_components == []
-    assert rxn.synthesised_components == []
+    assert rxn.components_rhs == ()
+    assert rxn.components_lhs == ()
+    assert rxn.degraded_components == ()
+    assert rxn.synthesised_components == ()
 
-    assert rxn.consumed_states == []
-    assert rxn.produced_states == []
-    assert rxn.synthesised_states == []
-    assert rxn.degraded_states == []
+    assert rxn.consumed_states == ()
+    assert rxn.produced_states == ()
+    assert rxn.synthesised_states == ()
+    assert rxn.degraded_states == ()
 
 
 def test_equality_output_reaction() -> None:
@@ -50,8 +50,8 @@ def test_equality_output_reaction() -> None:
 
 def test_modifier() -> None:
     rxn = reaction_from_str('A_trsl_BmRNA')
-    assert rxn.modifier_components == [spec_from_str('A'), spec_from_str('BmRNA')]
-    assert rxn.modifier_states == []
+    assert rxn.modifier_components == (spec_from_str('A'), spec_from_str('BmRNA'))
+    assert rxn.modifier_states == ()
 
 
 def test_dynamical_reactions() -> None:
@@ -72,10 +72,48 @@ def test_dynamical_reactions() -> None:
     ])
 
     rxn = reaction_from_str('A_agex_A_[(r)]')
-    assert rxn.produced_states == [state_from_str('A_[(r)]-{gtp}')]
-    assert rxn.consumed_states == [state_from_str('A_[(r)]-{0}')]
+    assert rxn.produced_states == (state_from_str('A_[(r)]-{gtp}'),)
+    assert rxn.consumed_states == (state_from_str('A_[(r)]-{0}'),)
 
     initialize_reaction_defs()
 
     with pytest.raises(SyntaxError):
         rxn = reaction_from_str('A_agex_A_[(r)]')
+
+
+def test_memoized_reactions_are_independent() -> None:
+    rxn = reaction_from_str('A_syn_B')
+    same_rxn = reaction_from_str(' A_syn_B ')
+
+    assert rxn == same_rxn
+    assert rxn is not same_rxn
+
+    next(term for term in rxn.terms_rhs if term.specs == [spec_from_str('B')]).states.append(
+        state_from_str('B_[(r)]-{0}'))
+    rxn.invalidate_state_cache()
+    assert state_from_str('B_[(r)]-{0}') in rxn.synthesised_states
+    assert state_from_str('B_[(r)]-{0}') not in same_rxn.synthesised_states
+    assert state_from_str('B_[(r)]-{0}') not in reaction_from_str('A_syn_B').synthesised_states
+
+
+def test_verb_dispatch() -> None:
+    # Verbs are matched case insensitively, component names resembling verbs do not confuse the dispatch.
+    assert str(reaction_from_str('A_PPI+_B')) == 'A_[B]_ppi+_B_[A]'
+    assert str(reaction_from_str('p_p+_ppi_[(r)]')) == 'p_p+_ppi_[(r)]'
+    assert reaction_from_str('A_deg_B').degraded_components == (spec_from_str('B'),)
+
+    with pytest.raises(SyntaxError):
+        reaction_from_str('A_nonsense_B')
+
+
+def test_derived_data_is_cached_until_invalidated() -> None:
+    rxn = reaction_from_str('A_ppi+_B')
+
+    assert rxn.components is rxn.components
+    assert rxn.produced_states is rxn.produced_states
+    assert rxn.components_lhs_set == frozenset(rxn.components_lhs)
+
+    produced_states = rxn.produced_states
+    rxn.invalidate_state_cache()
+    assert rxn.produced_states is not produced_states
+    assert rxn.produced_states == produced_states
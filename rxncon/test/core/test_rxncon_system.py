@@ -1,12 +1,18 @@
+import multiprocessing
 import pytest
 
 from rxncon.input.quick.quick import Quick
+from rxncon.core.contingency import ContingencyType
 from rxncon.core.effector import StateEffector
-from rxncon.core.state import state_from_str
-from rxncon.core.reaction import reaction_from_str
+from rxncon.core.rxncon_system import RxnConSystem
+from rxncon.core.state import state_from_str, initialize_state_modifiers
+from rxncon.core.reaction import reaction_from_str, initialize_reaction_defs
 from collections import namedtuple
 from rxncon.util.utils import elems_eq
+from rxncon.venntastic.sets import EXPR_BACKEND, BDD_BACKEND
 from rxncon.core.spec import spec_from_str
+from rxncon.input.shared.contingency_list import contingency_list_entry_from_strs, \
+    contingencies_from_contingency_list_entries
 
 
 ReactionTestCase = namedtuple('ReactionTestCase', ['synthesised_states', 'produced_states', 'consumed_states'])
@@ -119,3 +125,278 @@ def test_output_reactions() -> None:
     assert len(contingencies) == 1
     assert isinstance(contingencies[0].effector, StateEffector)
     assert [state_from_str('B@2_[(x)]-{p}')] == contingencies[0].effector.states
+
+
+def test_state_indexes() -> None:
+    rxncon_sys = Quick('''A_[x]_ppi+_B_[y]
+                          C_p+_B_[(r)]
+                          D_p-_B_[(r)]
+                          F_syn_B''').rxncon_system
+
+    assert elems_eq(rxncon_sys.states_for_component(spec_from_str('B')),
+                    [state_from_str('A_[x]--B_[y]'), state_from_str('B_[y]--0'),
+                     state_from_str('B_[(r)]-{p}'), state_from_str('B_[(r)]-{0}')])
+    assert rxncon_sys.states_for_component(spec_from_str('F')) == []
+
+    assert rxncon_sys.complement_states_for_component(spec_from_str('B'), state_from_str('B_[(r)]-{p}')) == \
+        [state_from_str('B_[(r)]-{0}')]
+    assert rxncon_sys.complement_states_for_component(spec_from_str('B@1'), state_from_str('B@1_[(r)]-{p}')) == \
+        [state_from_str('B@1_[(r)]-{0}')]
+    assert elems_eq(rxncon_sys.complement_states(state_from_str('A_[x]--B_[y]')),
+                    [state_from_str('A_[x]--0'), state_from_str('B_[y]--0')])
+
+    assert rxncon_sys.producing_reactions(state_from_str('B_[(r)]-{p}')) == [reaction_from_str('C_p+_B_[(r)]')]
+    assert rxncon_sys.consuming_reactions(state_from_str('B@0_[(r)]-{p}')) == [reaction_from_str('D_p-_B_[(r)]')]
+    assert rxncon_sys.synthesising_reactions(state_from_str('B_[(r)]-{0}')) == [reaction_from_str('F_syn_B')]
+    assert rxncon_sys.synthesising_reactions(state_from_str('B_[(r)]-{p}')) == []
+    assert rxncon_sys.degrading_reactions(state_from_str('B_[(r)]-{p}')) == []
+
+
+def test_contingency_index() -> None:
+    rxncon_sys = Quick('''A_ppi_B ; ! A_[(r)]-{p} ; k+ B_[(r)]-{p}
+                          C_p+_A_[(r)]
+                          C_p+_B_[(r)] ; x A--B''').rxncon_system
+
+    a_ppi_b, c_p_a, c_p_b = reaction_from_str('A_ppi+_B'), reaction_from_str('C_p+_A_[(r)]'), \
+        reaction_from_str('C_p+_B_[(r)]')
+
+    assert len(rxncon_sys.contingencies_for_reaction(a_ppi_b)) == 2
+    assert [x.effector.states for x in rxncon_sys.s_contingencies_for_reaction(a_ppi_b)] == \
+        [[state_from_str('A@0_[(r)]-{p}')]]
+    assert [x.effector.states for x in rxncon_sys.q_contingencies_for_reaction(a_ppi_b)] == \
+        [[state_from_str('B@1_[(r)]-{p}')]]
+    assert rxncon_sys.contingencies_for_reaction(c_p_a) == []
+    assert len(rxncon_sys.s_contingencies_for_reaction(c_p_b)) == 1
+
+    assert [rxncon_sys.reaction_number(x) for x in rxncon_sys.reactions] == list(range(len(rxncon_sys.reactions)))
+
+    with pytest.raises(ValueError):
+        rxncon_sys.reaction_number(reaction_from_str('D_p+_A_[(r)]'))
+
+
+def test_unsatisfiable_contingency_reasons() -> None:
+    with pytest.raises(AssertionError) as excinfo:
+        Quick('''A_ppi_B ; ! B_[(r1)]-{p} ; ! B_[(r1)]-{0}
+              C_p+_B_[(r1)]''').rxncon_system
+    assert 'mutually exclusive' in str(excinfo.value)
+
+    with pytest.raises(AssertionError) as excinfo:
+        Quick('''A_ppi_B ; ! B_[(r1)]-{p} ; x B_[(r1)]-{p}
+              C_p+_B_[(r1)]''').rxncon_system
+    assert 'Zero consistent solutions found.' in str(excinfo.value)
+
+    # Mutually exclusive states in one branch of an OR are fine as long as another branch is consistent.
+    Quick('''A_ppi_B ; ! <X>
+          <X> ; OR <Y>
+          <X> ; OR B_[(r2)]-{p}
+          <Y> ; AND B_[(r1)]-{p}
+          <Y> ; AND B_[(r1)]-{0}
+          C_p+_B_[(r1)]
+          C_p+_B_[(r2)]''').rxncon_system
+
+
+def test_parallel_validation() -> None:
+    rxncon_str = '''A_ppi_B ; ! B_[(r1)]-{p} ; ! B_[(r1)]-{0}
+                    C_p+_B_[(r1)]
+                    D_p+_B_[(r2)] ; ! B_[(r2)]-{p}
+                    E_ppi_B ; ! B_[(r2)]-{p} ; x B_[(r2)]-{p}'''
+
+    reasons = []
+    for workers in (1, 3):
+        with pytest.raises(AssertionError) as excinfo:
+            Quick(rxncon_str, validation_workers=workers)
+        reasons.append(str(excinfo.value))
+
+    assert reasons[0] == reasons[1]
+    assert reasons[0].index('A_[B]_ppi+_B_[A]') < reasons[0].index('D_p+_B_[(r2)]') < \
+        reasons[0].index('E_[B]_ppi+_B_[E]')
+
+    rxncon_sys = Quick('''A_ppi_B ; ! B_[(r1)]-{p}
+                          C_p+_B_[(r1)]''', validation_workers=2).rxncon_system
+    rxncon_sys.validate(workers=1)
+
+
+def test_parallel_validation_in_spawned_workers() -> None:
+    # Spawned worker processes import rxncon afresh, they are initialized with the custom StateModifiers and
+    # ReactionDefs of the parent process.
+    initialize_state_modifiers({'foo': 'foo'})
+    initialize_reaction_defs([{
+        '!UID:Reaction': 'fooylation',
+        '!UID:ReactionKey': 'foo+',
+        '!BidirectionalVerb': 'no',
+        '!MolTypeX': 'Protein',
+        '!ResolutionX': 'component',
+        '!MolTypeY': 'Protein',
+        '!ResolutionY': 'residue',
+        '!SkeletonRule': '$x%# + $y%#$y%-{0} -> $x%# + $y%#$y%-{foo}'
+    }])
+
+    try:
+        reactions = [reaction_from_str(x) for x in ('A_ppi+_B', 'C_foo+_B_[(s)]', 'D_ppi+_B')]
+        contingencies = contingencies_from_contingency_list_entries([
+            contingency_list_entry_from_strs('A_ppi+_B', '!', 'B_[(s)]-{foo}'),
+            contingency_list_entry_from_strs('A_ppi+_B', 'x', 'B_[(s)]-{foo}'),
+            contingency_list_entry_from_strs('D_ppi+_B', '!', 'B_[(s)]-{foo}')
+        ])
+
+        with pytest.raises(AssertionError) as excinfo:
+            RxnConSystem(reactions, contingencies, validation_workers=2,
+                         validation_mp_context=multiprocessing.get_context('spawn'))
+        assert str(excinfo.value) == 'Unsatisfiable reaction contingencies:\n' \
+                                     'A_[B]_ppi+_B_[A] : Zero consistent solutions found.'
+
+        RxnConSystem(reactions, [x for x in contingencies if x.contingency_type == ContingencyType.requirement],
+                     validation_workers=2, validation_mp_context=multiprocessing.get_context('spawn'))
+    finally:
+        initialize_state_modifiers()
+        initialize_reaction_defs()
+
+
+def test_bdd_validation_backend() -> None:
+    rxncon_str = '''A_ppi_B ; ! B_[(r1)]-{p} ; ! B_[(r1)]-{0}
+                    C_p+_B_[(r1)]
+                    D_p+_B_[(r2)] ; ! B_[(r2)]-{p}
+                    E_ppi_B ; ! B_[(r2)]-{p} ; x B_[(r2)]-{p}'''
+
+    reasons = []
+    for backend in (EXPR_BACKEND, BDD_BACKEND):
+        with pytest.raises(AssertionError) as excinfo:
+            Quick(rxncon_str, validation_backend=backend)
+        reasons.append(str(excinfo.value))
+
+    assert reasons[0] == reasons[1]
+
+    rxncon_sys = Quick('''A_ppi_B ; ! <X>
+                          <X> ; OR <Y>
+                          <X> ; OR B_[(r2)]-{p}
+                          <Y> ; AND B_[(r1)]-{p}
+                          <Y> ; AND B_[(r1)]-{0}
+                          C_p+_B_[(r1)]
+                          C_p+_B_[(r2)]''', validation_backend=BDD_BACKEND).rxncon_system
+
+    # The contingencies of all reactions share the variable order of the system.
+    order = rxncon_sys.bdd_variable_order
+    assert len(order) > 0
+    venn_set = rxncon_sys.s_contingencies_for_reaction(reaction_from_str('A_ppi+_B'))[0].to_venn_set()
+    assert venn_set.to_bdd(order) is venn_set.to_bdd(order)
+    assert venn_set.count_solutions(order) == 5
+
+
+def test_subset_states() -> None:
+    rxncon_sys = Quick('''A_[x]_ppi+_B_[y]
+                          A_[z]_ppi+_B_[y]
+                          A_[x]_ppi+_C_[w]
+                          A_[d]_ppi+_C_[w]
+                          D_p+_A_[(r1)]
+                          D_p+_A_[d/s(r2)]
+                          D_ub+_A_[(r1)]
+                          A_[z]_ipi+_A_[v]''').rxncon_system
+
+    for state_str in ('A--B', 'A--C', 'A_[x]--0', 'A--0', 'A-{p}', 'A_[d]-{p}', 'A_[d/s]-{p}', 'A-{ub}', 'B--A_[z]',
+                      'A_[x]--B_[y]', 'A@3--C', 'E--A', 'A_[z]--[v]'):
+        state = state_from_str(state_str)
+        assert rxncon_sys.subset_states(state) == [x for x in rxncon_sys.states if x.is_subset_of(state)]
+
+    assert elems_eq(rxncon_sys.subset_states(state_from_str('A--B')),
+                    [state_from_str('A_[x]--B_[y]'), state_from_str('A_[z]--B_[y]')])
+    assert rxncon_sys.subset_states(state_from_str('A_[d]-{p}')) == [state_from_str('A_[d/s(r2)]-{p}')]
+
+
+def test_incremental_update() -> None:
+    def assert_same_system(updated_sys, rxncon_str: str) -> None:
+        fresh_sys = Quick(rxncon_str).rxncon_system
+        assert elems_eq(updated_sys.reactions, fresh_sys.reactions)
+        assert elems_eq(updated_sys.states, fresh_sys.states)
+        for reaction in fresh_sys.reactions:
+            assert elems_eq([frozenset(x.effector.states) for x in updated_sys.contingencies_for_reaction(reaction)],
+                            [frozenset(x.effector.states) for x in fresh_sys.contingencies_for_reaction(reaction)])
+
+    rxncon_str = '''A_ppi_B ; ! B-{p}
+                    C_p+_B_[(r1)]
+                    E_syn_B'''
+    rxncon_sys = Quick(rxncon_str).rxncon_system
+
+    # The new state changes the expansion of B-{p} and the states synthesised by E_syn_B.
+    assert rxncon_sys.add_reaction(reaction_from_str('D_p+_B_[(r2)]')) == \
+        [reaction_from_str('A_ppi+_B'), reaction_from_str('E_syn_B'), reaction_from_str('D_p+_B_[(r2)]')]
+    assert_same_system(rxncon_sys, rxncon_str + '\nD_p+_B_[(r2)]')
+
+    assert rxncon_sys.remove_reaction(reaction_from_str('D_p+_B_[(r2)]')) == \
+        [reaction_from_str('A_ppi+_B'), reaction_from_str('E_syn_B')]
+    assert_same_system(rxncon_sys, rxncon_str)
+
+    contingency = contingencies_from_contingency_list_entries(
+        [contingency_list_entry_from_strs('C_p+_B_[(r1)]', '!', 'A--B')])[0]
+    assert rxncon_sys.add_contingency(contingency) == [reaction_from_str('C_p+_B_[(r1)]')]
+    assert_same_system(rxncon_sys, rxncon_str.replace('C_p+_B_[(r1)]', 'C_p+_B_[(r1)] ; ! A--B'))
+
+    # Removing the only reaction producing B-{p} breaks A_ppi_B: the update is rolled back.
+    contingencies = rxncon_sys.contingencies
+    with pytest.raises(AssertionError):
+        rxncon_sys.remove_reaction(reaction_from_str('C_p+_B_[(r1)]'))
+    assert rxncon_sys.contingencies == contingencies
+    assert_same_system(rxncon_sys, rxncon_str.replace('C_p+_B_[(r1)]', 'C_p+_B_[(r1)] ; ! A--B'))
+
+    assert rxncon_sys.remove_contingency(contingency) == [reaction_from_str('C_p+_B_[(r1)]')]
+    assert_same_system(rxncon_sys, rxncon_str)
+
+    with pytest.raises(ValueError):
+        rxncon_sys.add_reaction(reaction_from_str('C_p+_B_[(r1)]'))
+    with pytest.raises(ValueError):
+        rxncon_sys.remove_reaction(reaction_from_str('D_p+_B_[(r2)]'))
+
+
+def test_incremental_update_is_local() -> None:
+    rxncon_str = '''A_ppi_B ; ! B-{p}
+                    C_p+_B_[(r1)]
+                    E_syn_B
+                    F_ppi_G ; ! G-{p}
+                    H_p+_G_[(r1)]'''
+    rxncon_sys = Quick(rxncon_str).rxncon_system
+    contingencies = {reaction: rxncon_sys.contingencies_for_reaction(reaction) for reaction in rxncon_sys.reactions}
+    states_for_b = rxncon_sys.states_for_component(spec_from_str('B'))
+
+    def is_restructured(reaction_str: str) -> bool:
+        reaction = reaction_from_str(reaction_str)
+        return any(x is not y for x, y in zip(rxncon_sys.contingencies_for_reaction(reaction),
+                                              contingencies[reaction]))
+
+    # An unrelated reaction does not restructure the contingencies of the other reactions, nor reindex their states.
+    assert rxncon_sys.add_reaction(reaction_from_str('X_ppi+_Y')) == [reaction_from_str('X_ppi+_Y')]
+    assert not any(is_restructured(str(reaction)) for reaction in contingencies)
+    assert rxncon_sys.states_for_component(spec_from_str('B')) is states_for_b
+
+    # A new state on G only changes the expansion of G-{p}.
+    assert rxncon_sys.add_reaction(reaction_from_str('I_p+_G_[(r2)]')) == \
+        [reaction_from_str('F_ppi+_G'), reaction_from_str('I_p+_G_[(r2)]')]
+    assert is_restructured('F_ppi+_G')
+    assert not is_restructured('A_ppi+_B')
+    assert rxncon_sys.states_for_component(spec_from_str('B')) is states_for_b
+
+    fresh_sys = Quick(rxncon_str + '\nX_ppi+_Y\nI_p+_G_[(r2)]').rxncon_system
+    assert elems_eq(rxncon_sys.states, fresh_sys.states)
+    for component in fresh_sys.components():
+        assert elems_eq(rxncon_sys.states_for_component(component), fresh_sys.states_for_component(component))
+    assert elems_eq(rxncon_sys.subset_states(state_from_str('G-{p}')),
+                    [state_from_str('G_[(r1)]-{p}'), state_from_str('G_[(r2)]-{p}')])
+
+
+def test_structured_boolean_contingencies_are_shared() -> None:
+    rxncon_sys = Quick('''A_p+_B_[(r1)]; ! <bool>
+                          A_p+_B_[(r2)]; ! <bool>
+                          A_p+_C_[(r)]; ! <bool>
+                          <bool>; OR A_[b]--B_[a]; OR A_[(x)]-{p}
+                          A_[b]_ppi+_B_[a]
+                          D_p+_A_[(x)]''').rxncon_system
+
+    effectors = [rxncon_sys.contingencies_for_reaction(reaction_from_str(x))[0].effector
+                 for x in ['A_p+_B_[(r1)]', 'A_p+_B_[(r2)]', 'A_p+_C_[(r)]']]
+
+    # The reactions with the same reactants share the structured effector, and its Venn set.
+    assert effectors[0] is effectors[1]
+    assert effectors[0] is not effectors[2]
+    assert elems_eq(effectors[2].states, [state_from_str('A@0_[(x)]-{p}'), state_from_str('A@0_[b]--B@2_[a]')])
+
+    venn_sets = [x.to_venn_set() for rxn in ['A_p+_B_[(r1)]', 'A_p+_B_[(r2)]']
+                 for x in rxncon_sys.contingencies_for_reaction(reaction_from_str(rxn))]
+    assert venn_sets[0] is venn_sets[1]
@@ -1,7 +1,8 @@
 import pytest
 from collections import namedtuple
 
-from rxncon.core.spec import Locus, GeneSpec, MRNASpec, ProteinSpec, locus_from_str, LocusResolution, spec_from_str
+from rxncon.core.spec import Locus, GeneSpec, MRNASpec, ProteinSpec, locus_from_str, LocusResolution, spec_from_str, \
+    _spec_from_str_by_regex, _locus_from_str_by_regex
 
 
 def test_loci() -> None:
@@ -79,3 +80,46 @@ def test_colons_dashes() -> None:
     assert spec_from_str('A_[d-bla]').locus.domain == 'd-bla'
     assert spec_from_str('A_[(r:bla)]').locus.residue == 'r:bla'
     assert spec_from_str('A_[(r-bla)]').locus.residue == 'r-bla'
+
+
+def test_interning() -> None:
+    spec = spec_from_str('A@5_[d/s(r)]')
+
+    assert spec is spec_from_str('A@5_[d/s(r)]')
+    assert spec.locus is locus_from_str('d/s(r)')
+    assert spec.to_non_struct_spec() is spec_from_str('A_[d/s(r)]')
+    assert spec.to_component_spec() is spec_from_str('A@5')
+    assert spec.to_non_struct_spec().with_struct_index(5) is spec
+    assert spec_from_str('AGene') is not spec_from_str('A')
+
+
+def test_immutability() -> None:
+    spec = spec_from_str('A_[d]')
+
+    with pytest.raises(AttributeError):
+        spec.struct_index = 3
+
+    with pytest.raises(AttributeError):
+        spec.locus.domain = 'e'
+
+    assert spec.clone() is spec
+    assert spec.with_domain('e') == spec_from_str('A_[e]')
+    assert spec == spec_from_str('A_[d]')
+
+
+def test_scanner_agrees_with_regexes() -> None:
+    spec_strs = ['A', 'A@0', 'A_[d]', 'A@12_[d/s(r)]', 'BmRNA_[d(r)]', 'CGene', 'A_[(r)]', 'A_d', 'A_[d/s(r)',
+                 'A_[d:1-2]', 'A-B', 'A@1_[[d]]']
+    for spec_str in spec_strs:
+        assert spec_from_str(spec_str) is _spec_from_str_by_regex(spec_str)
+        assert spec_from_str(spec_str) is spec_from_str(spec_str)
+
+    for locus_str in ['d', 'd/s', 'd/s(r)', 'd(r)', '(r)', '[d/s(r)]']:
+        assert locus_from_str(locus_str) is _locus_from_str_by_regex(locus_str)
+
+    for spec_str in ['0', 'Amrna', 'A_[d]_[e]', 'A_[]', 'A@1@2']:
+        with pytest.raises(Exception) as scanned:
+            spec_from_str(spec_str)
+        with pytest.raises(Exception) as matched:
+            _spec_from_str_by_regex(spec_str)
+        assert scanned.type == matched.type and str(scanned.value) == str(matched.value)
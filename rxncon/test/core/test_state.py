@@ -1,5 +1,7 @@
-from rxncon.core.state import state_from_str, FullyNeutralState, GlobalState, EmptyBindingState, initialize_state_modifiers
+from rxncon.core.state import state_from_str, FullyNeutralState, GlobalState, EmptyBindingState, initialize_state_modifiers, \
+    StateExclusions, _state_from_str_by_regex
 from rxncon.core.spec import spec_from_str
+from rxncon.core.reaction import reaction_from_str
 from rxncon.util.utils import elems_eq
 import pytest
 
@@ -173,7 +175,7 @@ def test_ipi_props() -> None:
     # Elemental state, bond.
     state = state_from_str('A_[m]--[n]')
     assert state.is_elemental
-    assert state.components == [spec_from_str('A')]
+    assert state.components == (spec_from_str('A'),)
     assert not state.is_neutral
     assert elems_eq(state.neutral_states, [state_from_str('A_[m]--0'), state_from_str('A_[n]--0')])
 
@@ -187,7 +189,7 @@ def test_ipi_parsing() -> None:
 
     with pytest.raises(AssertionError):
         state = state_from_str('A@1_[x]--[y]')
-        state.update_specs({
+        state.with_updated_specs({
             spec_from_str('A@1_[x]'): spec_from_str('A@5_[x]'),
         })
 
@@ -223,9 +225,9 @@ def test_ipi_is_homodimer() -> None:
 
 def test_ipi_update_spec() -> None:
     state = state_from_str('A_[x]--[y]')
-    state.update_specs({spec_from_str('A_[x]'): spec_from_str('A_[z]')})
+    state = state.with_updated_specs({spec_from_str('A_[x]'): spec_from_str('A_[z]')})
     assert state == state_from_str('A_[y]--[z]')
-    state.update_specs({spec_from_str('A_[y]'): spec_from_str('A_[z]')})
+    state = state.with_updated_specs({spec_from_str('A_[y]'): spec_from_str('A_[z]')})
     assert state == state_from_str('A_[z]--[z]')
 
 
@@ -344,10 +346,10 @@ def test_homodimer_to_structured_from_state_non_overlapping() -> None:
         state_from_str('B_[z]--B_[w]').to_structured_from_state(state_from_str('A@0_[x]--A@1_[y]'))
 
 
-def test_homodimer_update_specs() -> None:
+def test_homodimer_with_updated_specs() -> None:
     structured_homodimer = state_from_str('A@0_[x]--A@1_[y]')
 
-    structured_homodimer.update_specs({
+    structured_homodimer = structured_homodimer.with_updated_specs({
         spec_from_str('A@0_[x]'): spec_from_str('A@5_[x]'),
         spec_from_str('A@1_[y]'): spec_from_str('A@7_[y]')
     })
@@ -355,10 +357,10 @@ def test_homodimer_update_specs() -> None:
     assert structured_homodimer == state_from_str('A@5_[x]--A@7_[y]')
 
 
-def test_homodimer_update_specs_flip() -> None:
+def test_homodimer_with_updated_specs_flip() -> None:
     structured_homodimer = state_from_str('A@0_[x]--A@1_[y]')
 
-    structured_homodimer.update_specs({
+    structured_homodimer = structured_homodimer.with_updated_specs({
         spec_from_str('A@0_[x]'): spec_from_str('A@1_[x]'),
         spec_from_str('A@1_[y]'): spec_from_str('A@0_[y]')
     })
@@ -404,7 +406,7 @@ def test_global_state_properties() -> None:
     ])
     assert not state.is_homodimer
     assert state.is_structured
-    assert state.neutral_states == []
+    assert state.neutral_states == ()
 
 
 def test_global_ordering() -> None:
@@ -431,3 +433,86 @@ def test_dynamical_modification_state() -> None:
 
     with pytest.raises(ValueError):
         state_from_str('A_[(r)]-{bla}')
+
+
+def test_parsed_states_follow_modifiers() -> None:
+    state = state_from_str('A_[(r)]-{p}')
+    reaction = reaction_from_str('B_p+_A_[(r)]')
+
+    initialize_state_modifiers({'bla': 'bla'})
+    assert state_from_str('A_[(r)]-{p}') is not state
+    assert state_from_str('A_[(r)]-{p}') in reaction_from_str('B_p+_A_[(r)]').produced_states
+
+    initialize_state_modifiers()
+    assert state_from_str('A_[(r)]-{p}') in reaction_from_str('B_p+_A_[(r)]').produced_states
+    assert reaction.produced_states != reaction_from_str('B_p+_A_[(r)]').produced_states
+
+
+###              ###
+#   Immutability   #
+###              ###
+def test_immutability() -> None:
+    state = state_from_str('A_[x]--B_[y]')
+
+    with pytest.raises(AttributeError):
+        state.first = spec_from_str('C_[z]')
+
+    assert state.clone() is state
+    assert hash(state) == hash(state_from_str('B_[y]--A_[x]'))
+    assert state.to_non_structured() is state.to_non_structured()
+    assert state.neutral_states is state.neutral_states
+
+
+def test_with_updated_specs_leaves_original() -> None:
+    state = state_from_str('A@0_[(r)]-{p}')
+    updated = state.with_updated_specs({spec_from_str('A@0_[(r)]'): spec_from_str('A@3_[(r)]')})
+
+    assert updated == state_from_str('A@3_[(r)]-{p}')
+    assert state == state_from_str('A@0_[(r)]-{p}')
+
+
+def test_state_exclusions() -> None:
+    states = [state_from_str(x) for x in ('A_[x]--B_[y]', 'A_[x]--0', 'B_[y]--0', 'A_[(r)]-{p}', 'A_[(r)]-{0}',
+                                          'A_[x]--C_[z]', '[in]')]
+    exclusions = StateExclusions(states)
+
+    assert [exclusions.state_id(state) for state in states] == list(range(len(states)))
+    assert exclusions.state(3) == state_from_str('A_[(r)]-{p}')
+
+    for state in states:
+        for other in states:
+            assert exclusions.is_mutually_exclusive(state, other) == \
+                (state.is_mutually_exclusive_with(other) or other.is_mutually_exclusive_with(state))
+
+    assert exclusions.are_consistent([state_from_str('A_[x]--B_[y]'), state_from_str('A_[(r)]-{p}'),
+                                      state_from_str('[in]')])
+    assert not exclusions.are_consistent([state_from_str('A_[x]--B_[y]'), state_from_str('A_[(r)]-{p}'),
+                                          state_from_str('A_[x]--C_[z]')])
+
+    assert exclusions.exclusive_pairs([state_from_str('A_[(r)]-{0}'), state_from_str('A_[(r)]-{p}'),
+                                       state_from_str('B_[y]--0')]) == \
+        [(state_from_str('A_[(r)]-{0}'), state_from_str('A_[(r)]-{p}'))]
+
+    # Structured States get their own ids, the structure indices determine the exclusivity.
+    assert exclusions.is_mutually_exclusive(state_from_str('A@0_[(r)]-{p}'), state_from_str('A@0_[(r)]-{0}'))
+    assert not exclusions.is_mutually_exclusive(state_from_str('A@0_[(r)]-{p}'), state_from_str('A@2_[(r)]-{0}'))
+    assert len(exclusions) == len(states) + 3
+
+
+###          ###
+#   Parsing    #
+###          ###
+def test_scanner_agrees_with_regexes() -> None:
+    state_strs = ['0', '[Turgor]', 'A--B', 'A_[b]--B_[a]', 'A@0_[b]--B@1_[a]', 'A_[b]--0', 'A_[b]--[c]',
+                  'A_[(r)]-{p}', 'BmRNA_[(r)]-{ub}', 'AGene--BmRNA', ' A--B ', 'A_[d]--B_[x_y]', 'a--B']
+    for state_str in state_strs:
+        assert state_from_str(state_str) == _state_from_str_by_regex(state_str)
+        assert state_from_str(state_str) is state_from_str(state_str)
+
+    for state_str in ['', 'A--B--C', 'A_[b:c]--B', 'A-{p', 'A-{bla}', 'A_[b]_[c]--B', '[a b]', 'A--[]',
+                      'A_[d/s(r)]--B']:
+        with pytest.raises(Exception) as scanned:
+            state_from_str(state_str)
+        with pytest.raises(Exception) as matched:
+            _state_from_str_by_regex(state_str)
+        assert scanned.type == matched.type and str(scanned.value) == str(matched.value)
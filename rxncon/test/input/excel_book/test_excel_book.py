@@ -56,8 +56,8 @@ def test_additional_reactions() -> None:
     rxncon_system = ExcelBook(ADDITIONAL_REACTIONS_XLS).rxncon_system
     rxn = reaction_from_str('A_smurf+_B_[(r)]')
 
-    assert rxn.produced_states == [state_from_str('B_[(r)]-{smurf}')]
-    assert rxn.consumed_states == [state_from_str('B_[(r)]-{0}')]
+    assert rxn.produced_states == (state_from_str('B_[(r)]-{smurf}'),)
+    assert rxn.consumed_states == (state_from_str('B_[(r)]-{0}'),)
 
     initialize_reaction_defs()
 
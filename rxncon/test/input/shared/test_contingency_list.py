@@ -1,3 +1,4 @@
+from copy import deepcopy
 import pytest
 from rxncon.input.shared.contingency_list import contingency_list_entry_from_strs as cle_from_str, contingencies_from_contingency_list_entries
 from rxncon.venntastic.sets import venn_from_str, Set as VennSet, ValueSet, Intersection, Union, Complement
@@ -188,3 +189,58 @@ def test_unary_or_contingency() -> None:
     ]
 
     assert isinstance(contingencies_from_contingency_list_entries(cles)[0].effector, StateEffector)
+
+
+def test_structuring_shares_reaction_and_unchanged_effectors() -> None:
+    cles = [
+        cle_from_str('A_p+_B_[(r)]', '!', '<bool>#A@0=A@0#B@1=<bool2>.B@1'),
+        cle_from_str('<bool>', 'AND', 'A@0_[(x)]-{p}'),
+        cle_from_str('<bool>', 'AND', '<bool2>'),
+        cle_from_str('<bool2>', 'OR', 'B@1_[(y)]-{p}'),
+        cle_from_str('<bool2>', 'OR', 'B@1_[(z)]-{p}'),
+    ]
+
+    contingency = contingencies_from_contingency_list_entries(cles)[0]
+    structured = contingency.to_structured()
+
+    # The root carries equivalences and is rebuilt, but its subtrees are not changed by structuring.
+    assert structured.effector == contingency.effector
+    assert isinstance(structured.effector, AndEffector) and isinstance(contingency.effector, AndEffector)
+    assert all(x is y for x, y in zip(structured.effector.exprs, contingency.effector.exprs))
+    assert structured.reaction is contingency.reaction
+    assert deepcopy(structured).effector is structured.effector
+
+
+def test_boolean_contingencies_are_shared() -> None:
+    cles = [
+        cle_from_str('A_p+_B_[(r)]', '!', '<bool>'),
+        cle_from_str('A_p+_C_[(r)]', '!', '<bool>'),
+        cle_from_str('A_p+_D_[(r)]', 'x', '<bool>#A@0=<bool>.A@0'),
+        cle_from_str('<bool>', 'AND', 'A_[(x)]-{p}'),
+        cle_from_str('<bool>', 'AND', '<bool2>'),
+        cle_from_str('<bool2>', 'OR', 'A_[(y)]-{p}'),
+        cle_from_str('<bool2>', 'OR', 'A_[(z)]-{p}'),
+    ]
+
+    effectors = {str(x.reaction): x.effector for x in contingencies_from_contingency_list_entries(cles)}
+
+    # References without equivalences share the node, a reference carrying equivalences shares its members.
+    assert effectors['A_p+_B_[(r)]'] is effectors['A_p+_C_[(r)]']
+    assert effectors['A_p+_D_[(r)]'] is not effectors['A_p+_B_[(r)]']
+    assert effectors['A_p+_D_[(r)]'] == effectors['A_p+_B_[(r)]']
+    with_equivs, without_equivs = effectors['A_p+_D_[(r)]'], effectors['A_p+_B_[(r)]']
+    assert isinstance(with_equivs, AndEffector) and isinstance(without_equivs, AndEffector)
+    assert all(x is y for x, y in zip(with_equivs.exprs, without_equivs.exprs))
+
+
+def test_cyclic_boolean_contingencies_raise() -> None:
+    cles = [
+        cle_from_str('A_p+_B_[(r)]', '!', '<bool>'),
+        cle_from_str('<bool>', 'AND', 'A_[(x)]-{p}'),
+        cle_from_str('<bool>', 'AND', '<bool2>'),
+        cle_from_str('<bool2>', 'OR', 'A_[(y)]-{p}'),
+        cle_from_str('<bool2>', 'OR', '<bool>'),
+    ]
+
+    with pytest.raises(AssertionError):
+        contingencies_from_contingency_list_entries(cles)
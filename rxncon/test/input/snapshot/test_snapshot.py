@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import pytest
+
+from rxncon.input.excel_book.excel_book import ExcelBook
+from rxncon.input.snapshot import snapshot
+from rxncon.input.snapshot.snapshot import read_snapshot, write_snapshot, rxncon_system_from_excel, snapshot_filename
+from rxncon.core.reaction import reaction_from_str, initialize_reaction_defs
+from rxncon.core.state import state_from_str, initialize_state_modifiers
+
+
+EXCEL_DIR                = os.path.join(os.path.dirname(__file__), '..', 'excel_book')
+ADDITIONAL_MODIFIERS_XLS = os.path.join(EXCEL_DIR, 'additional_modifiers.xls')
+ADDITIONAL_REACTIONS_XLS = os.path.join(EXCEL_DIR, 'additional_rxns.xls')
+
+
+def test_snapshot_round_trip(tmpdir) -> None:
+    filename = str(tmpdir.join('system.snapshot'))
+
+    excel_book = ExcelBook(ADDITIONAL_MODIFIERS_XLS)
+    write_snapshot(filename, excel_book.rxncon_system, excel_book.state_modifiers, excel_book.reaction_defs)
+    initialize_state_modifiers()
+
+    rxncon_system = read_snapshot(filename)
+    assert str(state_from_str('A_[(x)]-{bladiebla}')) == 'A_[(x)]-{bladiebla}'
+    assert rxncon_system.reactions == excel_book.rxncon_system.reactions
+    # The States carry the StateModifiers initialized by the snapshot, so they are compared by name.
+    assert [str(x) for x in rxncon_system.states] == [str(x) for x in excel_book.rxncon_system.states]
+    assert [str(x) for x in rxncon_system.contingencies] == [str(x) for x in excel_book.rxncon_system.contingencies]
+
+    initialize_state_modifiers()
+
+
+def test_cached_excel_book(tmpdir, monkeypatch) -> None:
+    cache_dir = str(tmpdir)
+    expected = ExcelBook(ADDITIONAL_REACTIONS_XLS).rxncon_system
+    initialize_reaction_defs()
+
+    assert rxncon_system_from_excel(ADDITIONAL_REACTIONS_XLS, cache_dir=cache_dir).reactions == expected.reactions
+    assert os.listdir(cache_dir) == [os.path.basename(snapshot_filename(ADDITIONAL_REACTIONS_XLS, cache_dir))]
+    initialize_reaction_defs()
+
+    # A warm run reads the snapshot, including the additional ReactionDefs, without opening the Excel file.
+    def fail(*args, **kwargs):
+        raise AssertionError('ExcelBook should not be read')
+
+    with monkeypatch.context() as m:
+        m.setattr(snapshot, '_read_excel_book', fail)
+        assert rxncon_system_from_excel(ADDITIONAL_REACTIONS_XLS, cache_dir=cache_dir).reactions == expected.reactions
+        assert reaction_from_str('A_smurf+_B_[(r)]').produced_states == (state_from_str('B_[(r)]-{smurf}'),)
+
+    # Unreadable snapshots are rebuilt.
+    with open(snapshot_filename(ADDITIONAL_REACTIONS_XLS, cache_dir), 'wb') as f:
+        f.write(b'garbage')
+    assert rxncon_system_from_excel(ADDITIONAL_REACTIONS_XLS, cache_dir=cache_dir).reactions == expected.reactions
+    assert read_snapshot(snapshot_filename(ADDITIONAL_REACTIONS_XLS, cache_dir)).reactions == expected.reactions
+
+    initialize_reaction_defs()
+    with pytest.raises(SyntaxError):
+        reaction_from_str('A_smurf+_B_[(r)]')
+
+
+def test_reading_snapshots_does_not_import_heavy_dependencies() -> None:
+    # pyeda, xlrd and multiprocessing are only imported once they are needed, not by reading a snapshot.
+    script = 'import sys, rxncon.input.snapshot.snapshot; ' \
+             'print(sorted({m.split(".")[0] for m in sys.modules} & {"pyeda", "xlrd", "multiprocessing"}))'
+    heavy_modules = subprocess.check_output(
+        [sys.executable, '-c', script],
+        cwd=os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'), universal_newlines=True)
+    assert heavy_modules.strip() == '[]'
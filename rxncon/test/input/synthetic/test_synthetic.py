@@ -0,0 +1,65 @@
+import pytest
+
+from rxncon.core.contingency import ContingencyType
+from rxncon.input.synthetic.synthetic import synthetic_quick_str, synthetic_rxncon_system
+from rxncon.simulation.boolean.boolean_model import boolean_model_from_rxncon
+from rxncon.simulation.rule_based.rule_based_model import rule_based_model_from_rxncon
+
+
+def test_same_seed_gives_same_system() -> None:
+    assert synthetic_quick_str(8, seed=3) == synthetic_quick_str(8, seed=3)
+    assert synthetic_quick_str(8, seed=3) != synthetic_quick_str(8, seed=4)
+
+
+def test_counts() -> None:
+    rxncon_system = synthetic_rxncon_system(10, reactions=15, reaction_mix={'p+': 1.0}, contingency_density=2)
+
+    assert len(rxncon_system.reactions) == 15
+    assert all(reaction.reaction_def.verb == 'p+' for reaction in rxncon_system.reactions)
+    assert {str(component) for component in rxncon_system.components()} <= {'C{}'.format(i) for i in range(10)}
+    # Every reaction gets two contingencies, as long as there are enough states to draw them from.
+    assert 0 < len(rxncon_system.contingencies) <= 2 * 15
+
+
+def test_reaction_mix() -> None:
+    rxncon_system = synthetic_rxncon_system(6, reaction_mix={'ppi': 0.5, 'syn': 0.5}, contingency_density=0)
+
+    assert {reaction.reaction_def.verb for reaction in rxncon_system.reactions} == {'ppi+', 'ppi-', 'syn'}
+    assert not rxncon_system.contingencies
+
+
+def test_nesting_depth() -> None:
+    quick_str = synthetic_quick_str(8, contingency_density=1, nesting_depth=2, seed=1)
+
+    assert '; AND ' in quick_str and '; OR ' in quick_str
+    rxncon_system = synthetic_rxncon_system(8, contingency_density=1, nesting_depth=2, seed=1)
+    assert all(contingency.contingency_type == ContingencyType.requirement for contingency in rxncon_system.contingencies)
+
+
+@pytest.mark.parametrize('components,domains,density,depth,seed', [
+    (3, 2, 1.0, 0, 0),
+    (5, 3, 2.5, 0, 1),
+    (5, 4, 2.5, 1, 2),
+    (6, 3, 1.5, 3, 3),
+])
+def test_systems_are_valid(components: int, domains: int, density: float, depth: int, seed: int) -> None:
+    rxncon_system = synthetic_rxncon_system(components, domains, contingency_density=density, nesting_depth=depth,
+                                            seed=seed, reaction_mix={'ppi': 0.3, 'ipi': 0.1, 'p+': 0.2, 'p-': 0.2,
+                                                                     'syn': 0.1, 'deg': 0.1})
+
+    assert boolean_model_from_rxncon(rxncon_system).update_rules
+    assert rule_based_model_from_rxncon(rxncon_system).rules
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        synthetic_quick_str(1)
+    with pytest.raises(ValueError):
+        synthetic_quick_str(5, 1)
+    with pytest.raises(ValueError):
+        synthetic_quick_str(reaction_mix={'pp+': 1.0})
+    with pytest.raises(ValueError):
+        synthetic_quick_str(contingency_density=-1)
+    # There are only two distinct syn reactions between two components.
+    with pytest.raises(ValueError):
+        synthetic_quick_str(2, reactions=3, reaction_mix={'syn': 1.0})
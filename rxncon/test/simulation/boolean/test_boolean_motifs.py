@@ -87,7 +87,7 @@ def test_tdeg_registration():
 
     register_targeted_degradation()
 
-    assert reaction_from_str('A_tdeg_B_[(r)]').degraded_states == [state_from_str('B_[(r)]-{p}')]
+    assert reaction_from_str('A_tdeg_B_[(r)]').degraded_states == (state_from_str('B_[(r)]-{p}'),)
 
     unregister_targeted_degradation()
 
@@ -0,0 +1,100 @@
+import json
+import os
+import pstats
+import tracemalloc
+import pytest
+
+from rxncon.core.reaction import reaction_from_str
+from rxncon.util.profiling import Profiler, NO_SPAN, PROFILER, profiling, span
+from rxncon.input.quick.quick import Quick
+
+
+def test_disabled_profiler_records_nothing() -> None:
+    profiler = Profiler()
+
+    with profiler.span('stage', 'key') as s:
+        pass
+
+    assert s is None
+    assert profiler.span('stage') is NO_SPAN
+    assert profiler.report()['spans'] == {}
+
+
+def test_spans_are_aggregated_per_name_and_key() -> None:
+    profiler = Profiler()
+    profiler.enable()
+
+    with profiler.span('outer'):
+        for reaction_str in ['A_p+_B_[(r)]', 'C_ppi+_D', 'A_p+_B_[(r)]']:
+            with profiler.span('inner', reaction_from_str(reaction_str)):
+                x = [0] * 100000  # pylint: disable=unused-variable
+
+    profiler.disable()
+    report = profiler.report()
+
+    assert report['trace_memory']
+    assert list(report['spans'].keys()) == ['inner', 'outer']
+    assert report['spans']['outer']['calls'] == 1
+    assert report['spans']['inner']['calls'] == 3
+    assert report['spans']['outer']['wall_time'] >= report['spans']['inner']['wall_time']
+
+    per_key = report['spans']['inner']['per_key']
+    assert list(per_key.keys()) == ['A_p+_B_[(r)]', 'C_[D]_ppi+_D_[C]']
+    assert per_key['A_p+_B_[(r)]']['calls'] == 2
+
+    # The list allocated in the inner spans is part of the peak memory of the outer span as well.
+    assert report['spans']['inner']['peak_memory'] >= 100000 * 8
+    assert report['spans']['outer']['peak_memory'] >= report['spans']['inner']['peak_memory']
+
+
+def test_profiling_writes_report_and_cprofile_dump(tmpdir) -> None:
+    report_filename, cprofile_filename = str(tmpdir.join('report.json')), str(tmpdir.join('stats.prof'))
+
+    with profiling(report_filename, cprofile_filename):
+        Quick('''A_ppi+_B; ! A_[(x)]-{p}
+                 C_p+_A_[(x)]''').rxncon_system
+
+    assert not PROFILER.enabled
+    with open(report_filename) as f:
+        report = json.load(f)
+
+    assert {'rxncon system construction', 'contingency structuring', 'validation'} <= set(report['spans'].keys())
+    assert 'A_[B]_ppi+_B_[A]' in report['spans']['contingency structuring']['per_key']
+    assert pstats.Stats(cprofile_filename).total_calls > 0  # type: ignore
+
+    # Memory is only traced on request, since it distorts the wall times.
+    assert not report['trace_memory']
+    assert report['spans']['validation']['peak_memory'] == 0
+
+    # Outside of the context nothing is recorded.
+    with span('stage'):
+        pass
+    assert 'stage' not in PROFILER.report()['spans']
+
+
+def test_profiling_traces_memory_on_request(tmpdir) -> None:
+    report_filename = str(tmpdir.join('report.json'))
+
+    with profiling(report_filename, trace_memory=True):
+        with span('stage'):
+            x = [0] * 100000  # pylint: disable=unused-variable
+
+    assert not tracemalloc.is_tracing()
+    with open(report_filename) as f:
+        report = json.load(f)
+
+    assert report['trace_memory']
+    assert report['spans']['stage']['peak_memory'] >= 100000 * 8
+
+
+def test_profiling_writes_report_on_error(tmpdir) -> None:
+    report_filename = str(tmpdir.join('report.json'))
+
+    with pytest.raises(AssertionError):
+        with profiling(report_filename):
+            with span('failing stage'):
+                raise AssertionError
+
+    assert os.path.isfile(report_filename)
+    with open(report_filename) as f:
+        assert json.load(f)['spans']['failing stage']['calls'] == 1
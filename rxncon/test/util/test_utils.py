@@ -1,4 +1,4 @@
-from rxncon.util.utils import elems_eq
+from rxncon.util.utils import elems_eq, LRUCache
 
 
 def test_elems_eq_not_nested() -> None:
@@ -15,3 +15,15 @@ def test_elems_eq_nested() -> None:
 
     assert elems_eq([[], [1, 2, 3]], [[3, 2, 1], []])  # type: ignore
     assert elems_eq([[], []], [[], []])                # type: ignore
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache['a'] == 1
+
+    cache['c'] = 3
+    assert len(cache) == 2
+    assert 'b' not in cache
+    assert cache['a'] == 1 and cache['c'] == 3
@@ -5,7 +5,7 @@ from copy import deepcopy
 
 
 from rxncon.venntastic.sets import ValueSet, Union, Intersection, Complement, EmptySet, UniversalSet, Difference, venn_from_str, Set, \
-    DisjunctiveUnion
+    DisjunctiveUnion, BddVariableOrder, EXPR_BACKEND, BDD_BACKEND
 
 
 def test_property_set_construction() -> None:
@@ -53,6 +53,22 @@ def test_values() -> None:
     assert set(venn_from_str('1 | 2 | 3 | 4 | 2', int).values) == {1, 2, 3, 4}
 
 
+def test_val_to_sym_dict_in_first_seen_order() -> None:
+    x = Intersection(ValueSet(3), Union(Complement(ValueSet(1)), ValueSet(3)), ValueSet(2))
+    assert x.values == [3, 1, 3, 2]
+    assert list(x._make_val_to_sym_dict().items()) == [(3, 0), (1, 1), (2, 2)]
+
+    existing = x._make_val_to_sym_dict()
+    assert Union(ValueSet(4), ValueSet(2), ValueSet(5))._make_val_to_sym_dict(existing) is existing
+    assert list(existing.items()) == [(3, 0), (1, 1), (2, 2), (4, 3), (5, 4)]
+
+    # Collecting the values does not recurse.
+    deep = ValueSet(0)  # type: Set[int]
+    for i in range(1, 5000):
+        deep = Intersection(ValueSet(i), Complement(deep))
+    assert sorted(deep.values) == list(range(5000))
+
+
 def test_dnf_form() -> None:
     assert venn_from_str('1 & 2', int).to_dnf_set().is_equivalent_to(venn_from_str('1 & 2', int))
     assert venn_from_str('1 | 2', int).to_dnf_set().is_equivalent_to(venn_from_str('1 | 2', int))
@@ -142,6 +158,161 @@ def test_calc_solutions() -> None:
     assert {'a': False, 'b': False} in venn_from_str('a | ~( b )', str).calc_solutions()
 
 
+def test_calc_solution() -> None:
+    assert venn_from_str('( a ) & ~( a )', str).calc_solution() is None
+    assert not venn_from_str('( a ) & ~( a )', str).is_satisfiable()
+    assert venn_from_str('( a ) | ~( a )', str).calc_solution() == {}
+    assert UniversalSet().is_satisfiable()
+    assert not EmptySet().is_satisfiable()
+
+    x = venn_from_str('( a & ~( b ) ) | ( c & b )', str)
+    soln = x.calc_solution()
+    assert soln is not None
+    assert x.eval_boolean_func({**{'a': False, 'b': False, 'c': False}, **soln})
+
+
+def test_compiled_expression_is_cached() -> None:
+    x = venn_from_str('1 & ( 2 | 3 )', int)
+    compiled = x._compile()
+    assert x._compile() is compiled
+    assert x.to_dnf_list() == x.to_dnf_list()
+    assert x._compile() is compiled and compiled.dnf is compiled.dnf
+    assert not hasattr(deepcopy(x), '_compiled')
+
+    # Sets whose own mappings of values onto variables differ are compared correctly.
+    y = venn_from_str('( 3 | 2 ) & 1', int)
+    y._compile()
+    assert x.is_equivalent_to(y) and y.is_equivalent_to(x)
+    assert x.is_subset_of(ValueSet(1)) and not ValueSet(1).is_subset_of(x)
+    assert x._compile() is compiled
+
+
+def test_count_solutions() -> None:
+    assert venn_from_str('( a & ~( b ) ) | ( c & b )', str).count_solutions() == 4
+    assert venn_from_str('( a ) & ~( a )', str).count_solutions() == 0
+    assert DisjunctiveUnion(ValueSet('a'), ValueSet('b')).count_solutions() == 2
+    assert UniversalSet().count_solutions() == 1
+    assert EmptySet().count_solutions() == 0
+
+    # The solutions are counted without enumerating them.
+    x = Intersection(Union(*(ValueSet(i) for i in range(100))), Complement(ValueSet(100)))
+    assert x.count_solutions() == 2 ** 100 - 1
+
+
+def test_bdd_backend() -> None:
+    order = BddVariableOrder()
+    x = venn_from_str('( a & ~( b ) ) | ( c & b )', str)
+    y = venn_from_str('( b & c ) | ( ~( b ) & a )', str)
+
+    assert x.to_bdd(order) is y.to_bdd(order)
+    assert x.is_equivalent_to(y, BDD_BACKEND, order)
+    assert not x.is_equivalent_to(ValueSet('a'), BDD_BACKEND)
+    assert len(order) == 3
+
+    soln = x.calc_solution(BDD_BACKEND, order)
+    assert soln is not None
+    assert x.eval_boolean_func({**{'a': False, 'b': False, 'c': False}, **soln})
+    assert x.is_satisfiable(BDD_BACKEND)
+    assert not venn_from_str('( a ) & ~( a )', str).is_satisfiable(BDD_BACKEND, order)
+    assert venn_from_str('( a ) & ~( a )', str).calc_solution(BDD_BACKEND, order) is None
+
+    with pytest.raises(ValueError):
+        x.is_satisfiable('sat')
+
+
+def test_bdd_queries_share_variables() -> None:
+    from pyeda.boolalg.bdd import _VARS
+
+    x = Union(*(ValueSet(i) for i in range(50)))
+    assert x.is_satisfiable(BDD_BACKEND) and x.count_solutions() == 2 ** 50 - 1
+    bdd = x.to_bdd()
+    num_vars = len(_VARS)
+
+    # Repeated queries reuse the cached BDD, and new orders reuse the pyeda variables.
+    for _ in range(10):
+        assert x.is_satisfiable(BDD_BACKEND) and x.count_solutions() == 2 ** 50 - 1
+        assert x.to_bdd() is bdd
+        assert x.is_satisfiable(BDD_BACKEND, BddVariableOrder())
+        assert x.count_solutions(BddVariableOrder()) == 2 ** 50 - 1
+    assert len(_VARS) == num_vars
+
+
+def test_iter_solutions() -> None:
+    x = venn_from_str('( a & b ) | ( a & c ) | ( ~( a ) & b )', str)
+
+    # Lazily streamed: the first solution is available before the others are calculated.
+    assert next(x.iter_solutions()) == x.calc_solutions()[0]
+    assert list(x.iter_solutions()) == x.calc_solutions()
+
+    # A point of the values projected onto is covered by a single projected solution if it extends to a solution of
+    # the Set, and by none otherwise.
+    for backend in (EXPR_BACKEND, BDD_BACKEND):
+        for project_onto in (['b'], ['a', 'c'], ['c'], []):
+            others = [val for val in ['a', 'b', 'c'] if val not in project_onto]
+            projected = list(x.iter_solutions(project_onto=project_onto, backend=backend))
+            assert all(set(soln.keys()) <= set(project_onto) for soln in projected)
+
+            for point in itt.product([False, True], repeat=len(project_onto)):
+                vals = dict(zip(project_onto, point))
+                covering = [soln for soln in projected if all(vals[k] == v for k, v in soln.items())]
+                assert len(covering) == any(x.eval_boolean_func({**vals, **dict(zip(others, other_point))})
+                                            for other_point in itt.product([False, True], repeat=len(others)))
+
+    with pytest.raises(ValueError):
+        x.iter_solutions(backend='sat')
+
+
+def test_iter_solutions_quantifies_before_enumerating(monkeypatch) -> None:
+    from pyeda.boolalg.expr import Expression
+
+    enumerated = []
+    satisfy_all = Expression.satisfy_all
+
+    def counting_satisfy_all(self):
+        for point in satisfy_all(self):
+            enumerated.append(point)
+            yield point
+
+    monkeypatch.setattr(Expression, 'satisfy_all', counting_satisfy_all)
+
+    # Unprojected, a & (b0 | ... | b19) has one solution per b that is the first one holding.
+    x = Union(*(Intersection(ValueSet('a'), ValueSet(i)) for i in range(20)))
+    assert len(list(x.iter_solutions())) == 20
+    enumerated.clear()
+    assert list(x.iter_solutions(project_onto=['a'])) == [{'a': True}]
+    assert len(enumerated) == 1
+
+    # Projected onto b, the solutions a & b, ~a & b and c & ~b of the expression leave b free.
+    enumerated.clear()
+    x = venn_from_str('( a & b ) | ( ~( a ) & b ) | ( c & ~( b ) )', str)
+    assert list(x.iter_solutions(project_onto=['b'])) == [{}]
+    assert len(enumerated) == 1
+
+
+def test_calc_solution_of_expression_reducing_to_constant() -> None:
+    # The negation normal form of the expression is the constant zero, which cannot be Tseitin-encoded.
+    x = Intersection(ValueSet(2), Complement(Union(ValueSet(5), ValueSet(2))))
+    assert x.calc_solution() is None
+    assert not x.is_satisfiable(BDD_BACKEND)
+
+
+def test_more_values_than_two_letter_symbols() -> None:
+    # There used to be only 26 * 26 = 676 symbols for the values of an expression.
+    x = Intersection(*(ValueSet(i) for i in range(700)))
+    assert x.calc_solutions() == [{i: True for i in range(700)}]
+    assert x.eval_boolean_func({i: True for i in range(700)})
+    assert x.to_simplified_set().is_equivalent_to(x)
+    assert x.is_subset_of(Intersection(ValueSet(0), ValueSet(699)))
+    assert not Intersection(x, Complement(ValueSet(699))).is_satisfiable()
+
+    y = venn_from_str(' & '.join('( {} )'.format(' | '.join('v{}'.format(i) for i in range(j, j + 10)))
+                                 for j in range(0, 700, 10)), str)
+    assert len(y.values) == 700
+    soln = y.calc_solution()
+    assert soln is not None
+    assert y.eval_boolean_func({**{'v{}'.format(i): False for i in range(700)}, **soln})
+
+
 # Test the superset / subset relationships
 def test_superset_subset_for_unary_sets() -> None:
     # UniversalSet == UniversalSet
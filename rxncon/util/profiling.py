@@ -0,0 +1,181 @@
+"""Module containing a lightweight instrumentation layer. The stages of the pipeline (reading the Excel file,
+constructing and validating the RxnConSystem, structuring the contingencies, building the Boolean and rule-based
+models, exporting) are wrapped in named spans. While profiling is enabled, every span records its wall time, the
+number of calls, the peak memory traced by tracemalloc (if memory tracing is enabled as well) and, if given a key
+(e.g. the Reaction), the same data per key. Spans with the same name are aggregated, spans nested in other spans are also counted in the outer spans.
+
+While profiling is disabled (the default) a span is a shared no-op context manager."""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import time
+import tracemalloc
+
+
+class SpanStats:
+    """The aggregated data of all calls of a span: the number of calls, the total wall time in seconds and the
+    largest peak of the traced memory in bytes (0 if memory is not traced)."""
+    __slots__ = ('calls', 'wall_time', 'peak_memory', 'per_key')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_time = 0.0
+        self.peak_memory = 0
+        self.per_key = OrderedDict()  # type: Dict[str, SpanStats]
+
+    def record(self, wall_time: float, peak_memory: int) -> None:
+        self.calls += 1
+        self.wall_time += wall_time
+        self.peak_memory = max(self.peak_memory, peak_memory)
+
+    def to_dict(self) -> Dict[str, Any]:
+        res = OrderedDict([('calls', self.calls), ('wall_time', self.wall_time),
+                           ('peak_memory', self.peak_memory)])  # type: Dict[str, Any]
+        if self.per_key:
+            res['per_key'] = OrderedDict((key, stats.to_dict()) for key, stats in self.per_key.items())
+        return res
+
+
+class Span:
+    """A single call of a span, used as a context manager."""
+    __slots__ = ('profiler', 'name', 'key', 'start', 'peak_memory')
+
+    def __init__(self, profiler: 'Profiler', name: str, key: Any) -> None:
+        self.profiler, self.name, self.key = profiler, name, key
+        self.start = 0.0
+        self.peak_memory = 0
+
+    def __enter__(self) -> 'Span':
+        self.profiler._enter(self)  # pylint: disable=protected-access
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        wall_time = time.perf_counter() - self.start
+        self.profiler._exit(self, wall_time)  # pylint: disable=protected-access
+
+
+class NoSpan:
+    """The span handed out while profiling is disabled, which does nothing."""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+NO_SPAN = NoSpan()
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self.spans = OrderedDict()  # type: Dict[str, SpanStats]
+        self._open_spans = []  # type: List[Span]
+        self._started_tracemalloc = False
+
+    def enable(self, trace_memory: bool=True) -> None:
+        """Discards the data recorded so far and starts recording. Tracing the memory slows down the program
+        considerably, but is required for the peak memory of the spans."""
+        self.spans = OrderedDict()
+        self._open_spans = []
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops recording, the data recorded so far is kept."""
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def span(self, name: str, key: Any=None) -> Any:
+        """Returns a context manager recording the time and memory spent inside it under the given name, and if
+        a key is given (which is converted to a string only while profiling), also under that key."""
+        if not self.enabled:
+            return NO_SPAN
+        return Span(self, name, key)
+
+    def report(self) -> Dict[str, Any]:
+        return OrderedDict([('trace_memory', self.trace_memory),
+                            ('spans', OrderedDict((name, stats.to_dict()) for name, stats in self.spans.items()))])
+
+    def write_report(self, filename: str) -> None:
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def _enter(self, span: Span) -> None:
+        # The peak of the traced memory is reset for every span. The peak reached before is passed on to the
+        # enclosing span, which in turn passes its peak on to its own enclosing span once it is done.
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open_spans:
+                self._open_spans[-1].peak_memory = max(self._open_spans[-1].peak_memory, peak)
+            _reset_peak()
+            span.peak_memory = current
+        self._open_spans.append(span)
+
+    def _exit(self, span: Span, wall_time: float) -> None:
+        if self._open_spans and self._open_spans[-1] is span:
+            self._open_spans.pop()
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            span.peak_memory = max(span.peak_memory, tracemalloc.get_traced_memory()[1])
+            if self._open_spans:
+                self._open_spans[-1].peak_memory = max(self._open_spans[-1].peak_memory, span.peak_memory)
+            _reset_peak()
+
+        stats = self.spans.setdefault(span.name, SpanStats())
+        stats.record(wall_time, span.peak_memory)
+        if span.key is not None:
+            stats.per_key.setdefault(str(span.key), SpanStats()).record(wall_time, span.peak_memory)
+
+
+def _reset_peak() -> None:
+    # tracemalloc.reset_peak is only available from Python 3.9 onwards, before that the peaks are overall peaks.
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+PROFILER = Profiler()
+
+
+def span(name: str, key: Any=None) -> Any:
+    """Returns a span of the module-level Profiler, see Profiler.span."""
+    return PROFILER.span(name, key)
+
+
+@contextmanager
+def profiling(report_filename: Optional[str]=None, cprofile_filename: Optional[str]=None,
+              trace_memory: bool=False) -> Iterator[None]:
+    """Profiles the code inside the context, writing the JSON report of the spans to report_filename and the
+    cProfile statistics (readable with the pstats module) to cprofile_filename, if given. The peak memory of the
+    spans is only reported if trace_memory is set, since tracing it distorts the wall times. The files are written
+    even if an exception is raised."""
+    profile = None
+    if cprofile_filename:
+        import cProfile
+        profile = cProfile.Profile()
+
+    if report_filename:
+        PROFILER.enable(trace_memory)
+    if profile:
+        profile.enable()
+
+    try:
+        yield
+    finally:
+        if profile and cprofile_filename:
+            profile.disable()
+            profile.dump_stats(cprofile_filename)
+        if report_filename:
+            PROFILER.disable()
+            PROFILER.write_report(report_filename)
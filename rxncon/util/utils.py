@@ -1,4 +1,5 @@
-from typing import List, TypeVar
+from typing import List, Sequence, TypeVar, Hashable, Any
+from collections import OrderedDict
 import inspect
 from colorama import Fore
 
@@ -6,7 +7,7 @@ from colorama import Fore
 T = TypeVar('T')
 
 
-def elems_eq(first_list: List[T], second_list: List[T]) -> bool:
+def elems_eq(first_list: Sequence[T], second_list: Sequence[T]) -> bool:
     if all(isinstance(x, list) for x in first_list) and all(isinstance(x, list) for x in second_list):  # type: ignore
         uniq_first = [set(x) for x in first_list]    # type: ignore
         uniq_second = [set(x) for x in second_list]  # type: ignore
@@ -23,3 +24,23 @@ def current_function_name(colored: bool=True) -> str:
         return Fore.MAGENTA + name + Fore.RESET
     else:
         return name
+
+
+class LRUCache(OrderedDict):
+    """Mapping holding at most 'maxsize' items: setting an item beyond that evicts the least recently used one.
+    Used for memoization tables that would otherwise grow with every distinct key seen by a long-running process."""
+    def __init__(self, maxsize: int) -> None:
+        assert maxsize > 0
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
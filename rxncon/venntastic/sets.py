@@ -1,16 +1,37 @@
+from typing import Dict, List, Generic, Optional, TypeVar, MutableMapping, Callable, Any, Sequence, Iterator, \
+    Iterable, Tuple, AbstractSet, MutableSet, TYPE_CHECKING
+from collections import OrderedDict
 import functools
 import operator
-from typing import Dict, List, Generic, Optional, TypeVar, MutableMapping, Callable, Any
-from collections import OrderedDict
-from itertools import product
 import re
 from copy import deepcopy
 
-from pyeda.inter import And, Or, Not, Xor, expr
-from pyeda.boolalg.expr import XorOp, AndOp, OrOp, NotOp, Variable, Implies, Expression, Literal, \
-    Complement as pyedaComplement, One, Zero
-
-SYMS = [''.join(tup) for tup in product('ABCDEFGHIJKLMNOPQRSTUVWXYZ', repeat=2)]
+# pyeda is only imported once an expression is actually compiled, constructing and manipulating Sets does not
+# require it. This keeps it out of the import of everything that merely holds Sets, such as the RxnConSystem.
+# The recursive conversions from and to pyeda expressions look pyeda up through _pyeda_expr instead of importing
+# it on every call.
+if TYPE_CHECKING:
+    from pyeda.boolalg.expr import Expression, Variable  # pylint: disable=unused-import
+    from pyeda.boolalg.bdd import BinaryDecisionDiagram, BDDVariable  # pylint: disable=unused-import
+
+_PYEDA_EXPR = None  # type: Any
+
+# The values of a Set are represented in pyeda by the indexed variables x[0], x[1], ..., the index of a value being
+# its position in the val_to_sym mapping. Translating a variable back into its value is a lookup in the list of
+# values in that same order, see _sym_to_val_list.
+SYM_NAME = 'x'
+
+# The backends answering the satisfiability and equivalence queries on Sets: pyeda expressions, and binary decision
+# diagrams (BDDs) with their variables in a BddVariableOrder.
+EXPR_BACKEND = 'expr'
+BDD_BACKEND = 'bdd'
+BACKENDS = (EXPR_BACKEND, BDD_BACKEND)
+
+# The pyeda variables of the BDDs are shared by all BddVariableOrders: the value at position i of an order is the
+# variable bdd[i]. pyeda never frees its variables, sharing them keeps their number at the length of the longest
+# order. They are created in the order of their indices, which is therefore also pyeda's order of the variables.
+BDD_SYM_NAME = 'bdd'
+_BDD_VARS = []  # type: List[BDDVariable]
 
 # Since all Set expressions except ValueSet are covariant, we make the 'T' type var covariant,
 # and make ValueSet[T_inv] for invariant.
@@ -18,21 +39,165 @@ T = TypeVar('T', covariant=True)
 T_inv = TypeVar('T_inv')
 
 
+class CompiledSet:
+    """A Set compiled into pyeda: the mapping of its values onto the indices of the variables, the inverse
+    mapping and the pyeda expression. The DNF of the expression is computed once it is first needed."""
+    __slots__ = ('val_to_sym', 'sym_to_val', 'expr', '_dnf')
+
+    def __init__(self, val_to_sym: MutableMapping[Any, int], expr: 'Expression') -> None:
+        self.val_to_sym = val_to_sym
+        self.sym_to_val = _sym_to_val_list(val_to_sym)
+        self.expr = expr
+        self._dnf = None  # type: Optional[Expression]
+
+    @property
+    def dnf(self) -> 'Expression':
+        if self._dnf is None:
+            self._dnf = self.expr.to_dnf()
+        return self._dnf
+
+
+class BddVariableOrder:
+    """The order of the variables of BDDs, assigning the values of Sets a variable in the order in which they are
+    first seen. A BDD is canonical for its variable order: Sets whose BDDs share an order are equivalent if and only
+    if their BDDs are identical. The pyeda variables are shared between orders by position, see _bdd_var, so BDDs
+    of different orders must not be combined. Pickling an order keeps only its values."""
+    def __init__(self, values: Iterable[Any]=()) -> None:
+        self._val_to_var = OrderedDict()  # type: MutableMapping[Any, BDDVariable]
+        self._vals = []  # type: List[Any]
+        for value in values:
+            self.var(value)
+
+    def __getstate__(self) -> List[Any]:
+        return self._vals
+
+    def __setstate__(self, state: List[Any]) -> None:
+        self.__init__(state)  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self._vals)
+
+    def var(self, value: Any) -> 'BDDVariable':
+        var = self._val_to_var.get(value)
+        if var is None:
+            var = self._val_to_var[value] = _bdd_var(len(self._vals))
+            self._vals.append(value)
+        return var
+
+    def value(self, var: 'BDDVariable') -> Any:
+        return self._vals[var.indices[0]]
+
+
 class Set(Generic[T]):
+    # Sets are immutable, the pyeda expression a Set is compiled into and its last BDD are therefore cached on the
+    # Set itself, see _compile and to_bdd. The caches are neither copied nor pickled.
+    __slots__ = ('_compiled', '_bdd')
+
+    def __getstate__(self) -> Any:
+        return None, {name: getattr(self, name) for cls in type(self).__mro__ for name in getattr(cls, '__slots__', ())
+                      if name not in Set.__slots__ and hasattr(self, name)}
+
     def calc_solutions(self) -> List[Dict[T, bool]]:
-        val_to_sym = self._make_val_to_sym_dict()
-        sym_to_val = {sym: val for val, sym in val_to_sym.items()}
+        compiled = self._compile()
 
         venn_solns = []
-        for s in self._to_pyeda_expr(val_to_sym).satisfy_all():
-            venn_solns.append({sym_to_val[sym.name]: bool(truth) for sym, truth in s.items()})
+        for s in compiled.expr.satisfy_all():
+            venn_solns.append({compiled.sym_to_val[sym.indices[0]]: bool(truth) for sym, truth in s.items()})
 
         return venn_solns
 
+    def calc_solution(self, backend: str=EXPR_BACKEND,
+                      order: Optional[BddVariableOrder]=None) -> Optional[Dict[T, bool]]:
+        """Returns a single solution, or None if there is none. Instead of enumerating all solutions, the expression
+        is Tseitin-encoded into CNF and handed to the SAT solver, or for the BDD backend a path to the one node of
+        the BDD (with its variables in the given order, default: see to_bdd) is taken. Values that do not appear in
+        the solution can take either truth value."""
+        if _checked_backend(backend) == BDD_BACKEND:
+            order = order if order is not None else self._default_order()
+            point = self.to_bdd(order).satisfy_one()
+            if point is None:
+                return None
+            return {order.value(var): bool(truth) for var, truth in point.items()}
+
+        compiled = self._compile()
+
+        # Converting into negation normal form, which precedes the Tseitin encoding, can reduce the expression to
+        # a constant, which cannot be encoded.
+        pyeda_expr = compiled.expr.to_nnf()
+        if pyeda_expr.is_zero():
+            return None
+        elif pyeda_expr.is_one():
+            return {}
+
+        soln = pyeda_expr.tseitin(auxvarname='aux').satisfy_one()
+        if soln is None:
+            return None
+
+        return {compiled.sym_to_val[sym.indices[0]]: bool(truth) for sym, truth in soln.items()
+                if sym.name == SYM_NAME}
+
+    def is_satisfiable(self, backend: str=EXPR_BACKEND, order: Optional[BddVariableOrder]=None) -> bool:
+        if _checked_backend(backend) == BDD_BACKEND:
+            return not self.to_bdd(order).is_zero()
+        return self.calc_solution() is not None
+
+    def iter_solutions(self, project_onto: Optional[Iterable[T]]=None, backend: str=EXPR_BACKEND,
+                       order: Optional[BddVariableOrder]=None) -> Iterator[Dict[T, bool]]:
+        """Returns an iterator over the solutions projected onto the given values (default: all values of the Set).
+        As for calc_solution, values that do not appear in a solution can take either truth value. The other values
+        are existentially quantified before the solutions are lazily enumerated, so no solution is produced twice:
+        on the pyeda expression, whose solutions are then those of calc_solutions, or for the BDD backend on the
+        BDD (with its variables in the given order, default: see to_bdd), whose solutions are its paths."""
+        kept = None if project_onto is None else set(project_onto)
+
+        if _checked_backend(backend) == BDD_BACKEND:
+            order = order if order is not None else self._default_order()
+            quantified = set()  # type: AbstractSet[BDDVariable]
+            if kept is not None:
+                quantified = {order.var(x) for x in self._iter_values() if x not in kept}
+
+            return _iter_bdd_solutions(_quantified_bdd(self.to_bdd(order), quantified), order)
+
+        return self._iter_expr_solutions(kept)
+
+    def _iter_expr_solutions(self, kept: Optional[AbstractSet[T]]) -> Iterator[Dict[T, bool]]:
+        from pyeda.inter import exprvar
+
+        compiled = self._compile()
+        expr = compiled.expr
+        if kept is not None:
+            expr = _quantified_expr(expr, [exprvar(SYM_NAME, sym) for val, sym in compiled.val_to_sym.items()
+                                           if val not in kept])
+
+        for s in expr.satisfy_all():
+            yield {compiled.sym_to_val[sym.indices[0]]: bool(truth) for sym, truth in s.items()}
+
+    def count_solutions(self, order: Optional[BddVariableOrder]=None) -> int:
+        """Returns the number of assignments of truth values to the (distinct) values of the Set that satisfy it.
+        They are counted on the BDD (with its variables in the given order, default: see to_bdd), without
+        enumerating them."""
+        order = order if order is not None else self._default_order()
+        return _count_bdd_solutions(self.to_bdd(order), sorted(order.var(x).uniqid for x in set(self.values)))
+
+    def to_bdd(self, order: Optional[BddVariableOrder]=None) -> 'BinaryDecisionDiagram':
+        """Returns the BDD of the Set, with its variables in the given order (default: the order used last, or a new
+        one). The BDD is cached on the Set and its subsets for the order used last."""
+        order = order if order is not None else self._default_order()
+        cached = getattr(self, '_bdd', None)  # type: Optional[Tuple[BddVariableOrder, BinaryDecisionDiagram]]
+        if cached is not None and cached[0] is order:
+            return cached[1]
+
+        bdd = self._to_bdd(order)
+        self._bdd = (order, bdd)
+        return bdd
+
     def eval_boolean_func(self, vars: Dict[T, bool]) -> bool:
-        val_to_sym = self._make_val_to_sym_dict()
+        from pyeda.inter import exprvar
+
+        compiled = self._compile()
         try:
-            evaluated = self._to_pyeda_expr(val_to_sym).restrict({expr(sym): vars[val] for val, sym in val_to_sym.items()})
+            evaluated = compiled.expr.restrict({exprvar(SYM_NAME, sym): vars[val]
+                                                for val, sym in compiled.val_to_sym.items()})
         except KeyError as e:
             raise AssertionError('eval_boolean_func missing variable {}'.format(e.args[0]))
 
@@ -44,19 +209,19 @@ class Set(Generic[T]):
             raise AssertionError
 
     def to_simplified_set(self) -> 'Set[T]':
-        val_to_sym = self._make_val_to_sym_dict()
-        sym_to_val = {sym: val for val, sym in val_to_sym.items()}
-        return venn_from_pyeda(self._to_pyeda_expr(val_to_sym).simplify(), sym_to_val)
+        compiled = self._compile()
+        return venn_from_pyeda(compiled.expr.simplify(), compiled.sym_to_val)
 
     def to_dnf_set(self) -> 'Set[T]':
-        val_to_sym = self._make_val_to_sym_dict()
-        sym_to_val = {sym: val for val, sym in val_to_sym.items()}
-        return venn_from_pyeda(self._to_pyeda_expr(val_to_sym).to_dnf(), sym_to_val)
+        compiled = self._compile()
+        return venn_from_pyeda(compiled.dnf, compiled.sym_to_val)
 
     def to_dnf_list(self) -> List['Set[T]']:
-        val_to_sym = self._make_val_to_sym_dict()
-        sym_to_val = {sym: val for val, sym in val_to_sym.items()}
-        dnf_set = self._to_pyeda_expr(val_to_sym).to_dnf()
+        from pyeda.boolalg.expr import AndOp, OrOp, Literal, One, Zero
+
+        compiled = self._compile()
+        sym_to_val = compiled.sym_to_val
+        dnf_set = compiled.dnf
 
         if dnf_set is One:
             return [UniversalSet()]
@@ -72,9 +237,11 @@ class Set(Generic[T]):
             raise Exception
 
     def to_dnf_nested_list(self) -> List[List['Set[T]']]:
-        val_to_sym = self._make_val_to_sym_dict()
-        sym_to_val = {sym: val for val, sym in val_to_sym.items()}
-        dnf_set = self._to_pyeda_expr(val_to_sym).to_dnf()
+        from pyeda.boolalg.expr import AndOp, OrOp, Literal, One, Zero
+
+        compiled = self._compile()
+        sym_to_val = compiled.sym_to_val
+        dnf_set = compiled.dnf
 
         if dnf_set is One:
             return [[UniversalSet()]]
@@ -95,56 +262,83 @@ class Set(Generic[T]):
                 raise Exception
         return res
 
-    def is_equivalent_to(self, other: 'Set[T]') -> bool:
-        val_to_sym = self._make_val_to_sym_dict()
-        val_to_sym = other._make_val_to_sym_dict(val_to_sym)
-        return self._to_pyeda_expr(val_to_sym).equivalent(other._to_pyeda_expr(val_to_sym))
+    def is_equivalent_to(self, other: 'Set[T]', backend: str=EXPR_BACKEND,
+                         order: Optional[BddVariableOrder]=None) -> bool:
+        if _checked_backend(backend) == BDD_BACKEND:
+            order = order if order is not None else self._default_order()
+            return self.to_bdd(order) is other.to_bdd(order)
+
+        my_expr, other_expr = self._compile_with(other)
+        return my_expr.equivalent(other_expr)
 
     def is_subset_of(self, other: 'Set[T]') -> bool:
-        val_to_sym = self._make_val_to_sym_dict()
-        val_to_sym = other._make_val_to_sym_dict(val_to_sym)
-        return Implies(self._to_pyeda_expr(val_to_sym), other._to_pyeda_expr(val_to_sym)).equivalent(expr(1))
+        from pyeda.inter import expr
+        from pyeda.boolalg.expr import Implies
+
+        my_expr, other_expr = self._compile_with(other)
+        return Implies(my_expr, other_expr).equivalent(expr(1))
 
     def is_superset_of(self, other: 'Set[T]') -> bool:
         return other.is_subset_of(self)
 
     @property
     def values(self) -> List[T]:
-        return []
+        return list(self._iter_values())
+
+    def _iter_values(self) -> Iterator[T]:
+        # The values of the leaves from left to right, traversing the expression with an explicit stack, so that
+        # this is linear in the size of the expression and does not recurse.
+        stack = [self]  # type: List[Set[T]]
+        while stack:
+            expr = stack.pop()
+            if isinstance(expr, ValueSet):
+                yield expr.value
+            elif isinstance(expr, Complement):
+                stack.append(expr.expr)
+            elif isinstance(expr, NarySet):
+                stack.extend(reversed(expr.exprs))
+
+    def _default_order(self) -> BddVariableOrder:
+        """The variable order of the cached BDD, so that repeated queries reuse it, or a new order."""
+        cached = getattr(self, '_bdd', None)  # type: Optional[Tuple[BddVariableOrder, BinaryDecisionDiagram]]
+        return cached[0] if cached is not None else BddVariableOrder()
+
+    def _compile(self) -> CompiledSet:
+        compiled = getattr(self, '_compiled', None)  # type: Optional[CompiledSet]
+        if compiled is None:
+            val_to_sym = self._make_val_to_sym_dict()
+            compiled = self._compiled = CompiledSet(val_to_sym, self._to_pyeda_expr(val_to_sym))
+        return compiled
+
+    def _compile_with(self, other: 'Set[T]') -> Tuple['Expression', 'Expression']:
+        """Returns the pyeda expressions of self and other, with a common mapping of their values onto variables.
+        The compiled expression of other is reused if its own mapping agrees with the common one."""
+        compiled = self._compile()
+        val_to_sym = other._make_val_to_sym_dict(OrderedDict(compiled.val_to_sym))
+        other_val_to_sym = other._make_val_to_sym_dict()
+        if all(val_to_sym[val] == sym for val, sym in other_val_to_sym.items()):
+            return compiled.expr, other._compile().expr
+        else:
+            return compiled.expr, other._to_pyeda_expr(val_to_sym)
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, str]) -> Expression:
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, int]) -> 'Expression':
         return None
 
-    def _make_val_to_sym_dict(self, existing_dict: Optional[MutableMapping[T, str]]=None) -> MutableMapping[T, str]:
-        vals = []  # type: List[T]
-
-        for v in self.values:
-            found = False
-            for existing in vals:
-                try:
-                    if v == existing:
-                        found = True
-                        break
-                except AttributeError:
-                    pass
-
-            if not found:
-                vals.append(v)
-
-        if existing_dict:
-            d = existing_dict
-            first_new_sym_idx = SYMS.index(next(reversed(d.values()))) + 1  # type: ignore
-            for i, val in enumerate(x for x in vals if x not in d.keys()):
-                d[val] = SYMS[i + first_new_sym_idx]
-        else:
-            d = OrderedDict()
-            for i, val in enumerate(vals):
-                d[val] = SYMS[i]
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        return None
+
+    def _make_val_to_sym_dict(self, existing_dict: Optional[MutableMapping[T, int]]=None) -> MutableMapping[T, int]:
+        d = existing_dict if existing_dict is not None else OrderedDict()  # type: MutableMapping[T, int]
+        for val in self._iter_values():
+            if val not in d:
+                d[val] = len(d)
 
         return d
 
 
 class EmptySet(Set[Any]):
+    __slots__ = ()
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Set):
             return NotImplemented
@@ -159,11 +353,17 @@ class EmptySet(Set[Any]):
     def __str__(self) -> str:
         return 'EmptySet'
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[Any, str]) -> Expression:
-        return expr(0)
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[Any, int]) -> 'Expression':
+        return _pyeda_expr().expr(0)
+
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        from pyeda.boolalg.bdd import BDDZERO
+        return BDDZERO
 
 
 class UniversalSet(Set[Any]):
+    __slots__ = ()
+
     def __init__(self) -> None:
         pass
 
@@ -181,15 +381,21 @@ class UniversalSet(Set[Any]):
     def __str__(self) -> str:
         return 'UniversalSet'
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[Any, str]) -> Expression:
-        return expr(1)
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[Any, int]) -> 'Expression':
+        return _pyeda_expr().expr(1)
+
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        from pyeda.boolalg.bdd import BDDONE
+        return BDDONE
 
 
 class UnarySet(Set[T], Generic[T]):
-    pass
+    __slots__ = ()
 
 
 class ValueSet(UnarySet[T_inv], Generic[T_inv]):
+    __slots__ = ('value',)
+
     def __init__(self, value: T_inv) -> None:
         assert value is not None
         assert isinstance(hash(value), int)
@@ -215,15 +421,16 @@ class ValueSet(UnarySet[T_inv], Generic[T_inv]):
         else:
             return 'UniversalSet'
 
-    @property
-    def values(self) -> List[T_inv]:
-        return [self.value]
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[Any, int]) -> 'Expression':
+        return _pyeda_expr().exprvar(SYM_NAME, val_to_sym[self.value])
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[Any, str]) -> Expression:
-        return expr(val_to_sym[self.value])
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        return order.var(self.value)
 
 
 class Complement(UnarySet[T], Generic[T]):
+    __slots__ = ('expr',)
+
     def __init__(self, expr: Set[T]) -> None:
         self.expr = expr
 
@@ -244,15 +451,16 @@ class Complement(UnarySet[T], Generic[T]):
     def __str__(self) -> str:
         return '!({})'.format(str(self.expr))
 
-    @property
-    def values(self) -> List[T]:
-        return self.expr.values
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, int]) -> 'Expression':
+        return _pyeda_expr().Not(self.expr._to_pyeda_expr(val_to_sym))
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, str]) -> Expression:
-        return Not(self.expr._to_pyeda_expr(val_to_sym))
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        return ~self.expr.to_bdd(order)
 
 
 class NarySet(Set[T], Generic[T]):
+    __slots__ = ('exprs',)
+
     def __new__(cls, *exprs: Set[T]) -> Set[T]:
         assert len(exprs) > 0
         if len(exprs) == 1:
@@ -263,12 +471,10 @@ class NarySet(Set[T], Generic[T]):
     def __init__(self, *exprs: Set[T]) -> None:
         self.exprs = exprs
 
-    @property
-    def values(self) -> List[T]:
-        return functools.reduce(operator.add, [expr.values for expr in self.exprs], [])
-
 
 class Intersection(NarySet[T], Generic[T]):
+    __slots__ = ()
+
     def __new__(cls, *exprs: Set[T], **kwargs: Any) -> Set[T]:
         if len(exprs) == 0:
             return UniversalSet()
@@ -295,11 +501,16 @@ class Intersection(NarySet[T], Generic[T]):
     def __str__(self) -> str:
         return '({})'.format(' & '.join(str(expr) for expr in self.exprs))
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, str]) -> Expression:
-        return And(*(expr._to_pyeda_expr(val_to_sym) for expr in self.exprs))
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, int]) -> 'Expression':
+        return _pyeda_expr().And(*(expr._to_pyeda_expr(val_to_sym) for expr in self.exprs))
+
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        return functools.reduce(operator.and_, (expr.to_bdd(order) for expr in self.exprs))
 
 
 class Union(NarySet[T], Generic[T]):
+    __slots__ = ()
+
     def __new__(cls, *exprs: Set[T], **kwargs: Any) -> Set[T]:
         if len(exprs) == 0:
             return EmptySet()
@@ -326,11 +537,16 @@ class Union(NarySet[T], Generic[T]):
     def __str__(self) -> str:
         return '({})'.format(' | '.join(str(expr) for expr in self.exprs))
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, str]) -> Expression:
-        return Or(*(expr._to_pyeda_expr(val_to_sym) for expr in self.exprs))
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, int]) -> 'Expression':
+        return _pyeda_expr().Or(*(expr._to_pyeda_expr(val_to_sym) for expr in self.exprs))
+
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        return functools.reduce(operator.or_, (expr.to_bdd(order) for expr in self.exprs))
 
 
 class DisjunctiveUnion(NarySet[T], Generic[T]):
+    __slots__ = ()
+
     def __new__(cls, *exprs: Set[T], **kwargs: Any) -> Set[T]:
         if len(exprs) == 0:
             return EmptySet()
@@ -357,44 +573,197 @@ class DisjunctiveUnion(NarySet[T], Generic[T]):
     def __str__(self) -> str:
         return '({})'.format(' XOR '.join(str(expr) for expr in self.exprs))
 
-    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, str]) -> Expression:
-        return Xor(*(expr._to_pyeda_expr(val_to_sym) for expr in self.exprs))
+    def _to_pyeda_expr(self, val_to_sym: MutableMapping[T, int]) -> 'Expression':
+        return _pyeda_expr().Xor(*(expr._to_pyeda_expr(val_to_sym) for expr in self.exprs))
+
+    def _to_bdd(self, order: BddVariableOrder) -> 'BinaryDecisionDiagram':
+        return functools.reduce(operator.xor, (expr.to_bdd(order) for expr in self.exprs))
 
 
 class Difference(Set[T], Generic[T]):
+    __slots__ = ()
+
     def __new__(cls, *args: Set[T]) -> Set[T]:
         assert len(args) == 2
         return Intersection(args[0], Complement(args[1]))
 
 
-def venn_from_pyeda(pyeda_expr: Expression, sym_to_val: MutableMapping[str, T]) -> Set[T]:
-    if pyeda_expr is One:
+def _checked_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend {}, known are {}'.format(backend, ', '.join(BACKENDS)))
+    return backend
+
+
+def _bdd_var(index: int) -> 'BDDVariable':
+    """Returns the shared pyeda variable of the given position in a BddVariableOrder, creating the variables up to
+    it in the order of their indices."""
+    if index >= len(_BDD_VARS):
+        from pyeda.inter import bddvar
+        _BDD_VARS.extend(bddvar(BDD_SYM_NAME, i) for i in range(len(_BDD_VARS), index + 1))
+    return _BDD_VARS[index]
+
+
+def _count_bdd_solutions(bdd: 'BinaryDecisionDiagram', uniqids: List[int]) -> int:
+    """Counts the satisfying assignments of the variables with the given (sorted) uniqids, which include the support
+    of the BDD. Per node the number of assignments of the variables from its own onwards that lead to the one node
+    is computed, multiplying by two for every variable skipped on an edge."""
+    from pyeda.boolalg.bdd import BDDNODEZERO, BDDNODEONE
+
+    level = {uniqid: i for i, uniqid in enumerate(uniqids)}
+    level[BDDNODEZERO.root] = level[BDDNODEONE.root] = len(uniqids)
+    counts = {BDDNODEZERO: 0, BDDNODEONE: 1}
+
+    stack = [bdd.node]
+    while stack:
+        node = stack[-1]
+        if node in counts:
+            stack.pop()
+        elif node.lo not in counts or node.hi not in counts:
+            stack.extend(child for child in (node.lo, node.hi) if child not in counts)
+        else:
+            stack.pop()
+            counts[node] = sum(counts[child] << (level[child.root] - level[node.root] - 1)
+                               for child in (node.lo, node.hi))
+
+    return counts[bdd.node] << level[bdd.node.root]
+
+
+def _quantified_expr(expr: 'Expression', variables: List['Variable']) -> 'Expression':
+    """Existentially quantifies the variables. A variable occurring only positively (negatively) in the negation
+    normal form is set to one (zero): that cofactor implies the other one. For the other variables the OR of both
+    cofactors is taken, one variable at a time, since pyeda's smoothing over several variables takes the OR of all
+    their cofactors. Each of these can double the size of the expression."""
+    from pyeda.boolalg.expr import Variable, Complement
+
+    if not variables:
+        return expr
+
+    expr = expr.to_nnf()
+    positive, negative = set(), set()  # type: MutableSet[Variable], MutableSet[Variable]
+    seen = set()  # type: MutableSet[Expression]
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        if isinstance(node, Variable):
+            positive.add(node)
+        elif isinstance(node, Complement):
+            negative.add(~node)
+        else:
+            stack.extend(getattr(node, 'xs', ()))
+
+    # pyeda does not simplify the results, which satisfy_all requires.
+    expr = expr.restrict({var: int(var in positive) for var in variables
+                          if (var in positive) != (var in negative)}).simplify()
+    for var in variables:
+        if var in positive and var in negative:
+            expr = expr.smoothing(var).simplify()
+
+    return expr
+
+
+def _quantified_bdd(bdd: 'BinaryDecisionDiagram', variables: AbstractSet['BDDVariable']) \
+        -> 'BinaryDecisionDiagram':
+    """Existentially quantifies the variables: per node the quantified BDD is the OR of the quantified cofactors
+    if the node's variable is quantified, otherwise the node with its cofactors quantified. pyeda's own smoothing
+    takes the OR of all cofactors with respect to all variables, which is exponential in their number."""
+    from pyeda.boolalg.bdd import ite
+
+    if not variables:
+        return bdd
+
+    quantified = {}  # type: Dict[BinaryDecisionDiagram, BinaryDecisionDiagram]
+    stack = [bdd]
+    while stack:
+        node = stack[-1]
+        if node in quantified:
+            stack.pop()
+        elif node.is_zero() or node.is_one():
+            quantified[node] = node
+            stack.pop()
+        else:
+            var = node.top
+            lo, hi = node.restrict({var: 0}), node.restrict({var: 1})
+            if lo not in quantified or hi not in quantified:
+                stack.extend(x for x in (lo, hi) if x not in quantified)
+            else:
+                stack.pop()
+                quantified[node] = quantified[lo] | quantified[hi] if var in variables else \
+                    ite(var, quantified[hi], quantified[lo])
+
+    return quantified[bdd]
+
+
+def _iter_bdd_solutions(bdd: 'BinaryDecisionDiagram', order: BddVariableOrder) -> Iterator[Dict[Any, bool]]:
+    """Yields the paths of the BDD leading to the one node as assignments of the values of their variables."""
+    stack = [(bdd, OrderedDict())]  # type: List[Tuple[BinaryDecisionDiagram, Dict[BDDVariable, bool]]]
+    while stack:
+        node, point = stack.pop()
+        if node.is_zero():
+            continue
+        elif node.is_one():
+            yield OrderedDict((order.value(var), truth) for var, truth in point.items())
+        else:
+            var = node.top
+            stack.append((node.restrict({var: 1}), _extended(point, var, True)))
+            stack.append((node.restrict({var: 0}), _extended(point, var, False)))
+
+
+def _extended(point: Dict['BDDVariable', bool], var: 'BDDVariable', truth: bool) -> Dict['BDDVariable', bool]:
+    extended = OrderedDict(point)
+    extended[var] = truth
+    return extended
+
+
+def _sym_to_val_list(val_to_sym: MutableMapping[T, int]) -> List[T]:
+    vals = [None] * len(val_to_sym)  # type: List[Any]
+    for val, sym in val_to_sym.items():
+        vals[sym] = val
+    return vals
+
+
+def _pyeda_expr() -> Any:
+    """Returns the module pyeda.boolalg.expr, importing it upon the first call."""
+    global _PYEDA_EXPR
+    if _PYEDA_EXPR is None:
+        import pyeda.boolalg.expr
+        _PYEDA_EXPR = pyeda.boolalg.expr
+    return _PYEDA_EXPR
+
+
+def venn_from_pyeda(pyeda_expr: 'Expression', sym_to_val: Sequence[T]) -> Set[T]:
+    pyeda = _pyeda_expr()
+
+    if pyeda_expr is pyeda.One:
         return UniversalSet()
-    elif pyeda_expr is Zero:
+    elif pyeda_expr is pyeda.Zero:
         return EmptySet()
-    elif isinstance(pyeda_expr, Variable):
-        return ValueSet(sym_to_val[pyeda_expr.name])
-    elif isinstance(pyeda_expr, AndOp):
+    elif isinstance(pyeda_expr, pyeda.Variable):
+        return ValueSet(sym_to_val[pyeda_expr.indices[0]])
+    elif isinstance(pyeda_expr, pyeda.AndOp):
         return Intersection(*(venn_from_pyeda(x, sym_to_val) for x in pyeda_expr.xs))
-    elif isinstance(pyeda_expr, OrOp):
+    elif isinstance(pyeda_expr, pyeda.OrOp):
         return Union(*(venn_from_pyeda(x, sym_to_val) for x in pyeda_expr.xs))
-    elif isinstance(pyeda_expr, NotOp):
+    elif isinstance(pyeda_expr, pyeda.NotOp):
         return Complement(venn_from_pyeda(pyeda_expr.x, sym_to_val))
-    elif isinstance(pyeda_expr, pyedaComplement):
-        return Complement(ValueSet(sym_to_val[pyeda_expr.inputs[0].name]))
-    elif isinstance(pyeda_expr, XorOp):
+    elif isinstance(pyeda_expr, pyeda.Complement):
+        return Complement(ValueSet(sym_to_val[pyeda_expr.inputs[0].indices[0]]))
+    elif isinstance(pyeda_expr, pyeda.XorOp):
         return DisjunctiveUnion(*(venn_from_pyeda(x, sym_to_val) for x in pyeda_expr.xs))
     else:
         raise Exception
 
 
 def venn_from_str(venn_str: str, value_parser: Callable[[str], T]) -> Set[T]:
+    from pyeda.inter import expr
+
     # The values have to be surrounded by a single space.
     BOOL_REGEX            = '[\(\)\|\&\~]+'
     pyeda_str             = ''
-    pyeda_sym_to_val      = OrderedDict()  # type: MutableMapping[str, T]
+    pyeda_sym_to_val      = []  # type: List[T]
     venn_sym_to_pyeda_sym = OrderedDict()  # type: MutableMapping[str, str]
-    current_sym           = 0
 
     parts = venn_str.split()
 
@@ -406,10 +775,9 @@ def venn_from_str(venn_str: str, value_parser: Callable[[str], T]) -> Set[T]:
             if part in venn_sym_to_pyeda_sym.keys():
                 pyeda_str += venn_sym_to_pyeda_sym[part]
             else:
-                pyeda_sym = SYMS[current_sym]
-                current_sym += 1
+                pyeda_sym = '{}[{}]'.format(SYM_NAME, len(pyeda_sym_to_val))
                 venn_sym_to_pyeda_sym[part] = pyeda_sym
-                pyeda_sym_to_val[pyeda_sym] = value_parser(part)
+                pyeda_sym_to_val.append(value_parser(part))
                 pyeda_str += pyeda_sym
 
     return venn_from_pyeda(expr(pyeda_str), pyeda_sym_to_val)
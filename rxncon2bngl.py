@@ -6,16 +6,17 @@ import click_log
 import colorama
 import sys
 
-from rxncon.input.excel_book.excel_book import ExcelBook
+from rxncon.input.snapshot.snapshot import rxncon_system_from_excel, DEFAULT_CACHE_DIR
 from rxncon.simulation.rule_based.rule_based_model import rule_based_model_from_rxncon
 from rxncon.simulation.rule_based.bngl_from_rule_based_model import bngl_from_rule_based_model
+from rxncon.util.profiling import profiling, span
 
 
 colorama.init()
 LOGGER = logging.getLogger(__name__)
 
 
-def write_bngl(excel_filename: str, base_name=None):
+def write_bngl(excel_filename: str, base_name=None, validation_workers: int = 1, use_cache: bool = True):
     if not base_name:
         base_name = os.path.splitext(os.path.basename(excel_filename))[0]
 
@@ -24,9 +25,8 @@ def write_bngl(excel_filename: str, base_name=None):
     bngl_model_filename = os.path.join(base_path, '{0}.bngl'.format(base_name))
 
     print('Reading in Excel file [{}] ...'.format(excel_filename))
-    excel_book = ExcelBook(excel_filename)
-
-    rxncon_system = excel_book.rxncon_system
+    rxncon_system = rxncon_system_from_excel(excel_filename, validation_workers,
+                                             DEFAULT_CACHE_DIR if use_cache else None)
     print('Constructed rxncon system: [{} reactions], [{} contingencies], [{} components], [{} elemental states]'
           .format(len(rxncon_system.reactions), len(rxncon_system.contingencies), len(rxncon_system.components()),
                   len(rxncon_system.states)))
@@ -35,21 +35,34 @@ def write_bngl(excel_filename: str, base_name=None):
     rbm = rule_based_model_from_rxncon(rxncon_system)
     print('Constructed rule-based model: [{} molecule types], [{} rules], [{} observables]'
           .format(len(rbm.mol_defs), len(rbm.rules), len(rbm.observables)))
-    model_str = bngl_from_rule_based_model(rbm)
 
-    print('Writing BNGL model file [{}] ...'.format(bngl_model_filename))
-    with open(bngl_model_filename, mode='w') as f:
-        f.write(model_str)
+    with span('export'):
+        model_str = bngl_from_rule_based_model(rbm)
+
+        print('Writing BNGL model file [{}] ...'.format(bngl_model_filename))
+        with open(bngl_model_filename, mode='w') as f:
+            f.write(model_str)
 
 
 @click.command()
 @click.option('--output', default=None,
               help='Base name for output files. Default: \'fn\' for input file \'fn.xls\'')
+@click.option('--workers', default=1, type=click.IntRange(min=1),
+              help='Number of processes used to validate the contingencies. Default: 1')
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Do not read or write the snapshot of the rxncon system in {}'.format(DEFAULT_CACHE_DIR))
+@click.option('--profile', default=None, type=click.Path(dir_okay=False),
+              help='Write a JSON report of the time spent per stage to this file.')
+@click.option('--profile-memory', is_flag=True, default=False,
+              help='Also report the peak memory per stage with --profile. This slows down the run considerably.')
+@click.option('--cprofile', default=None, type=click.Path(dir_okay=False),
+              help='Write the cProfile statistics (readable with the pstats module) to this file.')
 @click.argument('excel_file')
 @click_log.simple_verbosity_option(default='WARNING')
 @click_log.init()
-def run(output, excel_file):
-    write_bngl(excel_file, output)
+def run(output, excel_file, workers, no_cache, profile, profile_memory, cprofile):
+    with profiling(profile, cprofile, profile_memory):
+        write_bngl(excel_file, output, workers, not no_cache)
 
 def setup_logging_colors():
     click_log.ColorFormatter.colors = {
@@ -9,10 +9,11 @@ import click_log
 import colorama
 from typing import Optional
 
-from rxncon.input.excel_book.excel_book import ExcelBook
+from rxncon.input.snapshot.snapshot import rxncon_system_from_excel, DEFAULT_CACHE_DIR
 from rxncon.simulation.boolean.boolean_model import SmoothingStrategy, KnockoutStrategy, OverexpressionStrategy
 from rxncon.simulation.boolean.boolnet_from_boolean_model import QuantitativeContingencyStrategy, \
     boolnet_strs_from_rxncon
+from rxncon.util.profiling import profiling, span
 
 colorama.init()
 LOGGER = logging.getLogger(__name__)
@@ -20,7 +21,8 @@ LOGGER = logging.getLogger(__name__)
 
 def write_boolnet(excel_filename: str, smoothing_strategy: SmoothingStrategy, knockout_strategy: KnockoutStrategy,
                   overexpression_strategy: OverexpressionStrategy, k_plus_strategy: QuantitativeContingencyStrategy,
-                  k_minus_strategy: QuantitativeContingencyStrategy, base_name: Optional[str] = None):
+                  k_minus_strategy: QuantitativeContingencyStrategy, base_name: Optional[str] = None,
+                  validation_workers: int = 1, use_cache: bool = True):
     if not base_name:
         base_name = os.path.splitext(os.path.basename(excel_filename))[0]
 
@@ -31,9 +33,8 @@ def write_boolnet(excel_filename: str, smoothing_strategy: SmoothingStrategy, kn
     boolnet_initial_val_filename = os.path.join(base_path, '{0}_initial_vals.csv'.format(base_name))
 
     print('Reading in Excel file [{}] ...'.format(excel_filename))
-    excel_book = ExcelBook(excel_filename)
-
-    rxncon_system = excel_book.rxncon_system
+    rxncon_system = rxncon_system_from_excel(excel_filename, validation_workers,
+                                             DEFAULT_CACHE_DIR if use_cache else None)
     print('Constructed rxncon system: [{} reactions], [{} contingencies]'
           .format(len(rxncon_system.reactions), len(rxncon_system.contingencies)))
 
@@ -43,17 +44,18 @@ def write_boolnet(excel_filename: str, smoothing_strategy: SmoothingStrategy, kn
                                                                       overexpression_strategy, k_plus_strategy,
                                                                       k_minus_strategy)
 
-    print('Writing BoolNet model file [{}] ...'.format(boolnet_model_filename))
-    with open(boolnet_model_filename, mode='w') as f:
-        f.write(model_str)
+    with span('export'):
+        print('Writing BoolNet model file [{}] ...'.format(boolnet_model_filename))
+        with open(boolnet_model_filename, mode='w') as f:
+            f.write(model_str)
 
-    print('Writing BoolNet symbol file [{}] ...'.format(boolnet_symbol_filename))
-    with open(boolnet_symbol_filename, mode='w') as f:
-        f.write(symbol_str)
+        print('Writing BoolNet symbol file [{}] ...'.format(boolnet_symbol_filename))
+        with open(boolnet_symbol_filename, mode='w') as f:
+            f.write(symbol_str)
 
-    print('Writing BoolNet initial value file [{}] ...'.format(boolnet_initial_val_filename))
-    with open(boolnet_initial_val_filename, mode='w') as f:
-        f.write(initial_val_str)
+        print('Writing BoolNet initial value file [{}] ...'.format(boolnet_initial_val_filename))
+        with open(boolnet_initial_val_filename, mode='w') as f:
+            f.write(initial_val_str)
 
 
 valid_smoothing_strategies = [strategy.value for strategy in SmoothingStrategy.__members__.values()]  # type: ignore
@@ -118,17 +120,29 @@ def validate_quantitative_contingency_strategy(ctx, param, value):
               callback=validate_quantitative_contingency_strategy)
 @click.option('--output', default=None,
               help='Base name for output files. Default: \'fn\' for input file \'fn.xls\'')
+@click.option('--workers', default=1, type=click.IntRange(min=1),
+              help='Number of processes used to validate the contingencies. Default: 1')
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Do not read or write the snapshot of the rxncon system in {}'.format(DEFAULT_CACHE_DIR))
+@click.option('--profile', default=None, type=click.Path(dir_okay=False),
+              help='Write a JSON report of the time spent per stage to this file.')
+@click.option('--profile-memory', is_flag=True, default=False,
+              help='Also report the peak memory per stage with --profile. This slows down the run considerably.')
+@click.option('--cprofile', default=None, type=click.Path(dir_okay=False),
+              help='Write the cProfile statistics (readable with the pstats module) to this file.')
 @click.argument('excel_file')
 @click_log.simple_verbosity_option(default='WARNING')
 @click_log.init()
-def run(overexpression, knockout, smoothing, output, excel_file, k_plus, k_minus):
+def run(overexpression, knockout, smoothing, output, excel_file, k_plus, k_minus, workers, no_cache, profile,
+        profile_memory, cprofile):
     smoothing_strategy = SmoothingStrategy(smoothing)
     knockout_strategy = KnockoutStrategy(knockout)
     overexpression_strategy = OverexpressionStrategy(overexpression)
     k_plus_strategy = QuantitativeContingencyStrategy(k_plus)
     k_minus_strategy = QuantitativeContingencyStrategy(k_minus)
-    write_boolnet(excel_file, smoothing_strategy, knockout_strategy, overexpression_strategy,
-                  k_plus_strategy, k_minus_strategy, output)
+    with profiling(profile, cprofile, profile_memory):
+        write_boolnet(excel_file, smoothing_strategy, knockout_strategy, overexpression_strategy,
+                      k_plus_strategy, k_minus_strategy, output, workers, not no_cache)
 
 
 def setup_logging_colors():
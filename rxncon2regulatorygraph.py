@@ -8,10 +8,11 @@ import click
 import click_log
 import colorama
 
-from rxncon.input.excel_book.excel_book import ExcelBook
+from rxncon.input.snapshot.snapshot import rxncon_system_from_excel, DEFAULT_CACHE_DIR
 from rxncon.visualization.regulatory_graph import RegulatoryGraph
 from rxncon.visualization.graphML import XGMML
 from rxncon.visualization.graphML import map_layout2xgmml
+from rxncon.util.profiling import profiling, span
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,8 @@ def _file_path_existence(file_path):
         raise NotADirectoryError("Path {0} does not exists.".format(path))
 
 
-def write_xgmml(excel_filename: str, output=None, layout_template_file=None):
+def write_xgmml(excel_filename: str, output=None, layout_template_file=None, validation_workers: int = 1,
+                use_cache: bool = True):
     """
     creating the xgmml file from an excel input and writing it into a new file.
 
@@ -53,6 +55,8 @@ def write_xgmml(excel_filename: str, output=None, layout_template_file=None):
         excel_filename: Name of the excel input file.
         output: Name of the new output.
         layout_template_file: Name of the layout template file.
+        validation_workers: Number of processes used to validate the contingencies.
+        use_cache: Whether to read and write the snapshot of the rxncon system in the cache directory.
 
     Returns:
         None
@@ -76,28 +80,30 @@ def write_xgmml(excel_filename: str, output=None, layout_template_file=None):
 
 
     print('Reading in Excel file [{}] ...'.format(excel_filename))
-    excel_book = ExcelBook(excel_filename)
-
-    rxncon_system = excel_book.rxncon_system
+    rxncon_system = rxncon_system_from_excel(excel_filename, validation_workers,
+                                             DEFAULT_CACHE_DIR if use_cache else None)
     print('Constructed rxncon system: [{} reactions], [{} contingencies]'
           .format(len(rxncon_system.reactions), len(rxncon_system.contingencies)))
 
     print('Generating regulatory graph output...')
-    reg_system = RegulatoryGraph(rxncon_system)
-    graph = reg_system.to_graph()
-
-    if layout_template_file:
-        print('Writing layout information from [{0}] to graph file [{1}] ...'.format(layout_template_file, graph_filename))
-        gml_system = XGMML(graph, "{}".format(output))
-        graph = map_layout2xgmml(gml_system.to_string(), layout_template_file)
-        print('Writing regulatory graph file [{}] ...'.format(graph_filename))
-
-        with open(graph_filename, "w") as graph_handle:
-            graph_handle.write(graph)
-    else:
-        print('Writing regulatory graph file [{}] ...'.format(graph_filename))
-        gml_system = XGMML(graph, "{}".format(output))
-        gml_system.to_file(graph_filename)
+    with span('graph building'):
+        reg_system = RegulatoryGraph(rxncon_system)
+        graph = reg_system.to_graph()
+
+    with span('export'):
+        if layout_template_file:
+            print('Writing layout information from [{0}] to graph file [{1}] ...'.format(layout_template_file,
+                                                                                         graph_filename))
+            gml_system = XGMML(graph, "{}".format(output))
+            graph = map_layout2xgmml(gml_system.to_string(), layout_template_file)
+            print('Writing regulatory graph file [{}] ...'.format(graph_filename))
+
+            with open(graph_filename, "w") as graph_handle:
+                graph_handle.write(graph)
+        else:
+            print('Writing regulatory graph file [{}] ...'.format(graph_filename))
+            gml_system = XGMML(graph, "{}".format(output))
+            gml_system.to_file(graph_filename)
 
 
 @click.command()
@@ -105,11 +111,22 @@ def write_xgmml(excel_filename: str, output=None, layout_template_file=None):
               help='Base name for output files. Default: \'fn\' for input file \'fn.xls\'')
 @click.option('--layout', default=None, nargs=1, type=click.Path(exists=True),
               help='xgmml file containing layout information, which should be transferred to the new file.')
+@click.option('--workers', default=1, type=click.IntRange(min=1),
+              help='Number of processes used to validate the contingencies. Default: 1')
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Do not read or write the snapshot of the rxncon system in {}'.format(DEFAULT_CACHE_DIR))
+@click.option('--profile', default=None, type=click.Path(dir_okay=False),
+              help='Write a JSON report of the time spent per stage to this file.')
+@click.option('--profile-memory', is_flag=True, default=False,
+              help='Also report the peak memory per stage with --profile. This slows down the run considerably.')
+@click.option('--cprofile', default=None, type=click.Path(dir_okay=False),
+              help='Write the cProfile statistics (readable with the pstats module) to this file.')
 @click.argument('excel_file')
 @click_log.simple_verbosity_option(default='WARNING')
 @click_log.init()
-def run(output, excel_file, layout):
-    write_xgmml(excel_file, output, layout)
+def run(output, excel_file, layout, workers, no_cache, profile, profile_memory, cprofile):
+    with profiling(profile, cprofile, profile_memory):
+        write_xgmml(excel_file, output, layout, workers, not no_cache)
 
 
 def setup_logging_colors():